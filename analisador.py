@@ -2,10 +2,24 @@
 import tkinter as tk
 from tkinter import scrolledtext, filedialog, messagebox
 import os
-from lexico import lex
+import queue
+import threading
+import time
+from lexico import LexicoIncremental, PALAVRAS_CHAVE, NOMES_TIPOS, STRING, CHAR, NUM, COMENTARIO, EOF
 from sintatico import AnalisadorSintatico
+from compilador import compilar, MaquinaVirtual
+from saida import SaidaFila
+from escopo import Interrompido, ErroExecucao
+from otimizador import otimizar
+from memoizacao import memoizador
+from perfilador import AnalisadorPerfilado
+from cache import CacheDisco
 
 ARQUIVO_CODIGO = "index.mine"
+# "vm" compila para bytecode; "arvore" usa o interpretador de árvore (referência)
+MODO_EXECUCAO = "vm"
+# intervalo entre drenagens da fila de saída (~30 quadros/s)
+QUADRO_MS = 33
 
 GRAMATICA = """
 <program>       ::= { <stmt> }
@@ -15,12 +29,16 @@ GRAMATICA = """
 <print>         ::= 'quadro' '(' <expr> { ',' <expr> } ')' ';'
 <if>            ::= 'funil' '(' <expr> ')' '{' { <stmt> } '}' [ 'ejetor' '{' { <stmt> } '}' ]
 <while>         ::= 'redstone' '(' <expr> ')' '{' { <stmt> } '}'
-<for>           ::= 'trilho' '(' ( <var_decl> | ';' ) <expr>? ';' <expr>? ')' '{' { <stmt> } '}'
+<for>           ::= 'trilho' '(' ( <var_decl> | <assign> | ';' ) [ <expr> ] ';' [ ID '=' <expr> ] ')' '{' { <stmt> } '}'
 <func_decl>     ::= 'craftar' ID '(' [ 'bau' ID { ',' 'bau' ID } ] ')' '{' { <stmt> } '}'
 <return>        ::= 'fornalha' <expr> ';'
 <call_stmt>     ::= ID '(' [ <expr> { ',' <expr> } ] ')' ';'
-<expr>          ::= <term> { OP_ARIT <term> }
-<term>          ::= NUM | STRING | CHAR | ID [ '(' [ <expr> { ',' <expr> } ] ')' ] | '(' <expr> ')'
+<expr>          ::= <e> { 'ou' <e> }
+<e>             ::= <nao> { 'e' <nao> }
+<nao>           ::= 'nao' <nao> | <comparacao>
+<comparacao>    ::= <term> { OP_ARIT <term> } [ OP_REL <term> ]
+<term>          ::= ( NUM | STRING | CHAR | ID [ '(' [ <expr> { ',' <expr> } ] ')' ] | '(' <expr> ')' | <lista> ) { '[' <expr> ']' }
+<lista>         ::= '[' [ <expr> { ',' <expr> } ] ']'
 """
 
 def salvar_codigo(codigo: str, path=None):
@@ -32,6 +50,157 @@ def carregar_codigo(path=None) -> str:
     if os.path.exists(p): return open(p,'r',encoding='utf-8').read()
     return ""
 
+# --- Destaque de sintaxe incremental ---
+CORES_DESTAQUE = {
+    'kw': '#c586c0', 'str': '#ce9178', 'num': '#b5cea8', 'coment': '#6a9955',
+}
+TAG_POR_TIPO = dict.fromkeys(PALAVRAS_CHAVE.values(), 'kw')
+TAG_POR_TIPO.update({STRING: 'str', CHAR: 'str', NUM: 'num', COMENTARIO: 'coment'})
+
+class DestaqueSintaxe:
+    # mantém um LexicoIncremental em sincronia com o editor e recolore apenas
+    # as linhas re-lexadas a cada edição
+    def __init__(self, editor: tk.Text):
+        self.editor = editor
+        self.lexico = LexicoIncremental()
+        self.pendente = False
+        for tag, cor in CORES_DESTAQUE.items():
+            editor.tag_configure(tag, foreground=cor)
+        editor.bind("<<Modified>>", self.ao_modificar, add=True)
+
+    def ao_modificar(self, _evento=None):
+        if not self.editor.edit_modified():
+            return
+        self.editor.edit_modified(False)
+        # agrupa rajadas de teclas numa única atualização
+        if not self.pendente:
+            self.pendente = True
+            self.editor.after_idle(self.atualizar)
+
+    def atualizar(self) -> range:
+        self.pendente = False
+        linhas = self.lexico.sincronizar(self.editor.get("1.0", tk.END))
+        ed = self.editor
+        for tag in CORES_DESTAQUE:
+            ed.tag_remove(tag, f"{linhas.start+1}.0", f"{linhas.stop}.end")
+        for i in linhas:
+            n = i + 1
+            for kind, val, col in self.lexico.cache[i]:
+                tag = TAG_POR_TIPO.get(kind)
+                if tag:
+                    ed.tag_add(tag, f"{n}.{col-1}", f"{n}.{col-1+len(val)}")
+        return linhas
+
+    def tokens(self):
+        # garante que o cache reflete o texto atual antes de entregar os tokens
+        self.atualizar()
+        return self.lexico.tokens()
+
+class ListaTokens:
+    # listagem virtualizada: guarda a lista de tokens e só formata/insere as
+    # linhas visíveis; filtro por tipo e salto para uma linha do código
+    TODOS = "(todos)"
+
+    def __init__(self, pai, bg, fg, hl):
+        self.tokens = []
+        self.visiveis = []    # índices em self.tokens que passam no filtro
+        self.inicio = 0
+        self.altura = 20
+        barra = tk.Frame(pai, bg=bg)
+        barra.pack(fill=tk.X)
+        tk.Label(barra, text="Tokens", bg=bg, fg=fg).pack(side=tk.LEFT)
+        self.tipo = tk.StringVar(value=self.TODOS)
+        self.menu_tipo = tk.OptionMenu(barra, self.tipo, self.TODOS, command=lambda _v: self.filtrar())
+        self.menu_tipo.pack(side=tk.LEFT, padx=5)
+        tk.Label(barra, text="Linha", bg=bg, fg=fg).pack(side=tk.LEFT)
+        self.linha = tk.Entry(barra, width=7)
+        self.linha.pack(side=tk.LEFT)
+        self.linha.bind("<Return>", lambda _e: self.ir_para_linha())
+        self.contagem = tk.Label(barra, text="", bg=bg, fg=fg)
+        self.contagem.pack(side=tk.RIGHT)
+        corpo = tk.Frame(pai, bg=bg)
+        corpo.pack(fill=tk.BOTH, expand=True)
+        self.rolagem = tk.Scrollbar(corpo, command=self.rolar)
+        self.rolagem.pack(side=tk.RIGHT, fill=tk.Y)
+        self.texto = tk.Text(corpo, font=("Consolas",12), height=8, wrap=tk.NONE,
+                             bg=hl, fg='skyblue', insertbackground='skyblue')
+        self.texto.pack(fill=tk.BOTH, expand=True)
+        self.texto.bind("<Configure>", self.ao_redimensionar)
+        self.texto.bind("<MouseWheel>", lambda e: self.rolar("scroll", -e.delta // 120, "units"))
+        self.texto.bind("<Button-4>", lambda _e: self.rolar("scroll", -3, "units"))
+        self.texto.bind("<Button-5>", lambda _e: self.rolar("scroll", 3, "units"))
+
+    def mostrar(self, tokens):
+        # sem o EOF final; o filtro é recalculado numa única passada
+        self.tokens = tokens[:-1] if tokens and tokens[-1][0] == EOF else list(tokens)
+        tipos = sorted({NOMES_TIPOS[t[0]] for t in self.tokens})
+        menu = self.menu_tipo["menu"]
+        menu.delete(0, tk.END)
+        for tipo in [self.TODOS] + tipos:
+            menu.add_command(label=tipo, command=lambda v=tipo: (self.tipo.set(v), self.filtrar()))
+        if self.tipo.get() not in tipos:
+            self.tipo.set(self.TODOS)
+        self.filtrar()
+
+    def limpar(self):
+        self.mostrar([])
+
+    def filtrar(self):
+        tipo = self.tipo.get()
+        if tipo == self.TODOS:
+            self.visiveis = range(len(self.tokens))
+        else:
+            self.visiveis = [i for i, t in enumerate(self.tokens) if NOMES_TIPOS[t[0]] == tipo]
+        self.inicio = 0
+        self.desenhar()
+
+    def ir_para_linha(self):
+        try:
+            alvo = int(self.linha.get())
+        except ValueError:
+            return
+        self.inicio = self.indice_da_linha(alvo)
+        self.desenhar()
+
+    def indice_da_linha(self, alvo: int) -> int:
+        # primeiro token visível na linha 'alvo' ou depois (tokens vêm em ordem)
+        tokens, visiveis = self.tokens, self.visiveis
+        lo, hi = 0, len(visiveis)
+        while lo < hi:
+            meio = (lo + hi) // 2
+            if tokens[visiveis[meio]][2] < alvo: lo = meio + 1
+            else: hi = meio
+        return lo
+
+    def rolar(self, acao, quantidade=None, unidade=None):
+        if acao == "moveto":
+            self.inicio = int(float(quantidade) * len(self.visiveis))
+        elif acao == "scroll":
+            passo = self.altura if unidade == "pages" else 1
+            self.inicio += int(quantidade) * passo
+        self.desenhar()
+
+    def ao_redimensionar(self, evento):
+        linha = max(1, self.texto.tk.call("font", "metrics", self.texto.cget("font"), "-linespace"))
+        self.altura = max(1, evento.height // int(linha))
+        self.desenhar()
+
+    def linhas(self, inicio: int, n: int) -> str:
+        tokens = self.tokens
+        return "".join(f"{NOMES_TIPOS[t[0]]:<12} {t[1]:<10}  (L{t[2]},C{t[3]})\n"
+                       for t in (tokens[i] for i in self.visiveis[inicio:inicio+n]))
+
+    def desenhar(self):
+        total = len(self.visiveis)
+        self.inicio = max(0, min(self.inicio, total - self.altura))
+        self.texto.delete("1.0", tk.END)
+        self.texto.insert(tk.END, self.linhas(self.inicio, self.altura))
+        if total:
+            self.rolagem.set(self.inicio / total, min(1.0, (self.inicio + self.altura) / total))
+        else:
+            self.rolagem.set(0.0, 1.0)
+        self.contagem.config(text=f"{total} de {len(self.tokens)} tokens")
+
 def criar_interface():
     janela = tk.Tk()
     janela.title("MineScript – IDE")
@@ -48,6 +217,14 @@ def criar_interface():
     arquivo.add_command(label="Sair", command=janela.destroy)
     menu.add_cascade(label="Arquivo", menu=arquivo)
 
+    execucao = tk.Menu(menu, tearoff=0)
+    otimizar_ast = tk.BooleanVar(value=False)
+    execucao.add_checkbutton(label="Otimizar AST", variable=otimizar_ast)
+    # o perfil roda no interpretador de árvore, qualquer que seja MODO_EXECUCAO
+    perfilar = tk.BooleanVar(value=False)
+    execucao.add_checkbutton(label="Perfilar", variable=perfilar)
+    menu.add_cascade(label="Execução", menu=execucao)
+
     ajuda = tk.Menu(menu, tearoff=0)
     ajuda.add_command(label="Gramática", command=lambda: messagebox.showinfo("Gramática MineScript", GRAMATICA))
     menu.add_cascade(label="Ajuda", menu=ajuda)
@@ -62,6 +239,7 @@ def criar_interface():
     entrada = scrolledtext.ScrolledText(frame, font=("Consolas",12), height=20,
                                         undo=True, bg=hl, fg=fg, insertbackground=fg)
     entrada.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+    destaque = DestaqueSintaxe(entrada)
 
     # Botões
     btns = tk.Frame(frame, bg=bg)
@@ -71,17 +249,16 @@ def criar_interface():
     tk.Button(btns, text="Listar Tokens", width=12, command=lambda: cmd_listar()).pack(side=tk.LEFT, padx=5)
     tk.Button(btns, text="Limpar", width=10, command=lambda: cmd_limpar()).pack(side=tk.LEFT)
     tk.Button(btns, text="Executar", width=10, command=lambda: cmd_executar()).pack(side=tk.LEFT, padx=5)
-    tk.Button(btns, text="Sair", width=10, command=janela.destroy).pack(side=tk.LEFT)
+    btn_parar = tk.Button(btns, text="Parar", width=10, state=tk.DISABLED, command=lambda: cmd_parar())
+    btn_parar.pack(side=tk.LEFT)
+    tk.Button(btns, text="Sair", width=10, command=janela.destroy).pack(side=tk.LEFT, padx=5)
 
     # Terminais
     term_frame = tk.PanedWindow(frame, sashrelief=tk.RAISED, sashwidth=5, bg=bg)
     term_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
 
     lex_frame = tk.Frame(term_frame, bg=bg)
-    tk.Label(lex_frame, text="Tokens", bg=bg, fg=fg).pack(anchor='nw')
-    term_lex = scrolledtext.ScrolledText(lex_frame, font=("Consolas",12), height=8,
-                                         bg=hl, fg='skyblue', insertbackground='skyblue')
-    term_lex.pack(fill=tk.BOTH, expand=True)
+    term_lex = ListaTokens(lex_frame, bg, fg, hl)
     lex_frame.pack(fill=tk.BOTH, expand=True)
     term_frame.add(lex_frame)
 
@@ -93,6 +270,14 @@ def criar_interface():
     sint_frame.pack(fill=tk.BOTH, expand=True)
     term_frame.add(sint_frame)
 
+    perfil_frame = tk.Frame(term_frame, bg=bg)
+    tk.Label(perfil_frame, text="Perfil", bg=bg, fg=fg).pack(anchor='nw')
+    term_perfil = scrolledtext.ScrolledText(perfil_frame, font=("Consolas",12), height=8,
+                                            bg=hl, fg='lightgreen', insertbackground='lightgreen')
+    term_perfil.pack(fill=tk.BOTH, expand=True)
+    perfil_frame.pack(fill=tk.BOTH, expand=True)
+    term_frame.add(perfil_frame)
+
     ast_frame = tk.Frame(term_frame, bg=bg)
     # tk.Label(ast_frame, text="Árvore Sintática", bg=bg, fg=fg).pack(anchor='nw')
     # term_ast = scrolledtext.ScrolledText(ast_frame, font=("Consolas",12), height=8,
@@ -103,6 +288,7 @@ def criar_interface():
 
     # Comandos
     current_path = None
+    cache = CacheDisco()
     def cmd_abrir():
         nonlocal current_path
         p = filedialog.askopenfilename(filetypes=[("MineScript","*.mine"),("All","*.*")])
@@ -121,39 +307,120 @@ def criar_interface():
         salvar_codigo(entrada.get("1.0",tk.END), current_path)
 
     def cmd_listar():
-        term_lex.delete("1.0",tk.END)
         term_sint.delete("1.0",tk.END)
         # term_ast.delete("1.0",tk.END)
-        tokens = lex(entrada.get("1.0",tk.END))
-        term_lex.insert(tk.END, "—— LISTAGEM DE TOKENS ——\n")
-        for t in tokens[:-1]:
-            term_lex.insert(tk.END, f"{t[0]:<12} {t[1]:<10}  (L{t[2]},C{t[3]})\n")
+        term_lex.mostrar(destaque.tokens())
 
     def cmd_limpar():
         # entrada.delete("1.0",tk.END)
-        term_lex.delete("1.0",tk.END)
+        term_lex.limpar()
         term_sint.delete("1.0",tk.END)
+        term_perfil.delete("1.0",tk.END)
         # term_ast.delete("1.0",tk.END)
 
+    # Execução em segundo plano: a thread nunca toca nos widgets; a saída
+    # chega pela fila e é drenada em lotes a cada QUADRO_MS
+    execucao_atual = None
+
     def cmd_executar():
-        term_lex.delete("1.0",tk.END)
+        nonlocal execucao_atual
+        if execucao_atual is not None:
+            return
         term_sint.delete("1.0",tk.END)
+        term_perfil.delete("1.0",tk.END)
         # term_ast.delete("1.0",tk.END)
         # Léxico
-        tokens = lex(entrada.get("1.0",tk.END))
-        term_lex.insert(tk.END, "—— Análise Léxica ——\n")
-        for t in tokens[:-1]:
-            term_lex.insert(tk.END, f"{t[0]:<12} {t[1]:<10}  (L{t[2]},C{t[3]})\n","token")
+        tokens = destaque.tokens()
+        term_lex.mostrar(tokens)
         # Sintaxe & Execução
         term_sint.insert(tk.END, "\n—— Sintático & Execução ——\n")
-        analisador = AnalisadorSintatico(tokens, term_sint)
-        program = analisador.parse()
-        if not analisador.has_error:
-            analisador.execute(program)
-            term_sint.insert(tk.END, "\nPrograma executado com sucesso.\n")
-        # AST
-        # term_ast.insert(tk.END, "\n—— Árvore Sintática ——\n")
-        analisador.print_tree(node=program)
+        fila = queue.Queue()
+        saida = SaidaFila(fila)
+        classe = AnalisadorPerfilado if perfilar.get() else AnalisadorSintatico
+        analisador = classe(tokens, saida)
+        texto = entrada.get("1.0", "end-1c")
+        thread = threading.Thread(target=executar_em_fundo,
+                                  args=(analisador, saida, texto, otimizar_ast.get()), daemon=True)
+        execucao_atual = (analisador, fila)
+        btn_parar.config(state=tk.NORMAL)
+        thread.start()
+        janela.after(QUADRO_MS, drenar)
+
+    def executar_em_fundo(analisador, saida, texto, otimizar_ast):
+        try:
+            # texto inalterado desde a última execução: a AST vem do cache em disco
+            chave = cache.chave(texto.encode('utf-8'))
+            program = cache.carregar(chave)
+            if program is None:
+                program = analisador.parse()
+                if not analisador.has_error:
+                    cache.gravar(chave, program)
+            else:
+                analisador.programa = program
+            if not analisador.has_error:
+                if otimizar_ast:
+                    analisador.otimizador = otimizar(program)
+                    saida.escrever(analisador.otimizador.resumo() + "\n")
+                analisador.memo = memoizador(program)
+                if MODO_EXECUCAO == "vm" and not isinstance(analisador, AnalisadorPerfilado):
+                    MaquinaVirtual(analisador).executar(compilar(program))
+                else:
+                    analisador.execute(program)
+                if isinstance(analisador, AnalisadorPerfilado):
+                    saida.flush()
+                    saida.fila.put(('perfil', analisador.relatorio(texto.splitlines()) + "\n"))
+                if analisador.memo.todos:
+                    saida.escrever(analisador.memo.resumo() + "\n")
+                saida.escrever("\nPrograma executado com sucesso.\n")
+            # AST
+            # term_ast.insert(tk.END, "\n—— Árvore Sintática ——\n")
+            analisador.print_tree(node=program)
+        except ErroExecucao as e:
+            saida.erro(f"\n{e}\n")
+        except Interrompido:
+            saida.erro("\nExecução interrompida.\n")
+        except Exception as e:
+            saida.erro(f"\nErro de execução: {type(e).__name__}: {e}\n")
+        finally:
+            saida.flush()
+            saida.fila.put(('fim', None))
+
+    def drenar():
+        nonlocal execucao_atual
+        analisador, fila = execucao_atual
+        # junta os pedaços de saída consecutivos num único insert por quadro
+        pedacos, fim = [], False
+        limite = time.monotonic() + QUADRO_MS / 2000
+        while time.monotonic() < limite:
+            try:
+                tipo, texto = fila.get_nowait()
+            except queue.Empty:
+                break
+            if tipo == 'saida':
+                pedacos.append(texto)
+                continue
+            if pedacos:
+                term_sint.insert(tk.END, ''.join(pedacos))
+                pedacos = []
+            if tipo == 'erro':
+                term_sint.insert(tk.END, texto, "erro")
+            elif tipo == 'perfil':
+                term_perfil.insert(tk.END, texto)
+            else:
+                fim = True
+                break
+        if pedacos:
+            term_sint.insert(tk.END, ''.join(pedacos))
+        term_sint.see(tk.END)
+        if fim:
+            execucao_atual = None
+            btn_parar.config(state=tk.DISABLED)
+        else:
+            janela.after(QUADRO_MS, drenar)
+
+    def cmd_parar():
+        if execucao_atual is not None:
+            execucao_atual[0].cancelar()
 
     janela.mainloop()
 
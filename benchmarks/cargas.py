@@ -0,0 +1,116 @@
+# benchmarks/cargas.py
+# Cargas .mine geradas e escaláveis. Cada carga devolve o código-fonte e o
+# número de statements que a execução percorre (para statements/s).
+from typing import Callable, List, NamedTuple, Tuple
+
+# trecho repetido pelos benchmarks do léxico e do parser
+BLOCO = """// bloco {i}
+bau madeira{i} = {i};
+craftar soma{i}(bau a, bau b) {{
+    fornalha a + b * 2 - (a / 3);
+}}
+redstone (madeira{i} > 0) {{
+    madeira{i} = madeira{i} - 1;
+    quadro("Contagem: ", soma{i}(madeira{i}, 'x'));
+}}
+"""
+
+class Carga(NamedTuple):
+    nome: str
+    gerar: Callable[[int], Tuple[str, int]]
+    escala: int   # n padrão
+
+def loops_profundos(n: int) -> Tuple[str, int]:
+    # três redstone aninhados com ~n iterações no mais interno
+    k = max(1, round(n ** (1/3)))
+    codigo = f"""
+bau a = {k};
+redstone (a > 0) {{
+    bau b = {k};
+    redstone (b > 0) {{
+        bau c = {k};
+        redstone (c > 0) {{
+            c = c - 1;
+        }}
+        b = b - 1;
+    }}
+    a = a - 1;
+}}
+"""
+    return codigo, 2 + 3*k + 3*k*k + k**3
+
+def chamadas(n: int) -> Tuple[str, int]:
+    codigo = f"""
+craftar soma(bau a, bau b) {{
+    fornalha a + b;
+}}
+bau i = 0;
+bau total = 0;
+redstone (i < {n}) {{
+    total = soma(total, i + 1);
+    i = i + 1;
+}}
+quadro("total: ", total);
+"""
+    return codigo, 3*n + 5
+
+def impressao(n: int) -> Tuple[str, int]:
+    codigo = f"""
+bau madeira = {n};
+redstone (madeira > 0) {{
+    madeira = madeira - 1;
+    quadro("Contagem: ", madeira);
+}}
+"""
+    return codigo, 2*n + 2
+
+def expressoes_longas(n: int, termos: int = 40) -> Tuple[str, int]:
+    ops = ['+', '*', '-', '/']
+    partes = ['(i + 1)']
+    for t in range(1, termos):
+        partes.append(ops[t % 4])
+        partes.append(f'(i + {t + 1})' if t % 2 else str(t + 1))
+    expr = ' '.join(partes)
+    codigo = f"""
+bau i = 0;
+bau x = 0;
+redstone (i < {n}) {{
+    x = {expr};
+    i = i + 1;
+}}
+quadro("x: ", x);
+"""
+    return codigo, 2*n + 4
+
+def constantes(n: int) -> Tuple[str, int]:
+    # subexpressões constantes e globais nunca reatribuídas dentro do loop
+    # (o alvo do otimizador de AST)
+    codigo = f"""
+bau LARGURA = 64;
+bau ALTURA = 32;
+bau i = 0;
+bau area = 0;
+redstone (i < {n}) {{
+    area = area + (LARGURA * ALTURA / (2 + 2)) - -(1 + 1) + (LARGURA - ALTURA);
+    i = i + 1;
+}}
+quadro("area: ", area);
+"""
+    return codigo, 2*n + 6
+
+def arquivo_enorme(n: int) -> Tuple[str, int]:
+    # n statements em linha reta: pesa no léxico e no parser
+    linhas: List[str] = []
+    for i in range(n):
+        linhas.append(f"bau v{i} = {i} * 2 + {i % 7 + 1};  // linha {i}")
+    linhas.append('quadro("fim");')
+    return '\n'.join(linhas) + '\n', n + 1
+
+CARGAS = [
+    Carga("loops_profundos", loops_profundos, 200_000),
+    Carga("chamadas", chamadas, 50_000),
+    Carga("impressao", impressao, 100_000),
+    Carga("expressoes_longas", expressoes_longas, 10_000),
+    Carga("constantes", constantes, 100_000),
+    Carga("arquivo_enorme", arquivo_enorme, 50_000),
+]
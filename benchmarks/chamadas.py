@@ -0,0 +1,50 @@
+# benchmarks/chamadas.py
+# Mede o custo de chamadas craftar (soma/media em loop) com poucas e muitas globais.
+# Uso: python -m benchmarks.chamadas [chamadas]
+import sys
+import time
+from lexico import lex
+from sintatico import AnalisadorSintatico
+from compilador import compilar, MaquinaVirtual
+from saida import SaidaMemoria
+
+def programa(chamadas: int, globais: int) -> str:
+    decl = ''.join(f"bau g{i} = {i};\n" for i in range(globais))
+    return decl + f"""
+craftar soma(bau a, bau b) {{
+    fornalha a + b;
+}}
+craftar media(bau a, bau b) {{
+    fornalha soma(a, b) / 2;
+}}
+bau i = 1;
+bau total = 0;
+redstone (i < {chamadas}) {{
+    total = total + media(i, 1);
+    i = i + 1;
+}}
+quadro("total: ", total);
+"""
+
+def medir(codigo: str, modo: str) -> float:
+    term = SaidaMemoria()
+    analisador = AnalisadorSintatico(lex(codigo), term)
+    program = analisador.parse()
+    inicio = time.perf_counter()
+    if modo == "vm":
+        MaquinaVirtual(analisador).executar(compilar(program))
+    else:
+        analisador.execute(program)
+    return time.perf_counter() - inicio
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    n = int(argv[0]) if argv else 20_000
+    print(f"{'globais':>8} {'chamadas':>9} {'árvore (s)':>11} {'vm (s)':>9}")
+    for globais in (0, 100, 1000, 5000):
+        codigo = programa(n, globais)
+        # cada iteração faz duas chamadas (media -> soma)
+        print(f"{globais:>8} {2*n:>9} {medir(codigo, 'arvore'):>11.3f} {medir(codigo, 'vm'):>9.3f}")
+
+if __name__ == "__main__":
+    main()
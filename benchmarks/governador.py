@@ -0,0 +1,65 @@
+# benchmarks/governador.py
+# Custo do governador: a mesma carga sem cotas, só com passos + tempo (pontos
+# de checagem periódicos) e com as três cotas (memória confere '+', '*' e
+# faixa a cada operação), nos dois modos de execução. Mede só a execução.
+# Uso: python -m benchmarks.governador [--escala 1] [-r 5]
+import argparse
+import time
+from lexico import lex
+from sintatico import AnalisadorSintatico
+from saida import SaidaMemoria
+from minescript import executar_programa
+from governador import Governador
+from benchmarks.cargas import loops_profundos, chamadas, expressoes_longas, constantes
+
+CARGAS = [
+    ("loops_profundos", loops_profundos, 200_000),
+    ("chamadas", chamadas, 50_000),
+    ("expressoes_longas", expressoes_longas, 10_000),
+    ("constantes", constantes, 100_000),
+]
+# cotas folgadas: nenhuma carga estoura, mede-se só o custo de vigiar
+CONFIGURACOES = [
+    ("sem", lambda: None),
+    ("passos+tempo", lambda: Governador(10**9, 3600)),
+    ("completo", lambda: Governador(10**9, 3600, 2**30)),
+]
+
+def rodar(tokens, modo: str, governador):
+    saida = SaidaMemoria()
+    analisador = AnalisadorSintatico(tokens, saida)
+    program = analisador.parse()
+    inicio = time.perf_counter()
+    executar_programa(analisador, program, saida, modo, memo=0, governador=governador)
+    return time.perf_counter() - inicio, saida.texto()
+
+def medir(tokens, modo: str, repeticoes: int):
+    # as configurações se alternam a cada repetição: a variação da máquina
+    # ao longo da medição pesa igual em todas
+    melhores = [float('inf')] * len(CONFIGURACOES)
+    textos = set()
+    for _ in range(repeticoes):
+        for i, (_, governar) in enumerate(CONFIGURACOES):
+            t, texto = rodar(tokens, modo, governar())
+            melhores[i] = min(melhores[i], t)
+            textos.add(texto)
+    return melhores, textos
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="benchmarks.governador")
+    parser.add_argument("--escala", type=float, default=1.0)
+    parser.add_argument("-r", "--repeticoes", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    print(f"{'carga':<18} {'modo':<7}" + ''.join(f" {nome + ' (s)':>17}" for nome, _ in CONFIGURACOES)
+          + f" {'custo':>15}")
+    for nome, gerar, n in CARGAS:
+        tokens = lex(gerar(max(1, int(n * args.escala)))[0])
+        for modo in ("vm", "arvore"):
+            tempos, textos = medir(tokens, modo, args.repeticoes)
+            assert len(textos) == 1, nome
+            custos = ' / '.join(f"{100 * (t / tempos[0] - 1):+.0f}%" for t in tempos[1:])
+            print(f"{nome:<18} {modo:<7}" + ''.join(f" {t:>17.3f}" for t in tempos) + f" {custos:>15}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+# benchmarks/inicializacao.py
+# Tempo de inicialização de 'minescript run' com o cache de AST frio e quente.
+# Cada execução é um processo novo, como na linha de comando.
+# Uso: python -m benchmarks.inicializacao [statements ...]
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from benchmarks.cargas import arquivo_enorme
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def rodar(path: str, diretorio: str, *extra) -> float:
+    inicio = time.perf_counter()
+    subprocess.run([sys.executable, '-m', 'minescript', 'run', path, '-o', os.devnull,
+                    '--cache-dir', diretorio, *extra], cwd=RAIZ, check=True)
+    return time.perf_counter() - inicio
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    ns = [int(a) for a in argv] or [10_000, 50_000, 200_000]
+    print(f"{'statements':>10} {'sem cache (s)':>14} {'frio (s)':>9} {'quente (s)':>11} {'ganho':>7}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in ns:
+            path = os.path.join(tmp, f'carga_{n}.mine')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(arquivo_enorme(n)[0])
+            diretorio = os.path.join(tmp, f'cache_{n}')
+            sem = rodar(path, diretorio, '--sem-cache')
+            frio = rodar(path, diretorio)
+            quente = min(rodar(path, diretorio) for _ in range(3))
+            print(f"{n:>10} {sem:>14.3f} {frio:>9.3f} {quente:>11.3f} {sem/quente:>6.1f}x")
+
+if __name__ == "__main__":
+    main()
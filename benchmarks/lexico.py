@@ -0,0 +1,65 @@
+# benchmarks/lexico.py
+# Tempo e pico de memória do léxico em arquivos .mine gerados (dezenas de MB).
+# Uso: python -m benchmarks.lexico [MB ...]
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import deque
+from lexico import lex, tokenizar, tokenizar_arquivo
+from benchmarks.cargas import BLOCO
+
+def gerar_arquivo(path: str, megabytes: float):
+    alvo = int(megabytes * 1024 * 1024)
+    escritos, i = 0, 0
+    with open(path, 'w', encoding='utf-8') as f:
+        while escritos < alvo:
+            trecho = BLOCO.format(i=i)
+            f.write(trecho)
+            escritos += len(trecho)
+            i += 1
+
+def consumir(tokens) -> int:
+    # percorre o fluxo sem guardar os tokens
+    contador = deque(enumerate(tokens, 1), maxlen=1)
+    return contador[0][0] if contador else 0
+
+def modos(path: str):
+    def lista():
+        with open(path, encoding='utf-8') as f:
+            return len(lex(f.read()))
+    def gerador():
+        with open(path, encoding='utf-8') as f:
+            return consumir(tokenizar(f.read()))
+    def mapeado():
+        return consumir(tokenizar_arquivo(path))
+    return [("lex() lista", lista), ("tokenizar() gerador", gerador), ("tokenizar_arquivo() mmap", mapeado)]
+
+def medir(func):
+    inicio = time.perf_counter()
+    n = func()
+    tempo = time.perf_counter() - inicio
+    tracemalloc.start()
+    func()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return n, tempo, pico
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    tamanhos = [float(a) for a in argv] or [10, 20]
+    print(f"{'MB':>5} {'modo':<26} {'tokens':>10} {'tempo (s)':>10} {'tokens/s':>11} {'pico (MB)':>10}")
+    for mb in tamanhos:
+        fd, path = tempfile.mkstemp(suffix='.mine')
+        os.close(fd)
+        try:
+            gerar_arquivo(path, mb)
+            for nome, func in modos(path):
+                n, tempo, pico = medir(func)
+                print(f"{mb:>5g} {nome:<26} {n:>10} {tempo:>10.2f} {n/tempo:>11.0f} {pico/2**20:>10.1f}")
+        finally:
+            os.remove(path)
+
+if __name__ == "__main__":
+    main()
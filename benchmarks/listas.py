@@ -0,0 +1,48 @@
+# benchmarks/listas.py
+# Aritmética elemento a elemento em listas contra o mesmo cálculo feito por
+# um redstone sobre escalares (um passo do interpretador por elemento).
+# Expressões sem precedência: tudo associa à esquerda.
+# Uso: python -m benchmarks.listas [elementos ...]
+import sys
+import time
+from minescript import executar
+from saida import SaidaMemoria
+
+def vetorizado(n: int) -> str:
+    return f"""
+bau v = faixa({n});
+bau w = v * 3 + 1;
+quadro(soma(w));
+"""
+
+def laco(n: int) -> str:
+    return f"""
+bau i = 0;
+bau total = 0;
+redstone (i < {n}) {{
+    total = total + (i * 3 + 1);
+    i = i + 1;
+}}
+quadro(total);
+"""
+
+def medir(codigo: str, modo: str):
+    saida = SaidaMemoria()
+    inicio = time.perf_counter()
+    executar(codigo, saida, modo)
+    return time.perf_counter() - inicio, saida.texto().strip()
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    ns = [int(a) for a in argv] or [100_000, 1_000_000]
+    print(f"{'elementos':>10} {'modo':<7} {'redstone (s)':>13} {'listas (s)':>11} {'elem/s listas':>14} {'ganho':>7}")
+    for n in ns:
+        for modo in ("vm", "arvore"):
+            t_laco, r_laco = medir(laco(n), modo)
+            t_lista, r_lista = medir(vetorizado(n), modo)
+            assert r_laco == r_lista, (r_laco, r_lista)
+            print(f"{n:>10} {modo:<7} {t_laco:>13.3f} {t_lista:>11.3f} {n / t_lista:>14.0f} "
+                  f"{t_laco / t_lista:>6.0f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+# benchmarks/memo.py
+# Fibonacci recursivo com e sem memoização das funções puras.
+# Uso: python -m benchmarks.memo [n ...]
+import sys
+import time
+from minescript import executar
+from saida import SaidaMemoria
+
+def fibonacci(n: int) -> str:
+    return f"""
+craftar fib(bau n) {{
+    redstone (n < 2) {{
+        fornalha n;
+    }}
+    fornalha fib(n - 2) + fib(n - 1);
+}}
+quadro(fib({n}));
+"""
+
+def medir(codigo: str, modo: str, memo: int):
+    saida = SaidaMemoria()
+    inicio = time.perf_counter()
+    analisador = executar(codigo, saida, modo, memo=memo)
+    return time.perf_counter() - inicio, saida.texto().strip(), analisador
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    ns = [int(a) for a in argv] or [15, 20, 25]
+    print(f"{'n':>4} {'modo':<7} {'sem memo (s)':>13} {'com memo (s)':>13} {'ganho':>9}  fib(n)")
+    for n in ns:
+        for modo in ("vm", "arvore"):
+            t_sem, r_sem, _ = medir(fibonacci(n), modo, 0)
+            t_com, r_com, analisador = medir(fibonacci(n), modo, 1024)
+            assert r_sem == r_com
+            print(f"{n:>4} {modo:<7} {t_sem:>13.3f} {t_com:>13.4f} {t_sem/t_com:>8.0f}x  {r_com}")
+    print(analisador.memo.resumo())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# benchmarks/memoria.py
+# Memória da AST: nós com __slots__ (atual) contra nós com __dict__ por
+# instância (a representação anterior), em programas gerados grandes.
+# As duas são cópias da mesma árvore parseada, uma em cada representação.
+# Uso: python -m benchmarks.memoria [statements ...]
+import gc
+import sys
+import tracemalloc
+from lexico import tokenizar
+from sintatico import AnalisadorSintatico, ASTNode
+from saida import SaidaMemoria
+from otimizador import contar_nos
+from benchmarks.cargas import arquivo_enorme, expressoes_longas
+
+_legado = {}
+
+def legado(cls):
+    # mesma classe, sem __slots__ (um __dict__ por nó)
+    if cls not in _legado:
+        _legado[cls] = type(cls.__name__, (), {})
+    return _legado[cls]
+
+def copiar(node, classe):
+    # cópia dos nós e listas; nomes e valores são compartilhados com o
+    # original, então as duas medições contam só a estrutura da árvore
+    if isinstance(node, list):
+        return [copiar(n, classe) for n in node]
+    if not isinstance(node, ASTNode):
+        return node
+    cls = type(node)
+    copia = object.__new__(classe(cls))
+    for campo in cls.__slots__ + ('linha', 'coluna'):
+        setattr(copia, campo, copiar(getattr(node, campo), classe))
+    return copia
+
+def retido(funcao):
+    # bytes que continuam alocados depois de 'funcao' (o resultado vivo)
+    gc.collect()
+    tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    resultado = funcao()
+    gc.collect()
+    depois = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return resultado, depois - antes
+
+def parse(codigo: str):
+    # gerador de tokens: só a AST fica viva depois do parse
+    return AnalisadorSintatico(tokenizar(codigo), SaidaMemoria()).parse()
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    ns = [int(a) for a in argv] or [50_000, 200_000]
+    print(f"{'programa':<24} {'nós':>9} {'__dict__ MB':>12} {'__slots__ MB':>13} "
+          f"{'B/nó antes':>11} {'B/nó agora':>11} {'economia':>9}")
+    for n in ns:
+        for nome, codigo in ((f"arquivo_enorme({n})", arquivo_enorme(n)[0]),
+                             (f"expressoes({n // 50})", expressoes_longas(10, n // 50)[0])):
+            program = parse(codigo)
+            nos = contar_nos(program)
+            # recursão: a expressão longa é uma cadeia de BinOp à esquerda
+            sys.setrecursionlimit(max(sys.getrecursionlimit(), 4 * nos))
+            _, slots = retido(lambda: copiar(program, lambda cls: cls))
+            copia, dicts = retido(lambda: copiar(program, legado))
+            print(f"{nome:<24} {nos:>9} {dicts / 2**20:>12.1f} {slots / 2**20:>13.1f} "
+                  f"{dicts / nos:>11.0f} {slots / nos:>11.0f} {1 - slots / dicts:>8.0%}")
+            del program, copia
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# benchmarks/parser.py
+# Vazão do parser (tokens/s e statements/s) sobre cargas geradas, com os
+# tokens já prontos: mede só AnalisadorSintatico.parse.
+# Com --referencia REV, o mesmo benchmark roda com lexico.py e sintatico.py
+# daquela revisão do git e os dois resultados são comparados.
+# Uso: python -m benchmarks.parser [--escala 1] [--referencia HEAD~1]
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from lexico import lex
+from sintatico import AnalisadorSintatico
+from saida import SaidaMemoria
+from benchmarks.cargas import arquivo_enorme, expressoes_longas, BLOCO
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def blocos(n: int):
+    return ''.join(BLOCO.format(i=i) for i in range(n)), n
+
+CARGAS = [
+    ("arquivo_enorme", arquivo_enorme, 50_000),
+    ("expressoes_longas", lambda n: expressoes_longas(10, n), 20_000),
+    ("funcoes_e_lacos", blocos, 10_000),
+]
+
+def medir(escala: float, repeticoes: int) -> dict:
+    resultados = {}
+    for nome, gerar, n in CARGAS:
+        tokens = lex(gerar(max(1, int(n * escala)))[0])
+        melhor = float('inf')
+        for _ in range(repeticoes):
+            analisador = AnalisadorSintatico(tokens, SaidaMemoria())
+            inicio = time.perf_counter()
+            program = analisador.parse()
+            melhor = min(melhor, time.perf_counter() - inicio)
+            assert not analisador.has_error, nome
+        resultados[nome] = {'tokens': len(tokens), 'statements': len(program.statements),
+                            'parse_s': melhor, 'tokens_s': len(tokens) / melhor}
+    return resultados
+
+def referencia(rev: str, escala: float, repeticoes: int) -> dict:
+    # lexico.py/sintatico.py antigos num diretório temporário que vem antes do
+    # repositório no sys.path do processo filho. Por isso o filho só importa
+    # deles lex e AnalisadorSintatico(tokens, terminal).parse(), que existem
+    # desde a primeira revisão
+    with tempfile.TemporaryDirectory() as tmp:
+        for nome in ('lexico.py', 'sintatico.py'):
+            fonte = subprocess.run(['git', 'show', f'{rev}:{nome}'], cwd=RAIZ, capture_output=True)
+            if fonte.returncode != 0:
+                sys.exit(f"{rev}:{nome}: {fonte.stderr.decode(errors='replace').strip()}")
+            with open(os.path.join(tmp, nome), 'wb') as f:
+                f.write(fonte.stdout)
+        env = dict(os.environ, PYTHONPATH=RAIZ)
+        filho = subprocess.run([sys.executable, '-m', 'benchmarks.parser', '--escala', str(escala),
+                                '-r', str(repeticoes), '--json'], cwd=tmp, env=env,
+                               capture_output=True, text=True)
+    if filho.returncode != 0:
+        sys.exit(f"benchmark com o parser de {rev} falhou:\n{filho.stderr}")
+    return json.loads(filho.stdout)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="benchmarks.parser")
+    parser.add_argument("--escala", type=float, default=1.0)
+    parser.add_argument("-r", "--repeticoes", type=int, default=5)
+    parser.add_argument("--referencia", metavar="REV", help="revisão do git para comparar")
+    parser.add_argument("--json", action="store_true", help="só imprime os resultados em JSON")
+    args = parser.parse_args(argv)
+
+    atual = medir(args.escala, args.repeticoes)
+    if args.json:
+        print(json.dumps(atual))
+        return
+    antes = referencia(args.referencia, args.escala, args.repeticoes) if args.referencia else {}
+    print(f"{'carga':<18} {'tokens':>9} {'parse (s)':>10} {'tokens/s':>11}"
+          + (f" {'referência':>11} {'ganho':>7}" if antes else ""))
+    for nome, r in atual.items():
+        linha = f"{nome:<18} {r['tokens']:>9} {r['parse_s']:>10.3f} {r['tokens_s']:>11.0f}"
+        if nome in antes:
+            linha += f" {antes[nome]['tokens_s']:>11.0f} {antes[nome]['parse_s'] / r['parse_s']:>6.2f}x"
+        print(linha)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+# benchmarks/servidor.py
+# Cliente local do servidor HTTP (servidor.py): sobe o servidor numa porta
+# livre, dispara requisições concorrentes, confere as saídas e o isolamento
+# entre requisições e mostra vazão, latências e as métricas do servidor.
+# Com --processo, compara com um 'minescript run' (processo novo) por programa.
+# Uso: python -m benchmarks.servidor [-n 400] [-c 8] [-j 2] [--processo 10]
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from servidor import Servidor, criar, percentil
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (fonte, saída esperada, status esperado)
+PROGRAMAS = [
+    ("""
+craftar fib(bau n) {
+    redstone (n < 2) { fornalha n; }
+    fornalha fib(n - 1) + fib(n - 2);
+}
+quadro(fib(18));
+""", "2584\n", "executado"),
+    ("""
+bau total = 0;
+trilho (bau i = 0; i < 20000; i = i + 1) { total = total + i; }
+quadro(total);
+""", "199990000\n", "executado"),
+    ("""
+bau v = faixa(10) * 3 + 1;
+quadro(soma(v), " ", v[9]);
+""", "145 28\n", "executado"),
+    # isolamento: 'segredo' e 'vaza' de uma requisição não existem na seguinte
+    ("""
+bau segredo = 42;
+craftar vaza() { fornalha segredo; }
+quadro(segredo);
+""", "42\n", "executado"),
+    ("""
+quadro(segredo);
+quadro(vaza());
+""", "None\nNone\n", "erro"),
+    # cota de passos: o servidor segue atendendo as outras
+    ("""
+redstone (1 > 0) { }
+""", "", "passos"),
+    # cota de saída (10 KB no servidor do benchmark): para no 11º quadro
+    ("""
+bau s = "x" * 1000;
+redstone (1 > 0) { quadro(s); }
+""", ("x" * 1000 + "\n") * 10, "saida"),
+]
+
+def enviar(url: str, codigo: str) -> dict:
+    pedido = urllib.request.Request(url + '/executar', data=json.dumps({'codigo': codigo}).encode('utf-8'),
+                                    headers={'Content-Type': 'application/json'})
+    with urllib.request.urlopen(pedido) as r:
+        return json.load(r)
+
+def metricas(url: str) -> dict:
+    with urllib.request.urlopen(url + '/metricas') as r:
+        return json.load(r)
+
+def cliente(url: str, n: int, concorrencia: int):
+    def uma(i: int) -> float:
+        codigo, esperado, status = PROGRAMAS[i % len(PROGRAMAS)]
+        inicio = time.perf_counter()
+        r = enviar(url, codigo)
+        latencia = time.perf_counter() - inicio
+        assert r['status'] == status and r['saida'] == esperado, (i, r)
+        return latencia
+
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(concorrencia) as pool:
+        latencias = sorted(pool.map(uma, range(n)))
+    return time.perf_counter() - inicio, latencias
+
+def por_processo(n: int) -> float:
+    # o custo que o servidor evita: um processo novo por programa
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'programa.mine')
+        inicio = time.perf_counter()
+        for i in range(n):
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(PROGRAMAS[i % 3][0])
+            subprocess.run([sys.executable, '-m', 'minescript', 'run', path, '--sem-cache',
+                            '-o', os.devnull], cwd=RAIZ, check=True)
+        return (time.perf_counter() - inicio) / n
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="benchmarks.servidor")
+    parser.add_argument("-n", "--requisicoes", type=int, default=400)
+    parser.add_argument("-c", "--concorrencia", type=int, default=8)
+    parser.add_argument("-j", "--processos", type=int, help="processos (padrão: todos os núcleos)")
+    parser.add_argument("--processo", type=int, default=0, metavar="N",
+                        help="também mede N execuções com um processo novo cada")
+    args = parser.parse_args(argv)
+
+    inicio = time.perf_counter()
+    servidor = Servidor(args.processos, tempo=5.0, passos=20_000, saida=10 / 1024)
+    print(f"pool de {servidor.processos} processos aquecido em {time.perf_counter() - inicio:.2f}s")
+    http = criar(servidor, porta=0)
+    threading.Thread(target=http.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{http.server_address[1]}"
+    try:
+        total, latencias = cliente(url, args.requisicoes, args.concorrencia)
+        print(f"{args.requisicoes} requisições ({args.concorrencia} concorrentes) em {total:.2f}s: "
+              f"{args.requisicoes / total:.0f} req/s, latência p50 {percentil(latencias, 0.5) * 1000:.1f} ms, "
+              f"p99 {percentil(latencias, 0.99) * 1000:.1f} ms")
+        print("métricas do servidor:", json.dumps(metricas(url), ensure_ascii=False))
+    finally:
+        http.shutdown()
+        http.server_close()
+        servidor.fechar()
+    if args.processo:
+        print(f"processo novo por programa: {por_processo(args.processo) * 1000:.1f} ms cada")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+# benchmarks/suite.py
+# Mede léxico, parser e execução separadamente sobre as cargas geradas e
+# compara com um baseline gravado.
+# Uso: python -m benchmarks [--escala 0.5] [--modo vm|arvore] [--salvar]
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+from lexico import lex
+from sintatico import AnalisadorSintatico, Program, FuncDecl, While, For
+from compilador import compilar, MaquinaVirtual
+from saida import SaidaStream
+from otimizador import otimizar as otimizar_ast
+from benchmarks.cargas import CARGAS
+
+BASELINE = os.path.join(os.path.dirname(__file__), 'baseline.json')
+# métricas de custo comparadas com o baseline (maior = pior)
+METRICAS = ('lex_s', 'parse_s', 'exec_s', 'pico_mb')
+# diferenças absolutas abaixo disso são ruído de medição
+MINIMO = {'lex_s': 0.01, 'parse_s': 0.01, 'exec_s': 0.01, 'pico_mb': 1.0}
+
+def contar_statements(program: Program) -> int:
+    total, pendentes = 0, list(program.statements)
+    while pendentes:
+        s = pendentes.pop()
+        total += 1
+        if isinstance(s, (FuncDecl, While, For)):
+            pendentes.extend(s.body)
+    return total
+
+def pipeline(codigo: str, modo: str, saida, otimizar: bool = False):
+    t0 = time.perf_counter()
+    tokens = lex(codigo)
+    t1 = time.perf_counter()
+    analisador = AnalisadorSintatico(tokens, saida)
+    program = analisador.parse()
+    t2 = time.perf_counter()
+    if analisador.has_error:
+        raise RuntimeError("carga gerou erro de sintaxe")
+    if otimizar:
+        otimizar_ast(program)
+    if modo == "vm":
+        MaquinaVirtual(analisador).executar(compilar(program))
+    else:
+        analisador.execute(program)
+    saida.flush()
+    t3 = time.perf_counter()
+    return tokens, program, (t1 - t0, t2 - t1, t3 - t2)
+
+def medir(codigo: str, passos: int, modo: str, repeticoes: int, memoria: bool,
+          otimizar: bool = False) -> dict:
+    with open(os.devnull, 'w') as nulo:
+        melhores = [float('inf')] * 3
+        for _ in range(repeticoes):
+            tokens, program, tempos = pipeline(codigo, modo, SaidaStream(nulo), otimizar)
+            melhores = [min(a, b) for a, b in zip(melhores, tempos)]
+        pico = 0
+        if memoria:
+            tracemalloc.start()
+            pipeline(codigo, modo, SaidaStream(nulo), otimizar)
+            pico = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+    lex_s, parse_s, exec_s = melhores
+    n_tokens, n_stmts = len(tokens), contar_statements(program)
+    return {
+        'tokens': n_tokens, 'statements': n_stmts, 'passos': passos,
+        'lex_s': lex_s, 'parse_s': parse_s, 'exec_s': exec_s,
+        'tokens_s': n_tokens / lex_s, 'statements_parse_s': n_stmts / parse_s,
+        'statements_exec_s': passos / exec_s, 'pico_mb': pico / 2**20,
+    }
+
+def comparar(resultados: dict, baseline: dict, tolerancia: float) -> list:
+    regressoes = []
+    for nome, atual in resultados.items():
+        base = baseline.get('cargas', {}).get(nome)
+        if not base:
+            continue
+        for m in METRICAS:
+            if (base.get(m) and atual[m] > base[m] * (1 + tolerancia)
+                    and atual[m] - base[m] > MINIMO[m]):
+                regressoes.append((nome, m, base[m], atual[m]))
+    return regressoes
+
+def imprimir(resultados: dict, baseline: dict):
+    cab = (f"{'carga':<18} {'tokens/s':>10} {'stmts/s parse':>14} {'stmts/s exec':>13} "
+           f"{'lex':>7} {'parse':>7} {'exec':>7} {'pico MB':>8}")
+    print(cab)
+    for nome, r in resultados.items():
+        linha = (f"{nome:<18} {r['tokens_s']:>10.0f} {r['statements_parse_s']:>14.0f} "
+                 f"{r['statements_exec_s']:>13.0f} {r['lex_s']:>7.3f} {r['parse_s']:>7.3f} "
+                 f"{r['exec_s']:>7.3f} {r['pico_mb']:>8.1f}")
+        base = baseline.get('cargas', {}).get(nome)
+        if base and base.get('exec_s'):
+            linha += f"   exec x{r['exec_s'] / base['exec_s']:.2f} vs baseline"
+        print(linha)
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="benchmarks", description="Suíte de desempenho MineScript")
+    parser.add_argument("--escala", type=float, default=1.0, help="multiplica o tamanho das cargas")
+    parser.add_argument("--modo", choices=("vm", "arvore"), default="vm")
+    parser.add_argument("-O", "--otimizar", action="store_true", help="aplica o otimizador de AST")
+    parser.add_argument("--cargas", help="lista separada por vírgulas (padrão: todas)")
+    parser.add_argument("-r", "--repeticoes", type=int, default=3, help="usa o melhor tempo de N execuções")
+    parser.add_argument("--sem-memoria", action="store_true", help="não mede o pico de memória")
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--salvar", action="store_true", help="grava os resultados como novo baseline")
+    parser.add_argument("--tolerancia", type=float, default=0.25, help="regressão aceita (0.25 = 25%%)")
+    parser.add_argument("--json", help="grava os resultados neste arquivo")
+    args = parser.parse_args(argv)
+
+    escolhidas = set(args.cargas.split(',')) if args.cargas else None
+    resultados = {}
+    for carga in CARGAS:
+        if escolhidas and carga.nome not in escolhidas:
+            continue
+        codigo, passos = carga.gerar(max(1, int(carga.escala * args.escala)))
+        resultados[carga.nome] = medir(codigo, passos, args.modo, args.repeticoes,
+                                       not args.sem_memoria, args.otimizar)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        meta = (baseline.get('escala'), baseline.get('modo'), baseline.get('otimizar', False))
+        if meta != (args.escala, args.modo, args.otimizar):
+            print(f"baseline gravado com escala={meta[0]} modo={meta[1]} otimizar={meta[2]}; "
+                  "comparação ignorada", file=sys.stderr)
+            baseline = {}
+    imprimir(resultados, baseline)
+
+    dados = {'escala': args.escala, 'modo': args.modo, 'otimizar': args.otimizar, 'cargas': resultados}
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(dados, f, indent=2)
+    if args.salvar:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(dados, f, indent=2)
+        print(f"baseline gravado em {args.baseline}")
+        return 0
+
+    regressoes = comparar(resultados, baseline, args.tolerancia)
+    for nome, m, antes, depois in regressoes:
+        print(f"REGRESSÃO {nome}.{m}: {antes:.3f} -> {depois:.3f}", file=sys.stderr)
+    return 1 if regressoes else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
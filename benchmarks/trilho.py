@@ -0,0 +1,50 @@
+# benchmarks/trilho.py
+# trilho de contagem (caminho rápido) contra o redstone equivalente, com o
+# mesmo corpo, nos dois modos de execução.
+# Uso: python -m benchmarks.trilho [iterações ...]
+import sys
+import time
+from minescript import executar
+from saida import SaidaMemoria
+
+CORPO = "total = total + i;"
+
+def redstone(n: int) -> str:
+    return f"""
+bau total = 0;
+bau i = 0;
+redstone (i < {n}) {{
+    {CORPO}
+    i = i + 1;
+}}
+quadro(total);
+"""
+
+def trilho(n: int) -> str:
+    return f"""
+bau total = 0;
+trilho (bau i = 0; i < {n}; i = i + 1) {{
+    {CORPO}
+}}
+quadro(total);
+"""
+
+def medir(codigo: str, modo: str):
+    saida = SaidaMemoria()
+    inicio = time.perf_counter()
+    executar(codigo, saida, modo)
+    return time.perf_counter() - inicio, saida.texto().strip()
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    ns = [int(a) for a in argv] or [100_000, 1_000_000]
+    print(f"{'iterações':>10} {'modo':<7} {'redstone (s)':>13} {'trilho (s)':>11} {'ganho':>7}")
+    for n in ns:
+        for modo in ("vm", "arvore"):
+            t_red, r_red = medir(redstone(n), modo)
+            t_tri, r_tri = medir(trilho(n), modo)
+            assert r_red == r_tri, (r_red, r_tri)
+            print(f"{n:>10} {modo:<7} {t_red:>13.3f} {t_tri:>11.3f} {t_red / t_tri:>6.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# benchmarks/vm.py
+# Compara o interpretador de árvore (referência) com a máquina virtual de bytecode.
+# Uso: python -m benchmarks.vm [iteracoes]
+import sys
+import time
+from lexico import lex
+from sintatico import AnalisadorSintatico
+from compilador import compilar, MaquinaVirtual
+from saida import SaidaMemoria
+
+def loop_contagem(n: int) -> str:
+    # loop.mine escalado, sem impressão no corpo
+    return f"""
+bau madeira = {n};
+redstone (madeira > 0) {{
+    madeira = madeira - 1;
+}}
+quadro("fim: ", madeira);
+"""
+
+def loop_aritmetico(n: int) -> str:
+    return f"""
+bau i = 0;
+bau acc = 0;
+redstone (i < {n}) {{
+    acc = acc + (i + 1) * 2 - (i + 1) / 4;
+    i = i + 1;
+}}
+quadro("acc: ", acc);
+"""
+
+def loop_chamadas(n: int) -> str:
+    return f"""
+craftar soma(bau a, bau b) {{
+    fornalha a + b;
+}}
+bau i = 0;
+bau total = 0;
+redstone (i < {n}) {{
+    total = soma(total, i + 1);
+    i = i + 1;
+}}
+quadro("total: ", total);
+"""
+
+def loop_impressao(n: int) -> str:
+    return f"""
+bau madeira = {n};
+redstone (madeira > 0) {{
+    madeira = madeira - 1;
+    quadro("Contagem: ", madeira);
+}}
+"""
+
+CARGAS = [
+    ("loop.mine (contagem)", loop_contagem, 1),
+    ("aritmética", loop_aritmetico, 1),
+    ("impressão", loop_impressao, 4),
+    ("chamadas soma()", loop_chamadas, 20),
+]
+
+def medir(codigo: str, modo: str):
+    term = SaidaMemoria()
+    analisador = AnalisadorSintatico(lex(codigo), term)
+    program = analisador.parse()
+    assert not analisador.has_error, ''.join(term.erros)
+    inicio = time.perf_counter()
+    if modo == "vm":
+        MaquinaVirtual(analisador).executar(compilar(program))
+    else:
+        analisador.execute(program)
+    return time.perf_counter() - inicio, term.linhas
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    n = int(argv[0]) if argv else 200_000
+    print(f"{'carga':<24} {'iter':>9} {'árvore (s)':>11} {'vm (s)':>9} {'ganho':>7}")
+    for nome, gerar, divisor in CARGAS:
+        iteracoes = max(1, n // divisor)
+        codigo = gerar(iteracoes)
+        t_arvore, saida_arvore = medir(codigo, "arvore")
+        t_vm, saida_vm = medir(codigo, "vm")
+        assert saida_arvore == saida_vm, f"saídas divergentes em {nome}"
+        print(f"{nome:<24} {iteracoes:>9} {t_arvore:>11.3f} {t_vm:>9.3f} {t_arvore/t_vm:>6.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+# cache.py
+# Cache em disco de arquivos .mine já analisados (no espírito do .pyc): a chave
+# é o hash do conteúdo + a versão do interpretador, então uma execução com o
+# fonte inalterado pula léxico e parser. Guarda a AST ou, para a VM, o
+# bytecode já compilado (bem mais rápido de carregar que a árvore de objetos).
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+from typing import Any, Dict, Optional
+
+# mude ao alterar o formato da AST de forma que o hash dos fontes não perceba
+VERSAO_FORMATO = 3
+LIMITE_BYTES = 64 * 2**20
+LIMITE_ENTRADAS = 256
+EXTENSAO = '.msc'
+
+def diretorio_padrao() -> str:
+    return os.environ.get('MINESCRIPT_CACHE') or os.path.join(
+        os.path.expanduser('~'), '.cache', 'minescript')
+
+def versao_interpretador() -> str:
+    # esses módulos definem a AST e o bytecode; mudar qualquer um invalida o cache
+    h = hashlib.sha256(f"{VERSAO_FORMATO}:{sys.version_info[0]}.{sys.version_info[1]}".encode())
+    base = os.path.dirname(os.path.abspath(__file__))
+    for nome in ('lexico.py', 'sintatico.py', 'otimizador.py', 'compilador.py', 'memoizacao.py',
+                 'listas.py'):
+        with open(os.path.join(base, nome), 'rb') as f:
+            h.update(f.read())
+    return h.hexdigest()[:16]
+
+class CacheDisco:
+    def __init__(self, diretorio: Optional[str] = None, limite_bytes: int = LIMITE_BYTES,
+                 limite_entradas: int = LIMITE_ENTRADAS):
+        self.diretorio = diretorio or diretorio_padrao()
+        self.limite_bytes = limite_bytes
+        self.limite_entradas = limite_entradas
+        self.versao = versao_interpretador()
+        self.acertos = 0
+        self.falhas = 0
+        self.despejos = 0
+
+    def chave(self, fonte: bytes, variante: str = 'ast') -> str:
+        # variante: que forma do programa a entrada guarda ('ast', 'vm', 'vm-O')
+        return hashlib.sha256(f"{self.versao}:{variante}\0".encode() + fonte).hexdigest()
+
+    def caminho(self, chave: str) -> str:
+        return os.path.join(self.diretorio, chave + EXTENSAO)
+
+    def carregar(self, chave: str) -> Optional[Any]:
+        path = self.caminho(chave)
+        try:
+            with open(path, 'rb') as f:
+                valor = pickle.load(f)
+        except FileNotFoundError:
+            self.falhas += 1
+            return None
+        except Exception:
+            # entrada corrompida ou de formato antigo: descarta
+            self.falhas += 1
+            self.remover(path)
+            return None
+        # o mtime marca o último uso (despejo LRU)
+        try: os.utime(path)
+        except OSError: pass
+        self.acertos += 1
+        return valor
+
+    def gravar(self, chave: str, valor: Any) -> bool:
+        try:
+            dados = pickle.dumps(valor, protocol=pickle.HIGHEST_PROTOCOL)
+        except (RecursionError, pickle.PicklingError):
+            return False
+        if len(dados) > self.limite_bytes:
+            return False
+        try:
+            os.makedirs(self.diretorio, exist_ok=True)
+            # escrita atômica: outro processo nunca lê um arquivo pela metade
+            fd, tmp = tempfile.mkstemp(dir=self.diretorio, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(dados)
+            os.replace(tmp, self.caminho(chave))
+        except OSError:
+            return False
+        self.despejar()
+        return True
+
+    def entradas(self):
+        # (mtime, tamanho, caminho) de cada entrada, da mais antiga para a mais nova
+        try:
+            nomes = os.listdir(self.diretorio)
+        except OSError:
+            return []
+        out = []
+        for nome in nomes:
+            if nome.endswith(EXTENSAO):
+                path = os.path.join(self.diretorio, nome)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                out.append((st.st_mtime, st.st_size, path))
+        out.sort()
+        return out
+
+    def despejar(self):
+        entradas = self.entradas()
+        total = sum(e[1] for e in entradas)
+        while entradas and (len(entradas) > self.limite_entradas or total > self.limite_bytes):
+            _, tamanho, path = entradas.pop(0)
+            self.remover(path)
+            total -= tamanho
+            self.despejos += 1
+
+    def limpar(self):
+        for _, _, path in self.entradas():
+            self.remover(path)
+
+    @staticmethod
+    def remover(path: str):
+        try: os.remove(path)
+        except OSError: pass
+
+    def estatisticas(self) -> Dict[str, int]:
+        entradas = self.entradas()
+        return {'acertos': self.acertos, 'falhas': self.falhas, 'despejos': self.despejos,
+                'entradas': len(entradas), 'bytes': sum(e[1] for e in entradas)}
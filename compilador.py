@@ -0,0 +1,492 @@
+# compilador.py
+from typing import List, Tuple, Any
+from sintatico import (ASTNode, Program, VarDecl, Assign, FuncDecl, Return, Print,
+                       Call, BinOp, UnaryOp, Logico, Literal, Var, While, For, ListaLiteral,
+                       Indice, Contagem, OPERADORES, coletar_locais, plano_contagem)
+from escopo import Frame, LimiteExcedido, ErroExecucao, ERROS_PYTHON, erro_execucao, novo_frame, AUSENTE
+from lexico import ID
+from listas import Lista, indexar
+
+# --- Opcodes ---
+LOAD_CONST    = 0
+LOAD_VAR      = 1
+STORE_VAR     = 2
+BINARY_OP     = 3
+JUMP          = 4
+JUMP_IF_FALSE = 5
+CALL          = 6
+RETURN        = 7
+POP_TOP       = 8
+PRINT         = 9
+MAKE_FUNCTION = 10
+LOAD_FAST     = 13
+STORE_FAST    = 14
+UNARY_NEG     = 15
+# 'fornalha f(...)' dentro de uma função: reaproveita o frame atual
+TAIL_CALL     = 16
+# listas: [a, b, c] e v[i]
+BUILD_LIST    = 17
+INDEX         = 18
+# trilho de contagem: FOR_PREP cria a Contagem e entra no laço (ou pula para o
+# fim); FOR_ITER, no fim do corpo, avança i e volta ou sai do laço
+FOR_PREP      = 19
+FOR_ITER      = 20
+# 'nao', 'e' e 'ou': o salto deixa na pilha o operando que decidiu
+UNARY_NOT            = 21
+JUMP_IF_FALSE_OR_POP = 22
+JUMP_IF_TRUE_OR_POP  = 23
+# pseudo-instrução do compilador: fixa o destino do salto de um 'e'/'ou'
+_ROTULO = -1
+# saltos com destino no argumento (corrigidos por fundir)
+SALTOS = (JUMP, JUMP_IF_FALSE, JUMP_IF_FALSE_OR_POP, JUMP_IF_TRUE_OR_POP)
+# superinstruções geradas pelo otimizador de janela (peephole)
+BINARY_VAR_CONST = 11
+BINARY_VAR_VAR   = 12
+
+NOMES_OPCODES = {
+    LOAD_CONST: 'LOAD_CONST', LOAD_VAR: 'LOAD_VAR', STORE_VAR: 'STORE_VAR',
+    BINARY_OP: 'BINARY_OP', JUMP: 'JUMP', JUMP_IF_FALSE: 'JUMP_IF_FALSE',
+    CALL: 'CALL', RETURN: 'RETURN', POP_TOP: 'POP_TOP', PRINT: 'PRINT',
+    MAKE_FUNCTION: 'MAKE_FUNCTION', BINARY_VAR_CONST: 'BINARY_VAR_CONST',
+    BINARY_VAR_VAR: 'BINARY_VAR_VAR', LOAD_FAST: 'LOAD_FAST', STORE_FAST: 'STORE_FAST',
+    UNARY_NEG: 'UNARY_NEG', TAIL_CALL: 'TAIL_CALL', BUILD_LIST: 'BUILD_LIST', INDEX: 'INDEX',
+    FOR_PREP: 'FOR_PREP', FOR_ITER: 'FOR_ITER', UNARY_NOT: 'UNARY_NOT',
+    JUMP_IF_FALSE_OR_POP: 'JUMP_IF_FALSE_OR_POP', JUMP_IF_TRUE_OR_POP: 'JUMP_IF_TRUE_OR_POP',
+}
+
+# índices em (locals, globals) usados pelas superinstruções
+LOCAL, GLOBAL = 0, 1
+
+# Instrução: (opcode, argumento)
+Instrucao = Tuple[int, Any]
+# Posição: (linha, coluna) do nó que gerou a instrução
+Posicao = Tuple[int, int]
+
+class Codigo:
+    def __init__(self, nome: str, instrucoes: List[Instrucao], posicoes: List[Posicao]):
+        self.nome, self.instrucoes = nome, instrucoes
+        # tabela paralela a 'instrucoes', usada nas mensagens de erro
+        self.posicoes = posicoes
+
+class Funcao:
+    def __init__(self, name: str, params: List[str], locais: List[str], codigo: Codigo):
+        self.name, self.params, self.locais, self.codigo = name, params, locais, codigo
+
+# --- Compilador: AST -> bytecode ---
+class Compilador:
+    def __init__(self, nome: str = '<programa>', locais: List[str] = (), funcao: bool = False):
+        self.nome = nome
+        # nomes locais da função; no nível do programa tudo é global
+        self.locais = set(locais)
+        # só dentro de funções 'fornalha f(...)' vira chamada de cauda
+        self.funcao = funcao
+        self.instrucoes: List[Instrucao] = []
+        self.posicoes: List[Posicao] = []
+        self.posicao: Posicao = (0, 0)
+
+    def emitir(self, op: int, arg: Any = None) -> int:
+        self.instrucoes.append((op, arg))
+        self.posicoes.append(self.posicao)
+        return len(self.instrucoes) - 1
+
+    def corrigir(self, indice: int, alvo: int):
+        op, _ = self.instrucoes[indice]
+        self.instrucoes[indice] = (op, alvo)
+
+    def compilar(self, node: ASTNode) -> Codigo:
+        stmts = node.statements if isinstance(node, Program) else [node]
+        for s in stmts: self.stmt(s)
+        self.emitir(LOAD_CONST, None)
+        self.emitir(RETURN)
+        return Codigo(self.nome, *fundir(self.instrucoes, self.posicoes))
+
+    def stmt(self, node: ASTNode):
+        anterior = self.posicao
+        if node.linha: self.posicao = (node.linha, node.coluna)
+        self.compilar_stmt(node)
+        self.posicao = anterior
+
+    def expr(self, raiz: ASTNode):
+        # pós-ordem com pilha explícita: expressões longas (cadeias de BinOp)
+        # não esbarram no limite de recursão do Python. Itens: (nó, posição
+        # herdada) ou (opcode, argumento, posição) de uma instrução adiada
+        anterior = self.posicao
+        pendentes = [(raiz, self.posicao)]
+        while pendentes:
+            item = pendentes.pop()
+            if len(item) == 3:
+                op, arg, self.posicao = item
+                if op == _ROTULO:
+                    self.corrigir(arg[0], len(self.instrucoes))
+                elif op == JUMP_IF_FALSE_OR_POP or op == JUMP_IF_TRUE_OR_POP:
+                    arg.append(self.emitir(op))
+                else:
+                    self.emitir(op, arg)
+                continue
+            node, pos = item
+            if node.linha: pos = (node.linha, node.coluna)
+            self.posicao = pos
+            if isinstance(node, Literal):
+                self.emitir(LOAD_CONST, node.value)
+            elif isinstance(node, Var):
+                self.emitir(LOAD_FAST if node.name in self.locais else LOAD_VAR, node.name)
+            elif isinstance(node, BinOp):
+                pendentes.append((BINARY_OP, OPERADORES[node.op], pos))
+                pendentes.append((node.right, pos))
+                pendentes.append((node.left, pos))
+            elif isinstance(node, Call):
+                pendentes.append((CALL, (node.name, len(node.args)), pos))
+                pendentes.extend((a, pos) for a in reversed(node.args))
+            elif isinstance(node, UnaryOp):
+                pendentes.append((UNARY_NOT if node.op == 'nao' else UNARY_NEG, None, pos))
+                pendentes.append((node.expr, pos))
+            elif isinstance(node, Logico):
+                # esquerdo, salto (se ele decide), direito, rótulo
+                salto = []
+                pendentes.append((_ROTULO, salto, pos))
+                pendentes.append((node.right, pos))
+                pendentes.append((JUMP_IF_FALSE_OR_POP if node.op == 'e' else JUMP_IF_TRUE_OR_POP,
+                                  salto, pos))
+                pendentes.append((node.left, pos))
+            elif isinstance(node, ListaLiteral):
+                pendentes.append((BUILD_LIST, len(node.itens), pos))
+                pendentes.extend((i, pos) for i in reversed(node.itens))
+            elif isinstance(node, Indice):
+                pendentes.append((INDEX, None, pos))
+                pendentes.append((node.indice, pos))
+                pendentes.append((node.expr, pos))
+            else:
+                self.emitir(LOAD_CONST, None)
+        self.posicao = anterior
+
+    def compilar_stmt(self, node: ASTNode):
+        if isinstance(node, (VarDecl, Assign)):
+            self.expr(node.expr)
+            self.emitir(STORE_FAST if node.name in self.locais else STORE_VAR, node.name)
+        elif isinstance(node, Print):
+            for a in node.args: self.expr(a)
+            self.emitir(PRINT, len(node.args))
+        elif isinstance(node, FuncDecl):
+            locais = coletar_locais(node.params, node.body)
+            corpo = Compilador(node.name, locais, funcao=True).compilar(Program(node.body))
+            self.emitir(MAKE_FUNCTION, Funcao(node.name, node.params, locais, corpo))
+        elif isinstance(node, Return):
+            if self.funcao and isinstance(node.expr, Call):
+                # o RETURN seguinte só roda se a VM não puder reaproveitar o frame
+                for a in node.expr.args: self.expr(a)
+                anterior = self.posicao
+                if node.expr.linha: self.posicao = (node.expr.linha, node.expr.coluna)
+                self.emitir(TAIL_CALL, (node.expr.name, len(node.expr.args)))
+                self.posicao = anterior
+            else:
+                self.expr(node.expr)
+            self.emitir(RETURN)
+        elif isinstance(node, Call):
+            self.expr(node)
+            self.emitir(POP_TOP)
+        elif isinstance(node, While):
+            inicio = len(self.instrucoes)
+            self.expr(node.condition)
+            salto = self.emitir(JUMP_IF_FALSE)
+            for s in node.body: self.stmt(s)
+            self.emitir(JUMP, inicio)
+            self.corrigir(salto, len(self.instrucoes))
+        elif isinstance(node, For):
+            if node.inicio is not None: self.stmt(node.inicio)
+            plano = plano_contagem(node)
+            if plano is not None and self.contagem_segura(plano):
+                nome, op, limite, passo, _ = plano
+                escopo = LOCAL if nome in self.locais else GLOBAL
+                # a Contagem fica na pilha enquanto o laço roda; FOR_ITER no fim
+                # do corpo volta para o início (sem JUMP)
+                self.expr(limite)
+                prep = self.emitir(FOR_PREP)
+                inicio = len(self.instrucoes)
+                for s in node.body: self.stmt(s)
+                self.emitir(FOR_ITER, (escopo, nome, inicio))
+                self.instrucoes[prep] = (FOR_PREP, (escopo, nome, op, passo, len(self.instrucoes)))
+                return
+            inicio = len(self.instrucoes)
+            # sem condição, um teste sempre verdadeiro: é no JUMP_IF_FALSE que
+            # cada volta conta um passo
+            if node.condition is not None:
+                self.expr(node.condition)
+            else:
+                self.emitir(LOAD_CONST, True)
+            salto = self.emitir(JUMP_IF_FALSE)
+            for s in node.body: self.stmt(s)
+            if node.passo is not None: self.stmt(node.passo)
+            self.emitir(JUMP, inicio)
+            self.corrigir(salto, len(self.instrucoes))
+
+    def contagem_segura(self, plano) -> bool:
+        # sem saber quais funções existirão, qualquer chamada no corpo exige
+        # que i e n sejam locais desta função (como em contagem_segura da árvore)
+        nome, _, limite, _, chamadas = plano
+        if not chamadas:
+            return True
+        return self.funcao and nome in self.locais \
+            and (isinstance(limite, Literal) or limite.name in self.locais)
+
+def _escopo(op: int) -> int:
+    return LOCAL if op == LOAD_FAST else GLOBAL
+
+def fundir(instrucoes: List[Instrucao], posicoes: List[Posicao]) -> Tuple[List[Instrucao], List[Posicao]]:
+    # funde LOAD_VAR/LOAD_FAST + LOAD_CONST/LOAD_VAR/LOAD_FAST + BINARY_OP numa
+    # única instrução, desde que nenhum salto caia no meio da sequência
+    alvos = {arg for op, arg in instrucoes if op in SALTOS}
+    alvos.update(arg[-1] for op, arg in instrucoes if op in (FOR_PREP, FOR_ITER))
+    novas: List[Instrucao] = []
+    novas_pos: List[Posicao] = []
+    mapa = {}
+    i, n = 0, len(instrucoes)
+    while i < n:
+        mapa[i] = len(novas)
+        op, arg = instrucoes[i]
+        if (op in (LOAD_VAR, LOAD_FAST) and i + 2 < n and instrucoes[i+2][0] == BINARY_OP
+                and instrucoes[i+1][0] in (LOAD_CONST, LOAD_VAR, LOAD_FAST)
+                and i + 1 not in alvos and i + 2 not in alvos):
+            op2, arg2 = instrucoes[i+1]
+            func = instrucoes[i+2][1]
+            if op2 == LOAD_CONST:
+                novas.append((BINARY_VAR_CONST, (_escopo(op), arg, arg2, func)))
+            else:
+                novas.append((BINARY_VAR_VAR, (_escopo(op), arg, _escopo(op2), arg2, func)))
+            # a posição do operador é a mais útil num erro de execução
+            novas_pos.append(posicoes[i+2])
+            i += 3
+            continue
+        novas.append((op, arg))
+        novas_pos.append(posicoes[i])
+        i += 1
+    mapa[n] = len(novas)
+    return [_saltar(op, arg, mapa) for op, arg in novas], novas_pos
+
+def _saltar(op: int, arg: Any, mapa) -> Instrucao:
+    # corrige o destino de um salto depois da fusão
+    if op in SALTOS:
+        return (op, mapa[arg])
+    if op in (FOR_PREP, FOR_ITER):
+        return (op, arg[:-1] + (mapa[arg[-1]],))
+    return (op, arg)
+
+def compilar(program: Program) -> Codigo:
+    return Compilador().compilar(program)
+
+def _simbolo(func) -> str:
+    return next(s for s, f in OPERADORES.items() if f is func)
+
+def desmontar(codigo: Codigo) -> str:
+    linhas = [f"== {codigo.nome} =="]
+    funcoes = []
+    for i, (op, arg) in enumerate(codigo.instrucoes):
+        if op == MAKE_FUNCTION:
+            funcoes.append(arg.codigo)
+            arg = arg.name
+        elif op == BINARY_OP:
+            arg = _simbolo(arg)
+        elif op in (BINARY_VAR_CONST, BINARY_VAR_VAR):
+            arg = arg[:-1] + (_simbolo(arg[-1]),)
+        linhas.append(f"{i:>5}  {NOMES_OPCODES[op]:<14} {'' if arg is None else repr(arg)}")
+    for f in funcoes:
+        linhas.append(desmontar(f))
+    return '\n'.join(linhas)
+
+def trocar_operadores(codigo: Codigo, trocar) -> Codigo:
+    # cópia do bytecode com as funções dos operadores trocadas por
+    # trocar(func[, constante]) (Governador.vigiar, com cota de memória); as
+    # funções declaradas no código vão junto
+    instrucoes = []
+    for op, arg in codigo.instrucoes:
+        if op == BINARY_OP:
+            arg = trocar(arg)
+        elif op == BINARY_VAR_CONST:
+            arg = arg[:-1] + (trocar(arg[-1], arg[2]),)
+        elif op == BINARY_VAR_VAR:
+            arg = arg[:-1] + (trocar(arg[-1]),)
+        elif op == MAKE_FUNCTION:
+            arg = Funcao(arg.name, arg.params, arg.locais, trocar_operadores(arg.codigo, trocar))
+        instrucoes.append((op, arg))
+    return Codigo(codigo.nome, instrucoes, codigo.posicoes)
+
+# --- Máquina virtual de pilha ---
+class MaquinaVirtual:
+    def __init__(self, analisador):
+        # compartilha estado e terminal com o analisador (modo de referência)
+        self.analisador = analisador
+
+    def executar(self, codigo: Codigo):
+        analisador = self.analisador
+        if analisador.operadores is not OPERADORES:
+            # governado com cota de memória: troca uma vez, fora do laço da VM
+            codigo = trocar_operadores(codigo, analisador.governador.vigiar)
+        frame = analisador.frame
+        try:
+            return self.rodar(codigo, frame)
+        finally:
+            # rodar publica o frame em execução (para a varredura de memória do governador)
+            analisador.frame = frame
+
+    def rodar(self, codigo: Codigo, frame: Frame):
+        analisador = self.analisador
+        functions = analisador.functions
+        escrever = analisador.saida.escrever
+        caches = analisador.memo.caches if analisador.memo else {}
+        nativas = analisador.nativas
+        # pilha de chamadas explícita: uma chamada craftar guarda o estado do
+        # chamador aqui em vez de recursar no Python, então a profundidade da
+        # recursão MineScript só é limitada pela memória
+        chamadas = []
+        locals, globals = frame.locals, frame.globals
+        escopos = (locals, globals)
+        code = codigo.instrucoes
+        stack = []
+        push, pop = stack.append, stack.pop
+        pc = 0
+        try:
+            while True:
+                op, arg = code[pc]
+                pc += 1
+                if op == BINARY_VAR_CONST:
+                    e, name, const, func = arg
+                    push(func(escopos[e].get(name, None), const))
+                elif op == LOAD_FAST:
+                    push(locals[arg])
+                elif op == LOAD_VAR:
+                    push(globals.get(arg, None))
+                elif op == LOAD_CONST:
+                    push(arg)
+                elif op == BINARY_OP:
+                    r = pop()
+                    stack[-1] = arg(stack[-1], r)
+                elif op == STORE_FAST:
+                    locals[arg] = pop()
+                elif op == STORE_VAR:
+                    globals[arg] = pop()
+                elif op == BINARY_VAR_VAR:
+                    e, name, e2, name2, func = arg
+                    push(func(escopos[e].get(name, None), escopos[e2].get(name2, None)))
+                elif op == JUMP_IF_FALSE:
+                    # só aparece no teste de um redstone/trilho: cada teste
+                    # verdadeiro é uma volta, contada antes do corpo (como na árvore)
+                    if not pop():
+                        pc = arg
+                    else:
+                        analisador.passos += 1
+                        if analisador.passos > analisador.teto: analisador.verificar()
+                elif op == FOR_ITER:
+                    e, name, corpo = arg
+                    i = next(stack[-1].valores, AUSENTE)
+                    if i is AUSENTE:
+                        escopos[e][name] = pop().final
+                    else:
+                        escopos[e][name] = i
+                        analisador.passos += 1
+                        if analisador.passos > analisador.teto: analisador.verificar()
+                        pc = corpo
+                elif op == JUMP:
+                    pc = arg
+                elif op == PRINT:
+                    valores = stack[-arg:]
+                    del stack[-arg:]
+                    escrever(''.join(map(str, valores)) + "\n")
+                elif op == CALL or op == TAIL_CALL:
+                    name, nargs = arg
+                    args = stack[len(stack)-nargs:]
+                    del stack[len(stack)-nargs:]
+                    func = functions.get(name)
+                    if func is None:
+                        if name in nativas:
+                            push(nativas[name](*args))
+                            continue
+                        linha, coluna = codigo.posicoes[pc-1]
+                        analisador.erro(f"Erro semântico: função '{name}' não declarada", (ID, name, linha, coluna))
+                        push(None)
+                        continue
+                    # (cache, chave) a preencher quando a chamada retornar. A chamada
+                    # de cauda não consulta o cache: guardar o resultado exigiria
+                    # manter o frame, e a chamada externa já é memoizada
+                    pendente = None
+                    cache = caches.get(name) if op == CALL else None
+                    if cache is not None:
+                        chave = cache.chave(args)
+                        if chave is not None:
+                            valor = cache.obter(chave)
+                            if valor is not AUSENTE:
+                                push(valor)
+                                continue
+                            pendente = (cache, chave)
+                    # um passo por corpo de função executado (nativas e acertos
+                    # do cache não contam), como em AnalisadorSintatico.chamar
+                    analisador.passos += 1
+                    if analisador.passos > analisador.teto: analisador.verificar()
+                    if op == TAIL_CALL:
+                        # o novo frame toma o lugar do atual: recursão de cauda em espaço constante
+                        # (a pilha só guarda as Contagens dos trilhos em volta, que acabaram)
+                        stack.clear()
+                        frame = novo_frame(name, func.params, args, func.locais, frame.anterior)
+                    else:
+                        chamadas.append((codigo, pc, stack, frame, pendente))
+                        frame = novo_frame(name, func.params, args, func.locais, frame)
+                        stack = []
+                        push, pop = stack.append, stack.pop
+                    analisador.frame = frame
+                    codigo = func.codigo
+                    code = codigo.instrucoes
+                    pc = 0
+                    locals = frame.locals
+                    escopos = (locals, globals)
+                elif op == POP_TOP:
+                    pop()
+                elif op == RETURN:
+                    valor = pop()
+                    if not chamadas:
+                        return valor
+                    codigo, pc, stack, frame, pendente = chamadas.pop()
+                    analisador.frame = frame
+                    code = codigo.instrucoes
+                    push, pop = stack.append, stack.pop
+                    locals = frame.locals
+                    escopos = (locals, globals)
+                    if pendente is not None:
+                        pendente[0].guardar(pendente[1], valor)
+                    push(valor)
+                elif op == MAKE_FUNCTION:
+                    functions[arg.name] = arg
+                elif op == UNARY_NEG:
+                    stack[-1] = 0 - stack[-1]
+                elif op == JUMP_IF_FALSE_OR_POP:
+                    if stack[-1]: pop()
+                    else: pc = arg
+                elif op == JUMP_IF_TRUE_OR_POP:
+                    if stack[-1]: pc = arg
+                    else: pop()
+                elif op == UNARY_NOT:
+                    stack[-1] = not stack[-1]
+                elif op == FOR_PREP:
+                    e, name, op_rel, passo, fim = arg
+                    contagem = stack[-1] = Contagem(escopos[e].get(name, None), op_rel, stack[-1], passo)
+                    i = next(contagem.valores, AUSENTE)
+                    if i is AUSENTE:
+                        escopos[e][name] = pop().final
+                        pc = fim
+                    else:
+                        escopos[e][name] = i
+                        analisador.passos += 1
+                        if analisador.passos > analisador.teto: analisador.verificar()
+                elif op == INDEX:
+                    i = pop()
+                    stack[-1] = indexar(stack[-1], i)
+                elif op == BUILD_LIST:
+                    valores = stack[len(stack)-arg:]
+                    del stack[len(stack)-arg:]
+                    push(Lista(valores))
+        except ErroExecucao as e:
+            e.posicionar(*codigo.posicoes[pc-1])
+            raise
+        except ERROS_PYTHON as e:
+            raise erro_execucao(e, *codigo.posicoes[pc-1]) from e
+        except MemoryError:
+            e = LimiteExcedido("memória esgotada", 'memoria')
+            e.posicionar(*codigo.posicoes[pc-1])
+            raise e from None
@@ -0,0 +1,89 @@
+# escopo.py
+from typing import Any, Dict, Iterable, Optional
+
+# --- Quadros de chamada ---
+# Cada chamada craftar ganha um Frame com seus parâmetros e variáveis locais
+# (declaradas com 'bau' no corpo) e um link para o dicionário de globais.
+# No escopo global, locals e globals são o mesmo dicionário.
+class Frame:
+    __slots__ = ('funcao', 'locals', 'globals', 'anterior', 'profundidade')
+
+    def __init__(self, funcao: str, locals: Dict[str, Any], globals: Dict[str, Any],
+                 anterior: Optional['Frame'] = None):
+        self.funcao = funcao
+        self.locals = locals
+        self.globals = globals
+        self.anterior = anterior
+        self.profundidade = 0 if anterior is None else anterior.profundidade + 1
+
+    def buscar(self, name: str):
+        loc = self.locals
+        if name in loc: return loc[name]
+        return self.globals.get(name, None)
+
+    def declarar(self, name: str, valor: Any):
+        self.locals[name] = valor
+
+    def atribuir(self, name: str, valor: Any):
+        # nomes não declarados na função referem-se às globais
+        if name in self.locals: self.locals[name] = valor
+        else: self.globals[name] = valor
+
+def novo_frame(funcao: str, params, args, locais: Iterable[str], anterior: Frame) -> Frame:
+    loc = dict.fromkeys(locais)
+    for p, v in zip(params, args): loc[p] = v
+    return Frame(funcao, loc, anterior.globals, anterior)
+
+# 'fornalha' desempilha o frame imediatamente
+class Retorno(Exception):
+    def __init__(self, valor: Any):
+        self.valor = valor
+
+# levantada quando a execução é cancelada (botão Parar da IDE, limites do lote)
+class Interrompido(Exception):
+    pass
+
+# erro do programa em execução (1 / 0, "a" - 1, v[10], uma cota...).
+# linha/coluna: o statement (ou a instrução da VM) em execução, preenchidos
+# por quem a captura no caminho até o topo
+class ErroExecucao(Exception):
+    def __init__(self, msg: str):
+        super().__init__(msg)
+        self.linha = self.coluna = None
+
+    def posicionar(self, linha: int, coluna: int):
+        if self.linha is None and linha:
+            self.linha, self.coluna = linha, coluna
+
+    def __str__(self):
+        msg = f"Erro de execução: {self.args[0]}"
+        if self.linha is None:
+            return msg
+        return f"[Linha {self.linha}, Coluna {self.coluna}] {msg}"
+
+# erros do Python que um programa pode provocar; o interpretador os troca por
+# um ErroExecucao com a posição (erro_execucao). RecursionError vem de uma
+# recursão craftar profunda no modo arvore (e no perfilador): a troca acontece
+# no primeiro nível, de dentro para fora, com pilha livre para fazê-la
+ERROS_PYTHON = (ArithmeticError, TypeError, ValueError, LookupError, RecursionError)
+# mensagens próprias; as demais são as do Python
+MENSAGENS = {ZeroDivisionError: "divisão por zero", IndexError: "índice fora dos limites",
+             RecursionError: "recursão profunda demais"}
+
+def erro_execucao(e: Exception, linha: int, coluna: int) -> ErroExecucao:
+    erro = ErroExecucao(MENSAGENS.get(type(e)) or str(e) or type(e).__name__)
+    erro.posicionar(linha, coluna)
+    return erro
+
+# cota estourada. recurso: 'passos', 'tempo' ou 'memoria' (do governador) ou
+# 'saida' (de uma SaidaMemoria com limite)
+class LimiteExcedido(ErroExecucao, Interrompido):
+    def __init__(self, msg: str, recurso: str = 'passos'):
+        super().__init__(msg)
+        self.recurso = recurso
+
+def formatar_bytes(n: int) -> str:
+    return f"{n / 2**20:g} MB" if n >= 2**20 else f"{n} bytes"
+
+# sentinela para 'valor ausente' (um None pode ser um resultado legítimo)
+AUSENTE = object()
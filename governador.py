@@ -0,0 +1,209 @@
+# governador.py
+# Cotas para rodar código não confiável: passos (iterações de redstone/trilho
+# + chamadas), tempo de relógio e memória aproximada dos valores.
+#
+# O interpretador já conta passos e chama analisador.verificar() ao passar do
+# teto; com um Governador o teto vira também um ponto de checagem a cada
+# 'intervalo' passos, onde se lê o relógio e (com cota de memória) se somam os
+# valores vivos: globais, locais do frame atual e os frames suspensos abaixo
+# dele (estes pela média por frame da última varredura completa da pilha).
+# Entre dois pontos de checagem o custo é zero. Uma única operação, porém,
+# pode alocar gigabytes ("a" * n, faixa(n)), então com cota de memória '+',
+# '*' e faixa conferem o tamanho do resultado na hora.
+import sys
+import time
+from typing import Any, Dict, Optional, Tuple
+from escopo import Frame, LimiteExcedido, AUSENTE, formatar_bytes
+from listas import Lista
+
+# passos entre dois pontos de checagem
+INTERVALO = 1000
+# uma varredura completa da pilha que mediu n valores só se repete depois de
+# n * FOLGA_VARREDURA passos: somar a pilha de uma recursão profunda a cada
+# checagem custaria mais que a própria execução
+FOLGA_VARREDURA = 16
+# bytes de um frame sem variáveis (Frame + dicionário de locais)
+TAMANHO_FRAME = sys.getsizeof(Frame('', {}, {})) + sys.getsizeof({})
+# maior inteiro que '+' e '*' produzem com cota de memória, em bits. O custo
+# de uma multiplicação triplica a cada vez que os operandos dobram (2^20 bits
+# ~0.15s, 2^24 ~12s): sem teto, x = x * x passaria do prazo e da memória numa
+# única operação, antes do próximo ponto de checagem
+BITS_INTEIRO = 1 << 20
+
+def bits_inteiros(valor: Any) -> int:
+    # bits do maior inteiro em 'valor' (um int ou os elementos de uma Lista)
+    t = type(valor)
+    if t is int:
+        return valor.bit_length()
+    if t is Lista:
+        dados = valor.dados
+        if type(dados) is list:
+            return max((v.bit_length() for v in dados if type(v) is int), default=0)
+        return 64 if dados.typecode == 'q' else 0
+    return 0
+
+def medir_valor(valor: Any) -> int:
+    # bytes aproximados de um valor; listas de strings somam os elementos
+    if type(valor) is Lista:
+        dados = valor.dados
+        if type(dados) is list:
+            return sys.getsizeof(dados) + sum(map(medir_valor, dados))
+        return sys.getsizeof(dados)
+    return sys.getsizeof(valor)
+
+class Governador:
+    def __init__(self, passos: Optional[int] = None, tempo: Optional[float] = None,
+                 memoria: Optional[int] = None, intervalo: int = INTERVALO):
+        # passos, segundos e bytes; None (ou 0) desliga a cota
+        self.passos = passos or None
+        self.tempo = tempo or None
+        self.memoria = memoria or None
+        self.intervalo = intervalo
+        self.prazo = None
+        # maior soma de valores vivos vista numa varredura
+        self.pico = 0
+        self.proxima_varredura = 0
+        # bytes médios de um frame suspenso na última varredura completa
+        self.por_frame = 0.0
+        # id -> (lista, bytes) das listas vistas na última varredura: listas são
+        # imutáveis, então só as novas são medidas de novo
+        self.medidas: Dict[int, Tuple[Lista, int]] = {}
+        # operador original -> versão que confere o tamanho (de operadores())
+        self.vigiados: Dict[Any, Any] = {}
+        self.soma = None
+
+    @property
+    def periodico(self) -> bool:
+        return self.tempo is not None or self.memoria is not None
+
+    def iniciar(self):
+        self.prazo = time.perf_counter() + self.tempo if self.tempo else None
+        self.pico = self.proxima_varredura = 0
+        self.por_frame = 0.0
+        self.medidas = {}
+
+    def estouro_memoria(self) -> LimiteExcedido:
+        return LimiteExcedido(f"limite de memória de {formatar_bytes(self.memoria)} excedido", 'memoria')
+
+    def estouro_inteiro(self, bits: int) -> LimiteExcedido:
+        return LimiteExcedido(f"limite de {bits} bits por inteiro excedido", 'memoria')
+
+    def verificar(self, analisador):
+        # chamado por analisador.verificar() em cada ponto de checagem
+        if self.prazo is not None and time.perf_counter() > self.prazo:
+            raise LimiteExcedido(f"tempo limite de {self.tempo:g}s excedido", 'tempo')
+        if self.memoria is not None:
+            usado = self.medir(analisador.frame, analisador.passos)
+            self.pico = max(self.pico, usado)
+            if usado > self.memoria:
+                raise self.estouro_memoria()
+
+    def medir(self, frame: Frame, passos: int) -> int:
+        # bytes das variáveis vivas a partir de 'frame'
+        anteriores, medidas = self.medidas, {}
+        total = self.somar(frame.globals, anteriores, medidas)
+        if frame.locals is not frame.globals:
+            total += TAMANHO_FRAME + self.somar(frame.locals, anteriores, medidas)
+            suspensos = frame.profundidade - 1
+            if passos >= self.proxima_varredura:
+                soma = valores = 0
+                f = frame.anterior
+                while f is not None and f.locals is not f.globals:
+                    soma += TAMANHO_FRAME + self.somar(f.locals, anteriores, medidas)
+                    valores += len(f.locals) + 1
+                    f = f.anterior
+                self.por_frame = soma / suspensos if suspensos else 0.0
+                self.proxima_varredura = passos + valores * FOLGA_VARREDURA
+                total += soma
+            else:
+                total += int(suspensos * self.por_frame)
+        self.medidas = medidas
+        return total
+
+    def somar(self, escopo: Dict[str, Any], anteriores: Dict, medidas: Dict) -> int:
+        total = 0
+        for v in escopo.values():
+            if type(v) is Lista:
+                m = medidas.get(id(v)) or anteriores.get(id(v)) or (v, medir_valor(v))
+                medidas[id(v)] = m
+                total += m[1]
+            else:
+                # de um int, conta todos os dígitos (não há cache: varia a cada
+                # atribuição e getsizeof já é O(1))
+                total += sys.getsizeof(v)
+        return total
+
+    def operadores(self, base: Dict[str, Any]) -> Dict[str, Any]:
+        # '+' e '*' com a conferência de tamanho; os demais não fazem um valor crescer
+        if self.memoria is None:
+            return base
+        limite = self.memoria
+        bits = min(limite * 8, BITS_INTEIRO)
+        somar, multiplicar = base['+'], base['*']
+
+        # um real + ou * qualquer coisa nunca cresce (com uma lista, dá outra
+        # do mesmo tamanho). Inteiros crescem: a soma até um bit além do
+        # maior operando, o produto até a soma dos bits dos dois, conferidos
+        # antes de calcular (também elemento a elemento, numa Lista)
+        def mais(a, b):
+            t = type(a)
+            if t is int and type(b) is int:
+                if max(a.bit_length(), b.bit_length()) >= bits:
+                    raise self.estouro_inteiro(bits)
+                return somar(a, b)
+            if t is float:
+                return somar(a, b)
+            if t is str:
+                if type(b) is str and len(a) + len(b) > limite:
+                    raise self.estouro_memoria()
+            elif max(bits_inteiros(a), bits_inteiros(b)) >= bits:
+                raise self.estouro_inteiro(bits)
+            v = somar(a, b)
+            if type(v) is Lista and medir_valor(v) > limite:
+                raise self.estouro_memoria()
+            return v
+
+        def vezes(a, b):
+            ta, tb = type(a), type(b)
+            if ta is int and tb is int:
+                if a.bit_length() + b.bit_length() > bits:
+                    raise self.estouro_inteiro(bits)
+                return multiplicar(a, b)
+            if ta is float and (tb is int or tb is float) or tb is float and ta is int:
+                return multiplicar(a, b)
+            if ta is str and tb is int and len(a) * b > limite or tb is str and ta is int and len(b) * a > limite:
+                raise self.estouro_memoria()
+            if bits_inteiros(a) + bits_inteiros(b) > bits:
+                raise self.estouro_inteiro(bits)
+            v = multiplicar(a, b)
+            if type(v) is Lista and medir_valor(v) > limite:
+                raise self.estouro_memoria()
+            return v
+
+        self.soma = somar
+        self.vigiados = {somar: mais, multiplicar: vezes}
+        return dict(base, **{'+': mais, '*': vezes})
+
+    def vigiar(self, func, constante: Any = AUSENTE):
+        # a função que a VM usa no lugar de 'func'. Com uma constante numérica
+        # do outro lado, '+' cresce no máximo um bit (dá um número, uma lista
+        # do mesmo tamanho ou TypeError) e '*' por um real não cresce: fica a
+        # original
+        t = type(constante)
+        if t is float or t is int and func is self.soma:
+            return func
+        return self.vigiados.get(func, func)
+
+    def nativas(self, base: Dict[str, Any]) -> Dict[str, Any]:
+        if self.memoria is None:
+            return base
+        limite = self.memoria
+        faixa = base['faixa']
+
+        def faixa_limitada(n):
+            # 8 bytes por elemento do array 'q'
+            if int(n) * 8 > limite:
+                raise self.estouro_memoria()
+            return faixa(n)
+
+        return dict(base, faixa=faixa_limitada)
@@ -1,49 +1,306 @@
 # lexico.py
 import re
-from typing import List, Tuple
+import mmap
+from typing import Iterator, List, Tuple
 
-# Token: (tipo, valor, linha, coluna)
-Token = Tuple[str,str,int,int]
+# Token: (tipo, valor, linha, coluna); o tipo é um dos inteiros abaixo
+Token = Tuple[int,str,int,int]
 
-def lex(codigo: str) -> List[Token]:
-    tabela_de_token = [
-        ('COMENTARIO',   r'//[^\n]*|#[^\n]*'),
-        ('VARIAVEL',     r'\bbau\b'),
-        ('QUADRO',       r'\bquadro\b'),
-        ('FUNCAO',       r'\bcraftar\b'),
-        ('IF',           r'\bfunil\b'),
-        ('ELSE',         r'\bejetor\b'),
-        ('LOOP_WHILE',   r'\bredstone\b'),
-        ('LOOP_FOR',     r'\btrilho\b'),
-        ('RETORNO',      r'\bfornalha\b'),
-        ('ATRIBUICAO',   r'='),
-        ('OP_ARIT',      r'[+\-*/]'),
-        ('OP_REL',       r'==|!=|>=|<=|>|<'),
-        ('OP_LOGICO',    r'\b(e|ou|nao)\b'),
-        ('DELIM',        r'[(){}\[\];,]'),
-        ('NUM',          r'\d+(\.\d+)?'),
-        ('STRING',       r'"[^"\n]*"'),
-        ('CHAR',         r"'[^'\n]'"),
-        ('ID',           r'[A-Za-z_][A-Za-z0-9_]*'),
-        ('SKIP',         r'[ \t]+'),
-        ('PULARLINHA',   r'\n+'),
-        ('MISMATCH',     r'.'),
-    ]
-    tok_regex = '|'.join(f'(?P<{n}>{p})' for n,p in tabela_de_token)
+tabela_de_token = [
+    ('COMENTARIO',   r'//[^\n]*|#[^\n]*'),
+    ('VARIAVEL',     r'\bbau\b'),
+    ('QUADRO',       r'\bquadro\b'),
+    ('FUNCAO',       r'\bcraftar\b'),
+    ('IF',           r'\bfunil\b'),
+    ('ELSE',         r'\bejetor\b'),
+    ('LOOP_WHILE',   r'\bredstone\b'),
+    ('LOOP_FOR',     r'\btrilho\b'),
+    ('RETORNO',      r'\bfornalha\b'),
+    ('ATRIBUICAO',   r'='),
+    ('OP_ARIT',      r'[+\-*/]'),
+    ('OP_REL',       r'==|!=|>=|<=|>|<'),
+    ('OP_LOGICO',    r'\b(e|ou|nao)\b'),
+    ('DELIM',        r'[(){}\[\];,]'),
+    ('NUM',          r'\d+(\.\d+)?'),
+    ('STRING',       r'"[^"\n]*"'),
+    ('CHAR',         r"'[^'\n]'"),
+    ('ID',           r'[A-Za-z_][A-Za-z0-9_]*'),
+    ('SKIP',         r'[ \t]+'),
+    ('PULARLINHA',   r'\n+'),
+    ('MISMATCH',     r'.'),
+]
+
+# --- Tipos de token ---
+# Inteiros, com um tipo por delimitador: o parser compara tipos sem olhar o
+# valor. NOMES_TIPOS guarda o nome mostrado na listagem e nas mensagens de
+# erro (todos os delimitadores continuam aparecendo como DELIM).
+(VARIAVEL, QUADRO, FUNCAO, IF, ELSE, LOOP_WHILE, LOOP_FOR, RETORNO, ATRIBUICAO,
+ OP_ARIT, OP_REL, OP_LOGICO, ABRE_PAR, FECHA_PAR, ABRE_CHAVE, FECHA_CHAVE,
+ ABRE_COLCHETE, FECHA_COLCHETE, PONTO_VIRGULA, VIRGULA, NUM, STRING, CHAR, ID,
+ COMENTARIO, EOF) = range(26)
+
+DELIMITADORES = {
+    '(': ABRE_PAR, ')': FECHA_PAR, '{': ABRE_CHAVE, '}': FECHA_CHAVE,
+    '[': ABRE_COLCHETE, ']': FECHA_COLCHETE, ';': PONTO_VIRGULA, ',': VIRGULA,
+}
+TIPO_POR_NOME = {
+    'VARIAVEL': VARIAVEL, 'QUADRO': QUADRO, 'FUNCAO': FUNCAO, 'IF': IF, 'ELSE': ELSE,
+    'LOOP_WHILE': LOOP_WHILE, 'LOOP_FOR': LOOP_FOR, 'RETORNO': RETORNO,
+    'ATRIBUICAO': ATRIBUICAO, 'OP_ARIT': OP_ARIT, 'OP_REL': OP_REL, 'OP_LOGICO': OP_LOGICO,
+    'NUM': NUM, 'STRING': STRING, 'CHAR': CHAR, 'ID': ID, 'COMENTARIO': COMENTARIO, 'EOF': EOF,
+}
+NOMES_TIPOS = [''] * (EOF + 1)
+for _nome, _tipo in TIPO_POR_NOME.items(): NOMES_TIPOS[_tipo] = _nome
+for _tipo in DELIMITADORES.values(): NOMES_TIPOS[_tipo] = 'DELIM'
+
+def descrever(tipo: int) -> str:
+    # como o tipo aparece em "esperado ...": DELIM ')' para delimitadores
+    nome = NOMES_TIPOS[tipo]
+    if nome == 'DELIM':
+        return f"DELIM '{next(v for v, t in DELIMITADORES.items() if t == tipo)}'"
+    return nome
+
+# palavras-chave casam como ID e são classificadas por dicionário, o que
+# encurta a alternância testada a cada posição do texto
+PALAVRAS_CHAVE = {
+    'bau': VARIAVEL, 'quadro': QUADRO, 'craftar': FUNCAO, 'funil': IF,
+    'ejetor': ELSE, 'redstone': LOOP_WHILE, 'trilho': LOOP_FOR,
+    'fornalha': RETORNO, 'e': OP_LOGICO, 'ou': OP_LOGICO, 'nao': OP_LOGICO,
+}
+_tabela = [(n,p) for n,p in tabela_de_token if n not in {NOMES_TIPOS[t] for t in PALAVRAS_CHAVE.values()}]
+
+# padrões compilados uma única vez, na importação do módulo
+TOK_REGEX = re.compile('|'.join(f'(?P<{n}>{p})' for n,p in _tabela))
+# versão em bytes para arquivos mapeados em memória; um CHAR pode ser um
+# caractere UTF-8 de vários bytes
+_tabela_bytes = [(n, r"'(?:[^'\n\x80-\xff]|[\xc0-\xff][\x80-\xbf]+)'" if n == 'CHAR' else p)
+                 for n,p in _tabela]
+TOK_REGEX_BYTES = re.compile('|'.join(f'(?P<{n}>{p})' for n,p in _tabela_bytes).encode())
+# um arquivo com algum byte não ASCII usa TOK_REGEX_UNICODE (ver _regex_unicode)
+_NAO_ASCII = re.compile(rb'[\x80-\xff]')
+TOK_REGEX_UNICODE = None
+
+IGNORADOS = frozenset(('SKIP','COMENTARIO','MISMATCH'))
+
+# número do grupo do regex (mo.lastindex) -> tipo; None para PULARLINHA e
+# ignorados, DELIM para delimitadores (o tipo depende do valor)
+def _tipos_por_grupo(regex):
+    tabela = [None] * (regex.groups + 1)
+    for nome, i in regex.groupindex.items():
+        if nome == 'DELIM': tabela[i] = 'DELIM'
+        elif nome == 'PULARLINHA' or nome in IGNORADOS: tabela[i] = None
+        else: tabela[i] = TIPO_POR_NOME[nome]
+    return tabela
+
+_GRUPOS = _tipos_por_grupo(TOK_REGEX)
+_GRUPOS_BYTES = _tipos_por_grupo(TOK_REGEX_BYTES)
+_GRUPO_LINHA = TOK_REGEX.groupindex['PULARLINHA']
+_GRUPO_LINHA_BYTES = TOK_REGEX_BYTES.groupindex['PULARLINHA']
+_GRUPO_COMENTARIO = TOK_REGEX.groupindex['COMENTARIO']
+
+def _palavra(c: str) -> bool:
+    return c.isalnum() or c == '_'
+
+def _tipo_id(codigo: str, val: str, start: int, end: int) -> int:
+    # equivale ao \b dos padrões de palavra-chave: não pode haver letra/dígito colado
+    kind = PALAVRAS_CHAVE.get(val)
+    if kind is None: return ID
+    if start > 0 and _palavra(codigo[start-1]): return ID
+    if end < len(codigo) and _palavra(codigo[end]): return ID
+    return kind
+
+def _palavra_antes_b(mm, i: int) -> bool:
+    # _palavra do caractere UTF-8 que termina no byte i
+    b = mm[i-1]
+    if b < 0x80: return _palavra(chr(b))
+    inicio = i - 1
+    while inicio > 0 and i - inicio < 4 and mm[inicio] & 0xc0 == 0x80: inicio -= 1
+    return _palavra(mm[inicio:i].decode('utf-8', 'replace')[-1])
+
+def _palavra_depois_b(mm, i: int) -> bool:
+    # _palavra do caractere UTF-8 que começa no byte i
+    b = mm[i]
+    if b < 0x80: return _palavra(chr(b))
+    return _palavra(mm[i:i+4].decode('utf-8', 'replace')[0])
+
+def _tipo_id_b(mm, val: str, start: int, end: int) -> int:
+    kind = PALAVRAS_CHAVE.get(val)
+    if kind is None: return ID
+    if start > 0 and _palavra_antes_b(mm, start): return ID
+    if end < len(mm) and _palavra_depois_b(mm, end): return ID
+    return kind
+
+def _regex_unicode():
+    # o \d de NUM no padrão em str casa qualquer dígito decimal do Unicode
+    # ('٣', '５'...); no padrão em bytes eles entram pela codificação UTF-8
+    # de cada um, agrupados pelos bytes iniciais. Todos os dígitos decimais
+    # estão nos planos 0 e 1. Montado só para o primeiro arquivo não ASCII
+    global TOK_REGEX_UNICODE
+    if TOK_REGEX_UNICODE is None:
+        finais = {}
+        for c in map(chr, range(0x80, 0x20000)):
+            if c.isdecimal():
+                b = c.encode()
+                finais.setdefault(b[:-1], []).append(b[-1])
+        def hexa(bs):
+            return ''.join(f'\\x{b:02x}' for b in bs)
+        digitos = '|'.join(f'{hexa(p)}[{hexa(u)}]' for p, u in finais.items())
+        # o lookahead descarta um byte ASCII depois do número sem testar cada alternativa
+        d = rf'(?:[0-9]|(?=[\xc0-\xff])(?:{digitos}))'
+        tabela = [(n, rf'{d}+(\.{d}+)?' if n == 'NUM' else p) for n,p in _tabela_bytes]
+        TOK_REGEX_UNICODE = re.compile('|'.join(f'(?P<{n}>{p})' for n,p in tabela).encode())
+    return TOK_REGEX_UNICODE
+
+def tokenizar(codigo: str) -> Iterator[Token]:
+    # gera os tokens sob demanda, sem materializar a lista inteira
+    grupos, delims = _GRUPOS, DELIMITADORES
     line_num = 1
     line_start = 0
-    tokens: List[Token] = []
-    for mo in re.finditer(tok_regex, codigo):
-        kind = mo.lastgroup
+    for mo in TOK_REGEX.finditer(codigo):
+        g = mo.lastindex
+        kind = grupos[g]
+        if kind is None:
+            if g == _GRUPO_LINHA:
+                line_num += mo.end() - mo.start()
+                line_start = mo.end()
+            continue
         val = mo.group()
         start = mo.start()
-        if kind == 'PULARLINHA':
-            line_num += val.count('\n')
-            line_start = mo.end()
-            continue
-        if kind in ('SKIP','COMENTARIO','MISMATCH'):
-            continue
-        col = start - line_start + 1
-        tokens.append((kind, val, line_num, col))
-    tokens.append(('EOF','', line_num, 1))
-    return tokens
+        if kind == ID:
+            kind = _tipo_id(codigo, val, start, mo.end())
+        elif kind == 'DELIM':
+            kind = delims[val]
+        yield (kind, val, line_num, start - line_start + 1)
+    yield (EOF,'', line_num, 1)
+
+def tokenizar_arquivo(path: str) -> Iterator[Token]:
+    # lê direto de um arquivo mapeado em memória (mmap), sem carregá-lo num str
+    with open(path, 'rb') as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # arquivo vazio não pode ser mapeado
+            yield (EOF,'', 1, 1)
+            return
+        with mm:
+            grupos, delims = _GRUPOS_BYTES, DELIMITADORES
+            line_num = 1
+            # coluna em caracteres, não em bytes: 'col' caracteres da linha
+            # até o byte 'pos' (o início do token anterior), somados a cada
+            # token só a partir dali; recontar desde o início da linha
+            # deixaria linhas longas (fontes minificados) quadráticas
+            pos = 0
+            col = 1
+            regex = _regex_unicode() if _NAO_ASCII.search(mm) else TOK_REGEX_BYTES
+            for mo in regex.finditer(mm):
+                g = mo.lastindex
+                kind = grupos[g]
+                if kind is None:
+                    if g == _GRUPO_LINHA_BYTES:
+                        line_num += mo.end() - mo.start()
+                        pos = mo.end()
+                        col = 1
+                    continue
+                start = mo.start()
+                trecho = mm[pos:start]
+                col += len(trecho) if trecho.isascii() else len(trecho.decode('utf-8', 'replace'))
+                pos = start
+                val = mo.group().decode('utf-8')
+                if kind == ID:
+                    kind = _tipo_id_b(mm, val, start, mo.end())
+                elif kind == 'DELIM':
+                    kind = delims[val]
+                yield (kind, val, line_num, col)
+            yield (EOF,'', line_num, 1)
+
+def lex(codigo: str) -> List[Token]:
+    return list(tokenizar(codigo))
+
+class FluxoTokens:
+    # janela sobre um gerador de tokens para o parser: busca tokens conforme
+    # a posição avança e descarta os já consumidos
+    def __init__(self, tokens: Iterator[Token], janela: int = 4096):
+        self.fonte = iter(tokens)
+        self.buffer: List[Token] = []
+        self.base = 0
+        self.janela = janela
+
+    def __getitem__(self, i: int) -> Token:
+        rel = i - self.base
+        if rel < 0:
+            raise IndexError("fluxo de tokens não volta a posições já descartadas")
+        buf = self.buffer
+        while rel >= len(buf):
+            tok = next(self.fonte, None)
+            if tok is None:
+                raise IndexError(i)
+            buf.append(tok)
+        if rel > self.janela:
+            # mantém o token anterior para o peek/erro
+            del buf[:rel-1]
+            self.base += rel-1
+            rel = 1
+        return buf[rel]
+
+# --- Léxico incremental (editor) ---
+# Strings, chars e comentários do MineScript nunca atravessam a quebra de
+# linha, então os tokens de uma linha dependem só do texto dela: re-lexar as
+# linhas tocadas por uma edição já cobre a abertura/fechamento de '"' ou '//'.
+# TokenLinha: (tipo, valor, coluna)
+TokenLinha = Tuple[int,str,int]
+
+def lex_linha(texto: str) -> List[TokenLinha]:
+    # tokens de uma única linha, incluindo comentários (usados no destaque)
+    toks: List[TokenLinha] = []
+    for mo in TOK_REGEX.finditer(texto):
+        g = mo.lastindex
+        kind = _GRUPOS[g]
+        if kind is None:
+            if g != _GRUPO_COMENTARIO:
+                continue
+            kind = COMENTARIO
+        val = mo.group()
+        start = mo.start()
+        if kind == ID:
+            kind = _tipo_id(texto, val, start, mo.end())
+        elif kind == 'DELIM':
+            kind = DELIMITADORES[val]
+        toks.append((kind, val, start + 1))
+    return toks
+
+class LexicoIncremental:
+    def __init__(self, codigo: str = ''):
+        self.linhas: List[str] = []
+        self.cache: List[List[TokenLinha]] = []
+        self.sincronizar(codigo)
+
+    def editar(self, inicio: int, fim: int, novas_linhas: List[str]) -> range:
+        # substitui as linhas [inicio, fim) e re-lexa apenas as novas
+        self.linhas[inicio:fim] = novas_linhas
+        self.cache[inicio:fim] = [lex_linha(l) for l in novas_linhas]
+        return range(inicio, inicio + len(novas_linhas))
+
+    def sincronizar(self, codigo: str) -> range:
+        # compara com o texto anterior (prefixo e sufixo comuns) e re-lexa o miolo
+        novas = codigo.split('\n')
+        antigas = self.linhas
+        n_old, n_new = len(antigas), len(novas)
+        limite = min(n_old, n_new)
+        i = 0
+        while i < limite and antigas[i] == novas[i]:
+            i += 1
+        j = 0
+        while j < limite - i and antigas[n_old-1-j] == novas[n_new-1-j]:
+            j += 1
+        return self.editar(i, n_old - j, novas[i:n_new-j])
+
+    def tokens(self) -> List[Token]:
+        # mesma lista que lex(codigo) produziria, montada a partir do cache
+        out: List[Token] = []
+        append = out.append
+        for n, toks in enumerate(self.cache, 1):
+            for kind, val, col in toks:
+                if kind != COMENTARIO:
+                    append((kind, val, n, col))
+        out.append((EOF,'', len(self.linhas), 1))
+        return out
@@ -0,0 +1,122 @@
+# listas.py
+# Listas do MineScript: [1, 2, 3], v[i], tamanho(v) e aritmética elemento a
+# elemento. Os elementos ficam num array.array ('q' para inteiros, 'd' para
+# reais) e cada operação percorre a lista inteira em C (map com a função do
+# operator), sem um passo do interpretador por elemento.
+import operator
+from array import array
+from functools import total_ordering
+from itertools import repeat
+from typing import Any, Iterable, Optional
+
+def _empacotar(valores: Iterable[Any], tipo: Optional[str] = None):
+    # array compacto só quando ele guarda exatamente os mesmos valores: 'q'
+    # se todos são int (bool não: True viraria 1) e cabem em 64 bits, 'd' se
+    # todos são float. Misturas, inteiros grandes, strings e listas aninhadas
+    # ficam numa list comum, sem mudar de tipo. 'tipo': o tipo dos elementos,
+    # quando quem chama já o conhece (dispensa olhar um por um)
+    if isinstance(valores, array):
+        return valores
+    valores = valores if isinstance(valores, list) else list(valores)
+    if tipo is None:
+        tipos = set(map(type, valores))
+        tipo = 'q' if tipos <= {int} else 'd' if tipos == {float} else None
+    if tipo == 'q':
+        try:
+            return array('q', valores)
+        except OverflowError:
+            return valores
+    if tipo == 'd':
+        return array('d', valores)
+    return valores
+
+def _tipo(valor) -> Optional[str]:
+    # tipo dos elementos de um operando de aplicar: o typecode de um array ou
+    # o de um número; None se desconhecido (list comum, string...)
+    t = type(valor)
+    if t is Lista:
+        return valor.dados.typecode if type(valor.dados) is array else None
+    if t is int or t is bool:
+        return 'q'
+    return 'd' if t is float else None
+
+@total_ordering
+class Lista:
+    # imutável: valores compartilhados (literais dobrados, cache da memoização)
+    # nunca mudam por baixo de quem os guardou
+    __slots__ = ('dados',)
+
+    def __init__(self, valores: Iterable[Any] = (), tipo: Optional[str] = None):
+        self.dados = _empacotar(valores, tipo)
+
+    def __len__(self):
+        return len(self.dados)
+
+    def __iter__(self):
+        return iter(self.dados)
+
+    def __getitem__(self, i):
+        return self.dados[i]
+
+    def __eq__(self, outro):
+        return isinstance(outro, Lista) and len(self.dados) == len(outro.dados) \
+            and all(map(operator.eq, self.dados, outro.dados))
+
+    def __ne__(self, outro):
+        return not self == outro
+
+    def __lt__(self, outro):
+        # comparação lexicográfica, como a de strings
+        if not isinstance(outro, Lista):
+            return NotImplemented
+        return list(self.dados) < list(outro.dados)
+
+    # sem hash: uma lista nunca vira chave do cache de memoização
+    __hash__ = None
+
+    def __str__(self):
+        return '[' + ', '.join(map(str, self.dados)) + ']'
+
+    __repr__ = __str__
+
+    def aplicar(self, func, outro, invertido: bool = False) -> 'Lista':
+        if isinstance(outro, Lista):
+            if len(outro.dados) != len(self.dados):
+                raise ValueError(f"listas de tamanhos diferentes ({len(self.dados)} e {len(outro.dados)})")
+            outros = outro.dados
+        else:
+            outros = repeat(outro, len(self.dados))
+        # inteiros com +, - e * dão inteiros; qualquer real ou a divisão, reais
+        tipos = (_tipo(self), _tipo(outro))
+        tipo = None if None in tipos else 'd' if 'd' in tipos or func is operator.truediv else 'q'
+        if invertido:
+            return Lista(map(func, outros, self.dados), tipo)
+        return Lista(map(func, self.dados, outros), tipo)
+
+    def __add__(self, outro): return self.aplicar(operator.add, outro)
+    def __sub__(self, outro): return self.aplicar(operator.sub, outro)
+    def __mul__(self, outro): return self.aplicar(operator.mul, outro)
+    def __truediv__(self, outro): return self.aplicar(operator.truediv, outro)
+    def __radd__(self, outro): return self.aplicar(operator.add, outro, True)
+    def __rsub__(self, outro): return self.aplicar(operator.sub, outro, True)
+    def __rmul__(self, outro): return self.aplicar(operator.mul, outro, True)
+    def __rtruediv__(self, outro): return self.aplicar(operator.truediv, outro, True)
+
+def indexar(valor, i):
+    # v[i] de listas e strings; aceita índice real inteiro (n / 2 com n par)
+    if type(i) is float and i.is_integer():
+        i = int(i)
+    return valor[i]
+
+def tamanho(valor) -> int:
+    return len(valor)
+
+def faixa(n) -> Lista:
+    # [0, 1, ..., n-1]
+    return Lista(array('q', range(int(n))))
+
+def soma(valor):
+    return sum(valor)
+
+# funções embutidas, visíveis quando não há um craftar com o mesmo nome
+NATIVAS = {'tamanho': tamanho, 'faixa': faixa, 'soma': soma}
@@ -0,0 +1,221 @@
+# lote.py
+# Correção em lote: roda todos os .mine de um diretório num pool de processos,
+# com tempo, passos, memória e saída limitados por arquivo, e grava um relatório JSON ou CSV.
+# Uso: python -m lote entregas/ --esperado saida.txt -r relatorio.csv
+#
+# A saída esperada vem de --esperado (a mesma para todos) ou, por arquivo, de
+# <nome>.esperado ao lado do .mine. Sem nenhuma das duas, só erros reprovam.
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Tuple
+from lexico import lex
+from sintatico import AnalisadorSintatico
+from escopo import LimiteExcedido, ErroExecucao
+from governador import Governador
+from saida import SaidaMemoria
+from minescript import executar_programa, MODOS
+
+TEMPO_PADRAO = 5.0
+PASSOS_PADRAO = 10_000_000
+MEMORIA_PADRAO = 256   # MB
+SAIDA_PADRAO = 16      # MB de saída + erros guardados
+# segundos além do tempo limite até o processo de um arquivo ser encerrado à
+# força: o tempo do governador só é conferido nos pontos de checagem, e uma
+# única operação longa (ou o parser de um arquivo enorme) não passa por eles
+MARGEM_S = 2.0
+# status possíveis de cada arquivo
+APROVADO, REPROVADO, EXECUTADO, ERRO, TEMPO, PASSOS, MEMORIA, SAIDA = (
+    'aprovado', 'reprovado', 'executado', 'erro', 'tempo', 'passos', 'memoria', 'saida')
+CAMPOS_CSV = ('arquivo', 'status', 'tempo_s', 'passos', 'erros')
+
+def normalizar(texto: str) -> str:
+    # ignora espaços no fim das linhas e linhas vazias no fim
+    return '\n'.join(l.rstrip() for l in texto.rstrip().splitlines())
+
+def rodar(codigo: str, esperado: Optional[str] = None, tempo: float = TEMPO_PADRAO,
+          passos: int = PASSOS_PADRAO, memoria: float = MEMORIA_PADRAO, modo: str = "vm",
+          limite_saida: float = SAIDA_PADRAO) -> Dict:
+    # um programa com as cotas do governador (o interpretador para no
+    # próximo ponto de checagem: laço ou chamada) e a saída guardada limitada
+    # a limite_saida MB (para no quadro que passaria dele); analisador novo a
+    # cada chamada, então nada de symbols/functions passa de um programa a outro
+    saida = SaidaMemoria(int(limite_saida * 2**20) if limite_saida else None)
+    analisador: Optional[AnalisadorSintatico] = None
+    status = None
+    inicio = time.perf_counter()
+    try:
+        analisador = AnalisadorSintatico(lex(codigo), saida)
+        program = analisador.parse()
+        governador = Governador(passos, tempo, int(memoria * 2**20) if memoria else None)
+        executar_programa(analisador, program, saida, modo, governador=governador)
+    except LimiteExcedido as e:
+        status = {'tempo': TEMPO, 'memoria': MEMORIA, 'saida': SAIDA}.get(e.recurso, PASSOS)
+        saida.erro(f"{e}\n")
+    except ErroExecucao as e:
+        status = ERRO
+        saida.erro(f"{e}\n")
+    except RecursionError:
+        status = ERRO
+        saida.erro("recursão profunda demais\n")
+    except Exception as e:
+        status = ERRO
+        saida.erro(f"{type(e).__name__}: {e}\n")
+    duracao = time.perf_counter() - inicio
+    texto = saida.texto()
+    if status is None:
+        if analisador.has_error:
+            status = ERRO
+        elif esperado is None:
+            status = EXECUTADO
+        else:
+            status = APROVADO if normalizar(texto) == normalizar(esperado) else REPROVADO
+    return {'status': status, 'tempo_s': round(duracao, 6),
+            'passos': analisador.passos if analisador else 0,
+            'saida': texto, 'erros': ''.join(saida.erros)}
+
+def avaliar(tarefa) -> Dict:
+    # roda num processo do pool
+    path, esperado, tempo, passos, memoria, modo, limite_saida = tarefa
+    try:
+        with open(path, encoding='utf-8', errors='replace') as f:
+            codigo = f.read()
+    except OSError as e:
+        return {'arquivo': path, 'status': ERRO, 'tempo_s': 0.0, 'passos': 0,
+                'saida': '', 'erros': f"{type(e).__name__}: {e}\n"}
+    return {'arquivo': path, **rodar(codigo, esperado, tempo, passos, memoria, modo, limite_saida)}
+
+def interrompido(path: str, status: str, duracao: float, erros: str) -> Dict:
+    return {'arquivo': path, 'status': status, 'tempo_s': round(duracao, 6), 'passos': 0,
+            'saida': '', 'erros': erros}
+
+def encerrar(pool: ProcessPoolExecutor):
+    # shutdown não interrompe um processo ocupado: os processos são
+    # encerrados à força antes, e shutdown só espera a thread do pool sair
+    for p in list((pool._processes or {}).values()):
+        p.terminate()
+    pool.shutdown(cancel_futures=True)
+
+def listar(diretorio: str) -> List[str]:
+    arquivos = []
+    for raiz, _, nomes in os.walk(diretorio):
+        arquivos.extend(os.path.join(raiz, n) for n in nomes if n.endswith('.mine'))
+    return sorted(arquivos)
+
+def ler_esperado(path: str, comum: Optional[str]) -> Optional[str]:
+    if comum is not None:
+        return comum
+    proprio = os.path.splitext(path)[0] + '.esperado'
+    if os.path.exists(proprio):
+        with open(proprio, encoding='utf-8', errors='replace') as f:
+            return f.read()
+    return None
+
+def corrigir(arquivos: List[str], esperado: Optional[str] = None, tempo: float = TEMPO_PADRAO,
+             passos: int = PASSOS_PADRAO, modo: str = "vm", processos: int = None,
+             memoria: float = MEMORIA_PADRAO, limite_saida: float = SAIDA_PADRAO) -> List[Dict]:
+    tarefas = [(p, ler_esperado(p, esperado), tempo, passos, memoria, modo, limite_saida)
+               for p in arquivos]
+    processos = processos or os.cpu_count() or 1
+    if processos == 1 and not tempo:
+        return [avaliar(t) for t in tarefas]
+    # no máximo um arquivo por processo: cada um começa a rodar assim que é
+    # enviado, e o prazo conta dali. Um arquivo que passa do prazo derruba o
+    # pool; os outros em andamento recomeçam num pool novo
+    prazo = tempo + MARGEM_S if tempo else None
+    resultados: List[Optional[Dict]] = [None] * len(tarefas)
+    pendentes = deque(range(len(tarefas)))
+    em_andamento: Dict[Future, Tuple[int, float]] = {}
+    pool = ProcessPoolExecutor(max_workers=processos)
+    try:
+        while pendentes or em_andamento:
+            while pendentes and len(em_andamento) < processos:
+                i = pendentes.popleft()
+                em_andamento[pool.submit(avaliar, tarefas[i])] = (i, time.perf_counter())
+            espera = None
+            if prazo is not None:
+                primeiro = min(inicio for _, inicio in em_andamento.values())
+                espera = max(0.0, primeiro + prazo - time.perf_counter())
+            prontos, _ = wait(em_andamento, timeout=espera, return_when=FIRST_COMPLETED)
+            refazer = False
+            for f in prontos:
+                i, inicio = em_andamento.pop(f)
+                try:
+                    resultados[i] = f.result()
+                except BrokenProcessPool:
+                    # o processo morreu (falta de memória do sistema, sinal)
+                    refazer = True
+                    resultados[i] = interrompido(tarefas[i][0], ERRO, time.perf_counter() - inicio,
+                                                 "processo de execução encerrado\n")
+            agora = time.perf_counter()
+            for f, (i, inicio) in list(em_andamento.items()):
+                if prazo is not None and agora - inicio > prazo:
+                    del em_andamento[f]
+                    refazer = True
+                    resultados[i] = interrompido(tarefas[i][0], TEMPO, agora - inicio,
+                                                 f"tempo limite de {tempo:g}s excedido (processo encerrado)\n")
+            if refazer:
+                pendentes.extendleft(sorted((i for i, _ in em_andamento.values()), reverse=True))
+                em_andamento.clear()
+                encerrar(pool)
+                pool = ProcessPoolExecutor(max_workers=processos)
+    finally:
+        encerrar(pool)
+    return resultados
+
+def gravar_relatorio(resultados: List[Dict], path: str):
+    if path.endswith('.csv'):
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            w = csv.DictWriter(f, fieldnames=CAMPOS_CSV, extrasaction='ignore')
+            w.writeheader()
+            w.writerows(resultados)
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(resultados, f, indent=2, ensure_ascii=False)
+
+def resumo(resultados: List[Dict], total_s: float) -> str:
+    contagem: Dict[str, int] = {}
+    for r in resultados:
+        contagem[r['status']] = contagem.get(r['status'], 0) + 1
+    partes = ', '.join(f"{n} {s}" for s, n in sorted(contagem.items()))
+    return f"{len(resultados)} arquivos em {total_s:.2f}s: {partes or 'nenhum'}"
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="lote", description="Corrige vários arquivos .mine em paralelo")
+    parser.add_argument("diretorio")
+    parser.add_argument("--esperado", help="arquivo com a saída esperada de todos os programas")
+    parser.add_argument("-r", "--relatorio", help="grava o relatório (.json ou .csv)")
+    parser.add_argument("-t", "--tempo", type=float, default=TEMPO_PADRAO, help="segundos por arquivo")
+    parser.add_argument("--passos", type=int, default=PASSOS_PADRAO,
+                        help="iterações de redstone + chamadas por arquivo (0 desliga)")
+    parser.add_argument("--memoria", type=float, default=MEMORIA_PADRAO,
+                        help="MB de valores vivos por arquivo, aproximado (0 desliga)")
+    parser.add_argument("--saida", type=float, default=SAIDA_PADRAO,
+                        help="MB de saída + erros guardados por arquivo (0 desliga)")
+    parser.add_argument("-j", "--processos", type=int, help="processos (padrão: todos os núcleos)")
+    parser.add_argument("--modo", choices=MODOS, default="vm")
+    args = parser.parse_args(argv)
+
+    esperado = None
+    if args.esperado:
+        with open(args.esperado, encoding='utf-8', errors='replace') as f:
+            esperado = f.read()
+    inicio = time.perf_counter()
+    resultados = corrigir(listar(args.diretorio), esperado, args.tempo, args.passos,
+                          args.modo, args.processos, args.memoria, args.saida)
+    total = time.perf_counter() - inicio
+    for r in resultados:
+        print(f"{r['status']:<10} {r['tempo_s']:>8.3f}s  {r['arquivo']}")
+    print(resumo(resultados, total))
+    if args.relatorio:
+        gravar_relatorio(resultados, args.relatorio)
+    return 0 if all(r['status'] in (APROVADO, EXECUTADO) for r in resultados) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
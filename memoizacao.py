@@ -0,0 +1,141 @@
+# memoizacao.py
+# Memoização automática de funções craftar puras, com cache LRU por função.
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+from sintatico import (Program, FuncDecl, Assign, Print, Call, Var, While, For, filhos,
+                       coletar_locais)
+from escopo import AUSENTE
+from listas import NATIVAS
+
+TAMANHO_PADRAO = 1024
+# depois de AMOSTRA_MINIMA falhas, um cache com taxa de acerto abaixo de
+# TAXA_MINIMA é abandonado: a função é chamada sempre com argumentos novos
+AMOSTRA_MINIMA = 1024
+TAXA_MINIMA = 0.05
+
+# --- Análise de pureza ---
+def _declaracoes(program: Program) -> Dict[str, Optional[FuncDecl]]:
+    # nome -> FuncDecl; None quando o nome é declarado mais de uma vez. Um
+    # craftar só aparece entre statements: as expressões não são visitadas
+    decls: Dict[str, Optional[FuncDecl]] = {}
+    pendentes = list(program.statements)
+    while pendentes:
+        n = pendentes.pop()
+        if isinstance(n, FuncDecl):
+            decls[n.name] = None if n.name in decls else n
+            pendentes.extend(n.body)
+        elif isinstance(n, (While, For)):
+            pendentes.extend(n.body)
+    return decls
+
+def _analisar(decl: FuncDecl) -> Optional[Set[str]]:
+    # devolve as funções chamadas pelo corpo, ou None se ele é impuro: usa
+    # quadro, declara funções, escreve ou lê globais (o resultado dependeria
+    # de algo além dos argumentos)
+    locais = set(coletar_locais(decl.params, decl.body))
+    chamadas: Set[str] = set()
+    pendentes = list(decl.body)
+    while pendentes:
+        n = pendentes.pop()
+        if isinstance(n, (Print, FuncDecl)):
+            return None
+        if isinstance(n, (Assign, Var)) and n.name not in locais:
+            return None
+        if isinstance(n, Call):
+            chamadas.add(n.name)
+        pendentes.extend(filhos(n))
+    return chamadas
+
+def funcoes_puras(program: Program) -> Set[str]:
+    dependencias: Dict[str, Set[str]] = {}
+    declaracoes = _declaracoes(program)
+    for nome, decl in declaracoes.items():
+        if decl is not None:
+            chamadas = _analisar(decl)
+            if chamadas is not None:
+                dependencias[nome] = chamadas
+    # ponto fixo: só é pura a função que chama apenas funções puras (as
+    # nativas são puras, a menos que um craftar use o mesmo nome)
+    puras = set(dependencias)
+    nativas = set(NATIVAS) - set(declaracoes)
+    mudou = True
+    while mudou:
+        mudou = False
+        for nome in list(puras):
+            if not dependencias[nome] <= puras | nativas:
+                puras.discard(nome)
+                mudou = True
+    return puras
+
+# --- Cache LRU ---
+class CacheLRU:
+    __slots__ = ('tamanho', 'dados', 'acertos', 'falhas', 'despejos', 'abandonado', 'aoabandonar')
+
+    def __init__(self, tamanho: int = TAMANHO_PADRAO, aoabandonar=None):
+        self.tamanho = tamanho
+        self.dados: 'OrderedDict[Tuple, Any]' = OrderedDict()
+        self.acertos = 0
+        self.falhas = 0
+        self.despejos = 0
+        self.abandonado = False
+        self.aoabandonar = aoabandonar
+
+    @staticmethod
+    def chave(args) -> Optional[Tuple]:
+        # o tipo entra na chave: f(1) e f(1.0) podem imprimir resultados diferentes
+        chave = (*args, *map(type, args))
+        try:
+            hash(chave)
+        except TypeError:
+            return None
+        return chave
+
+    def obter(self, chave: Tuple):
+        dados = self.dados
+        valor = dados.get(chave, AUSENTE)
+        if valor is AUSENTE:
+            self.falhas += 1
+        else:
+            self.acertos += 1
+            dados.move_to_end(chave)
+        return valor
+
+    def guardar(self, chave: Tuple, valor: Any):
+        dados = self.dados
+        dados[chave] = valor
+        if len(dados) > self.tamanho:
+            dados.popitem(last=False)
+            self.despejos += 1
+            if self.falhas >= AMOSTRA_MINIMA and self.acertos < self.falhas * TAXA_MINIMA:
+                self.abandonar()
+
+    def abandonar(self):
+        self.abandonado = True
+        self.dados.clear()
+        if self.aoabandonar:
+            self.aoabandonar()
+
+    def estatisticas(self) -> Dict[str, int]:
+        return {'acertos': self.acertos, 'falhas': self.falhas, 'despejos': self.despejos,
+                'tamanho': len(self.dados), 'abandonado': self.abandonado}
+
+class Memoizador:
+    def __init__(self, puras: Iterable[str], tamanho: int = TAMANHO_PADRAO):
+        # 'caches' só contém os caches ativos; é o dicionário consultado a cada chamada
+        self.todos: Dict[str, CacheLRU] = {}
+        if tamanho > 0:
+            for nome in puras:
+                self.todos[nome] = CacheLRU(tamanho, lambda nome=nome: self.caches.pop(nome, None))
+        self.caches: Dict[str, CacheLRU] = dict(self.todos)
+
+    def estatisticas(self) -> Dict[str, Dict[str, int]]:
+        return {nome: c.estatisticas() for nome, c in sorted(self.todos.items())}
+
+    def resumo(self) -> str:
+        partes = [f"{nome}: {e['acertos']} acertos, {e['falhas']} falhas, {e['despejos']} despejos"
+                  + (" (abandonado)" if e['abandonado'] else "")
+                  for nome, e in self.estatisticas().items()]
+        return "Memoização: " + ("; ".join(partes) if partes else "nenhuma função pura")
+
+def memoizador(program: Program, tamanho: int = TAMANHO_PADRAO) -> Memoizador:
+    return Memoizador(funcoes_puras(program), tamanho)
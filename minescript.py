@@ -0,0 +1,175 @@
+# minescript.py
+# Executor de linha de comando (sem Tk): python -m minescript run arquivo.mine
+import argparse
+import json
+import sys
+from typing import Iterable, Optional
+from lexico import lex, tokenizar_arquivo, Token
+from sintatico import AnalisadorSintatico, Program
+from compilador import compilar, MaquinaVirtual
+from saida import Saida, SaidaPadrao, SaidaArquivo
+from otimizador import otimizar as otimizar_ast
+from memoizacao import memoizador, funcoes_puras, Memoizador, TAMANHO_PADRAO
+from perfilador import AnalisadorPerfilado
+from cache import CacheDisco
+from governador import Governador
+from escopo import ErroExecucao, erro_execucao
+
+MODOS = ("vm", "arvore")
+
+def executar(codigo: str, saida: Saida, modo: str = "vm", otimizar: bool = False,
+             memo: int = TAMANHO_PADRAO, governador: Optional[Governador] = None) -> AnalisadorSintatico:
+    # pipeline completo: léxico -> sintático -> [otimizador] -> execução
+    return executar_tokens(lex(codigo), saida, modo, otimizar, memo, governador=governador)
+
+def executar_tokens(tokens: Iterable[Token], saida: Saida, modo: str = "vm",
+                    otimizar: bool = False, memo: int = TAMANHO_PADRAO,
+                    perfil: bool = False, governador: Optional[Governador] = None) -> AnalisadorSintatico:
+    analisador = novo_analisador(tokens, saida, perfil)
+    program = analisador.parse()
+    return executar_programa(analisador, program, saida, modo, otimizar, memo, perfil, governador)
+
+def novo_analisador(tokens: Iterable[Token], saida: Saida, perfil: bool = False) -> AnalisadorSintatico:
+    # perfil: mede linhas e funções; sempre roda no interpretador de árvore
+    return (AnalisadorPerfilado if perfil else AnalisadorSintatico)(tokens, saida)
+
+def executar_programa(analisador: AnalisadorSintatico, program: Program, saida: Saida,
+                      modo: str = "vm", otimizar: bool = False, memo: int = TAMANHO_PADRAO,
+                      perfil: bool = False, governador: Optional[Governador] = None) -> AnalisadorSintatico:
+    # memo: tamanho do cache LRU das funções puras (0 desliga a memoização)
+    # governador: cotas de passos, tempo e memória (LimiteExcedido ao estourar)
+    if not analisador.has_error:
+        if otimizar:
+            analisador.otimizador = otimizar_ast(program)
+        if memo > 0:
+            analisador.memo = memoizador(program, memo)
+        if governador is not None:
+            analisador.governar(governador)
+        if modo == "vm" and not perfil:
+            MaquinaVirtual(analisador).executar(compilar(program))
+        else:
+            analisador.execute(program)
+    saida.flush()
+    return analisador
+
+def executar_arquivo(path: str, saida: Saida, modo: str = "vm", otimizar: bool = False,
+                     memo: int = TAMANHO_PADRAO, perfil: bool = False,
+                     cache: Optional[CacheDisco] = None,
+                     governador: Optional[Governador] = None) -> AnalisadorSintatico:
+    if cache is None:
+        # o parser consome os tokens direto do arquivo mapeado em memória
+        return executar_tokens(tokenizar_arquivo(path), saida, modo, otimizar, memo, perfil, governador)
+    # com o cache, um fonte inalterado pula léxico e parser; na VM pula
+    # também otimizador e compilação (a entrada já é o bytecode)
+    with open(path, 'rb') as f:
+        fonte = f.read()
+    compilado = modo == "vm" and not perfil
+    chave = cache.chave(fonte, ("vm-O" if otimizar else "vm") if compilado else "ast")
+    entrada = cache.carregar(chave)
+    if entrada is not None and not compilado:
+        analisador = novo_analisador([], saida, perfil)
+        analisador.programa = entrada
+        return executar_programa(analisador, entrada, saida, modo, otimizar, memo, perfil, governador)
+    if entrada is not None:
+        analisador = novo_analisador([], saida, perfil)
+        codigo, puras = entrada
+    else:
+        analisador = novo_analisador(tokenizar_arquivo(path), saida, perfil)
+        program = analisador.parse()
+        if analisador.has_error or not compilado:
+            if not analisador.has_error:
+                # grava antes do otimizador, que altera a AST
+                cache.gravar(chave, program)
+            return executar_programa(analisador, program, saida, modo, otimizar, memo, perfil, governador)
+        if otimizar:
+            analisador.otimizador = otimizar_ast(program)
+        codigo, puras = compilar(program), funcoes_puras(program)
+        cache.gravar(chave, (codigo, puras))
+    if memo > 0:
+        analisador.memo = Memoizador(puras, memo)
+    if governador is not None:
+        analisador.governar(governador)
+    MaquinaVirtual(analisador).executar(codigo)
+    saida.flush()
+    return analisador
+
+def cmd_run(args) -> int:
+    saida = SaidaArquivo(args.saida) if args.saida else SaidaPadrao()
+    perfil = args.perfil or bool(args.perfil_json)
+    cache = None if args.sem_cache else CacheDisco(args.cache_dir)
+    governador = None
+    if args.max_passos or args.max_tempo or args.max_memoria:
+        governador = Governador(args.max_passos, args.max_tempo,
+                                int(args.max_memoria * 2**20) if args.max_memoria else None)
+    try:
+        analisador = executar_arquivo(args.arquivo, saida, args.modo, args.otimizar,
+                                      args.memo, perfil, cache, governador)
+    except ErroExecucao as e:
+        # 1 / 0, v[10], cota estourada, recursão profunda...: [Linha L, Coluna C] Erro de execução: ...
+        saida.erro(f"{e}\n")
+        return 1
+    except RecursionError as e:
+        # fora do interpretador (otimizador, cache...), sem posição
+        saida.erro(f"{erro_execucao(e, 0, 0)}\n")
+        return 1
+    finally:
+        saida.fechar()
+    if analisador.otimizador:
+        print(analisador.otimizador.resumo(), file=sys.stderr)
+    if args.memo_stats and analisador.memo:
+        print(analisador.memo.resumo(), file=sys.stderr)
+    if perfil:
+        with open(args.arquivo, encoding='utf-8', errors='replace') as f:
+            fonte = f.read().splitlines()
+        if args.perfil:
+            print(analisador.relatorio(fonte), file=sys.stderr)
+        if args.perfil_json:
+            with open(args.perfil_json, 'w', encoding='utf-8') as f:
+                json.dump(analisador.perfil(fonte), f, indent=2, ensure_ascii=False)
+    return 1 if analisador.has_error else 0
+
+def cmd_cache(args) -> int:
+    cache = CacheDisco(args.cache_dir)
+    if args.limpar:
+        cache.limpar()
+    e = cache.estatisticas()
+    print(f"{cache.diretorio}: {e['entradas']} entradas, {e['bytes'] / 2**20:.1f} MB")
+    return 0
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="minescript", description="Interpretador MineScript")
+    sub = parser.add_subparsers(dest="comando", required=True)
+
+    run = sub.add_parser("run", help="executa um arquivo .mine")
+    run.add_argument("arquivo")
+    run.add_argument("--modo", choices=MODOS, default="vm",
+                     help="vm (bytecode) ou arvore (interpretador de referência)")
+    run.add_argument("-o", "--saida", help="grava a saída do programa neste arquivo")
+    run.add_argument("-O", "--otimizar", action="store_true",
+                     help="dobra constantes e remove código morto antes de executar")
+    run.add_argument("--memo", type=int, default=TAMANHO_PADRAO, metavar="N",
+                     help=f"entradas do cache LRU por função pura (0 desliga; padrão {TAMANHO_PADRAO})")
+    run.add_argument("--memo-stats", action="store_true",
+                     help="mostra acertos/falhas dos caches de memoização")
+    run.add_argument("--perfil", action="store_true",
+                     help="mostra as linhas e funções mais custosas (usa o modo arvore)")
+    run.add_argument("--perfil-json", metavar="ARQUIVO", help="grava o perfil em JSON")
+    run.add_argument("--sem-cache", action="store_true", help="não usa o cache de AST em disco")
+    run.add_argument("--cache-dir", help="diretório do cache (padrão: $MINESCRIPT_CACHE ou ~/.cache/minescript)")
+    run.add_argument("--max-passos", type=int, metavar="N",
+                     help="aborta depois de N iterações de redstone/trilho + chamadas")
+    run.add_argument("--max-tempo", type=float, metavar="S", help="aborta depois de S segundos de execução")
+    run.add_argument("--max-memoria", type=float, metavar="MB",
+                     help="aborta quando os valores vivos passam de MB megabytes (aproximado)")
+    run.set_defaults(func=cmd_run)
+
+    cache = sub.add_parser("cache", help="mostra ou limpa o cache de AST em disco")
+    cache.add_argument("--limpar", action="store_true")
+    cache.add_argument("--cache-dir")
+    cache.set_defaults(func=cmd_cache)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
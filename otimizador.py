@@ -0,0 +1,225 @@
+# otimizador.py
+# Passo opcional entre parse() e execute(): dobra de constantes, propagação de
+# literais e eliminação de código morto.
+from typing import Any, Dict, List, Optional, Set
+from sintatico import (ASTNode, Program, VarDecl, Assign, FuncDecl, Return, Print,
+                       Call, BinOp, UnaryOp, Logico, Literal, Var, While, For, ListaLiteral,
+                       Indice, OPERADORES, UNARIOS, coletar_locais, filhos)
+from listas import Lista, indexar
+
+# strings maiores que isso não são materializadas em tempo de compilação
+LIMITE_STRING = 10_000
+
+def contar_nos(node: ASTNode) -> int:
+    total, pendentes = 0, [node]
+    while pendentes:
+        n = pendentes.pop()
+        total += 1
+        pendentes.extend(filhos(n))
+    return total
+
+def _em(novo: ASTNode, original: ASTNode) -> ASTNode:
+    # o nó criado herda a posição do nó que substitui
+    novo.linha, novo.coluna = original.linha, original.coluna
+    return novo
+
+def escritas_globais(program: Program) -> Dict[str, int]:
+    # quantas vezes cada global é escrita (VarDecl/Assign fora de funções ou
+    # Assign em função para nome não local)
+    contagem: Dict[str, int] = {}
+    pendentes = [(s, None) for s in program.statements]
+    while pendentes:
+        s, locais = pendentes.pop()
+        if isinstance(s, (VarDecl, Assign)):
+            if locais is None or s.name not in locais:
+                contagem[s.name] = contagem.get(s.name, 0) + 1
+        elif isinstance(s, While):
+            pendentes.extend((b, locais) for b in s.body)
+        elif isinstance(s, For):
+            pendentes.extend((b, locais) for b in (s.inicio, s.passo, *s.body) if b is not None)
+        elif isinstance(s, FuncDecl):
+            internos = set(coletar_locais(s.params, s.body))
+            pendentes.extend((b, internos) for b in s.body)
+    return contagem
+
+class Otimizador:
+    def __init__(self):
+        self.nos_antes = 0
+        self.nos_depois = 0
+        self.dobras = 0
+        self.propagacoes = 0
+        self.candidatas: Set[str] = set()
+
+    @property
+    def removidos(self) -> int:
+        return self.nos_antes - self.nos_depois
+
+    def resumo(self) -> str:
+        return (f"Otimizador: {self.removidos} nós removidos ({self.nos_antes} -> {self.nos_depois}), "
+                f"{self.dobras} dobras de constantes, {self.propagacoes} literais propagados")
+
+    def otimizar(self, program: Program) -> Program:
+        self.nos_antes = contar_nos(program)
+        escritas = escritas_globais(program)
+        # candidatas: globais escritas uma única vez, por um 'bau' no nível do programa
+        self.candidatas = {s.name for s in program.statements
+                           if isinstance(s, VarDecl) and escritas.get(s.name) == 1}
+        constantes: Dict[str, Any] = {}
+        program.statements = self.bloco(program.statements, constantes, set(), topo=True)
+        self.nos_depois = contar_nos(program)
+        return program
+
+    # ---- Statements ----
+    def bloco(self, stmts: List[ASTNode], constantes: Dict[str, Any], locais: Set[str],
+              topo: bool = False) -> List[ASTNode]:
+        out = []
+        for s in stmts:
+            s = self.stmt(s, constantes, locais)
+            if s is None:
+                continue
+            out.append(s)
+            if topo and isinstance(s, VarDecl) and s.name in self.candidatas and isinstance(s.expr, Literal):
+                # a partir daqui o nome vale sempre esse literal
+                constantes[s.name] = s.expr.value
+            if isinstance(s, Return):
+                # o resto do bloco é inalcançável
+                break
+        return out
+
+    def stmt(self, node: ASTNode, constantes: Dict[str, Any], locais: Set[str]) -> Optional[ASTNode]:
+        if isinstance(node, (VarDecl, Assign, Return)):
+            node.expr = self.expr(node.expr, constantes, locais)
+        elif isinstance(node, Print):
+            node.args = [self.expr(a, constantes, locais) for a in node.args]
+        elif isinstance(node, Call):
+            node.args = [self.expr(a, constantes, locais) for a in node.args]
+        elif isinstance(node, While):
+            node.condition = self.expr(node.condition, constantes, locais)
+            if isinstance(node.condition, Literal) and not node.condition.value:
+                return None
+            # dentro do loop nenhum literal novo é ativado (o corpo pode repetir)
+            node.body = self.bloco(node.body, dict(constantes), locais)
+        elif isinstance(node, For):
+            if node.inicio is not None:
+                node.inicio = self.stmt(node.inicio, constantes, locais)
+            if node.condition is not None:
+                node.condition = self.expr(node.condition, constantes, locais)
+                if isinstance(node.condition, Literal) and not node.condition.value:
+                    # só o início chega a rodar
+                    return node.inicio
+            node.body = self.bloco(node.body, dict(constantes), locais)
+            if node.passo is not None:
+                node.passo = self.stmt(node.passo, constantes, locais)
+        elif isinstance(node, FuncDecl):
+            internos = set(coletar_locais(node.params, node.body))
+            visiveis = {k: v for k, v in constantes.items() if k not in internos}
+            node.body = self.bloco(node.body, visiveis, internos)
+        return node
+
+    # ---- Expressões ----
+    def expr(self, raiz: ASTNode, constantes: Dict[str, Any], locais: Set[str]) -> ASTNode:
+        # pós-ordem com pilha explícita (cadeias longas de BinOp não esbarram
+        # no limite de recursão); os filhos otimizados ficam em 'prontos'
+        prontos: List[ASTNode] = []
+        pendentes = [(raiz, False)]
+        while pendentes:
+            node, visitado = pendentes.pop()
+            if not visitado:
+                pendentes.append((node, True))
+                if isinstance(node, Call):
+                    pendentes.extend((a, False) for a in reversed(node.args))
+                elif isinstance(node, ListaLiteral):
+                    pendentes.extend((i, False) for i in reversed(node.itens))
+                elif isinstance(node, Indice):
+                    pendentes.append((node.indice, False))
+                    pendentes.append((node.expr, False))
+                elif isinstance(node, UnaryOp):
+                    pendentes.append((node.expr, False))
+                elif isinstance(node, (BinOp, Logico)):
+                    pendentes.append((node.right, False))
+                    pendentes.append((node.left, False))
+                continue
+            if isinstance(node, Call):
+                n = len(node.args)
+                if n:
+                    node.args = prontos[-n:]
+                    del prontos[-n:]
+            elif isinstance(node, ListaLiteral):
+                n = len(node.itens)
+                if n:
+                    node.itens = prontos[-n:]
+                    del prontos[-n:]
+            elif isinstance(node, Indice):
+                node.indice = prontos.pop()
+                node.expr = prontos.pop()
+            elif isinstance(node, UnaryOp):
+                node.expr = prontos.pop()
+            elif isinstance(node, (BinOp, Logico)):
+                node.right = prontos.pop()
+                node.left = prontos.pop()
+            prontos.append(self.reduzir(node, constantes, locais))
+        return prontos[0]
+
+    def reduzir(self, node: ASTNode, constantes: Dict[str, Any], locais: Set[str]) -> ASTNode:
+        # os filhos de 'node' já estão otimizados
+        if isinstance(node, Var):
+            if node.name in constantes and node.name not in locais:
+                self.propagacoes += 1
+                return _em(Literal(constantes[node.name]), node)
+            return node
+        if isinstance(node, UnaryOp):
+            return self.dobrar_unario(node)
+        if isinstance(node, ListaLiteral):
+            # [1, 2, 3] vira uma única constante (listas são imutáveis)
+            if all(isinstance(i, Literal) for i in node.itens):
+                self.dobras += 1
+                return _em(Literal(Lista([i.value for i in node.itens])), node)
+            return node
+        if isinstance(node, Indice):
+            if isinstance(node.expr, Literal) and isinstance(node.indice, Literal):
+                valor = self.avaliar(indexar, node.expr.value, node.indice.value)
+                if valor is not None:
+                    self.dobras += 1
+                    return _em(Literal(valor), node)
+            return node
+        if isinstance(node, Logico):
+            # esquerdo constante: ou ele decide, ou o resultado é o direito
+            if isinstance(node.left, Literal):
+                self.dobras += 1
+                decide = not node.left.value if node.op == 'e' else node.left.value
+                return node.left if decide else node.right
+            return node
+        if isinstance(node, BinOp):
+            # 0 - x  ->  UnaryOp('-', x), que calcula 0 - x sem carregar o literal
+            if node.op == '-' and isinstance(node.left, Literal) and type(node.left.value) is int \
+                    and node.left.value == 0:
+                return self.dobrar_unario(_em(UnaryOp('-', node.right), node))
+            if isinstance(node.left, Literal) and isinstance(node.right, Literal):
+                valor = self.avaliar(OPERADORES[node.op], node.left.value, node.right.value)
+                if valor is not None:
+                    self.dobras += 1
+                    return _em(Literal(valor), node)
+        return node
+
+    def dobrar_unario(self, node: UnaryOp) -> ASTNode:
+        if isinstance(node.expr, Literal):
+            valor = self.avaliar(UNARIOS[node.op], node.expr.value)
+            if valor is not None:
+                self.dobras += 1
+                return _em(Literal(valor), node)
+        return node
+
+    def avaliar(self, func, *operandos):
+        # só dobra o que certamente não falha; erros ficam para a execução
+        try:
+            valor = func(*operandos)
+        except (ArithmeticError, LookupError, TypeError, ValueError):
+            return None
+        if isinstance(valor, str) and len(valor) > LIMITE_STRING:
+            return None
+        return valor
+
+def otimizar(program: Program) -> Otimizador:
+    otimizador = Otimizador()
+    otimizador.otimizar(program)
+    return otimizador
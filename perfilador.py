@@ -0,0 +1,125 @@
+# perfilador.py
+# Perfil de execução por linha e por função. Roda sobre o interpretador de
+# árvore (o de referência): cada statement carrega sua linha desde o parser,
+# e o tempo de uma linha é inclusivo (conta as chamadas feitas nela).
+import time
+from typing import Any, Dict, List, Optional, Sequence
+from sintatico import (AnalisadorSintatico, ASTNode, Program, FuncDecl, Call, While, For)
+from escopo import ErroExecucao, ERROS_PYTHON, erro_execucao
+
+relogio = time.perf_counter
+
+class AnalisadorPerfilado(AnalisadorSintatico):
+    def __init__(self, tokens, terminal):
+        super().__init__(tokens, terminal)
+        # linha -> [execuções, segundos]; função -> [chamadas, segundos]
+        self.linhas: Dict[int, List] = {}
+        self.funcoes: Dict[str, List] = {}
+        # ativações em andamento: numa recursão só a mais externa soma tempo
+        self.ativas_linha: Dict[int, int] = {}
+        self.ativas_funcao: Dict[str, int] = {}
+        self.total_s = 0.0
+
+    def registrar(self, tabela: Dict, ativas: Dict, chave, inicio: float):
+        entrada = tabela.get(chave)
+        if entrada is None:
+            entrada = tabela[chave] = [0, 0.0]
+        entrada[0] += 1
+        if not ativas.get(chave):
+            entrada[1] += relogio() - inicio
+
+    def execute(self, node: ASTNode):
+        if isinstance(node, Program):
+            inicio = relogio()
+            super().execute(node)
+            self.total_s = relogio() - inicio
+            return None
+        if isinstance(node, FuncDecl) or not node.linha:
+            return super().execute(node)
+        linha = node.linha
+        if isinstance(node, (While, For)):
+            try:
+                self.laco(linha, node)
+            except ErroExecucao as e:
+                e.posicionar(linha, node.coluna)
+                raise
+            except ERROS_PYTHON as e:
+                # a condição é avaliada aqui, fora de super().execute
+                raise erro_execucao(e, linha, node.coluna) from e
+            return None
+        inicio = relogio()
+        self.ativas_linha[linha] = self.ativas_linha.get(linha, 0) + 1
+        try:
+            return super().execute(node)
+        finally:
+            # Retorno também passa por aqui: 'fornalha' conta como executada
+            self.ativas_linha[linha] -= 1
+            self.registrar(self.linhas, self.ativas_linha, linha, inicio)
+
+    def laco(self, linha: int, node: ASTNode):
+        if isinstance(node, While):
+            # a condição conta uma execução da linha do redstone a cada teste;
+            # o corpo é medido nas linhas dele
+            while self.condicao(linha, node.condition):
+                self.passos += 1
+                if self.passos > self.teto: self.verificar()
+                for stmt in node.body: self.execute(stmt)
+            return
+        # idem para o trilho (sem o caminho rápido de contagem: cada teste
+        # e cada passo são medidos); início e passo têm a posição deles
+        if node.inicio is not None: self.execute(node.inicio)
+        while node.condition is None or self.condicao(linha, node.condition):
+            self.passos += 1
+            if self.passos > self.teto: self.verificar()
+            for stmt in node.body: self.execute(stmt)
+            if node.passo is not None: self.execute(node.passo)
+
+    def condicao(self, linha: int, expr: ASTNode):
+        inicio = relogio()
+        self.ativas_linha[linha] = self.ativas_linha.get(linha, 0) + 1
+        try:
+            return self.eval_expr(expr)
+        finally:
+            self.ativas_linha[linha] -= 1
+            self.registrar(self.linhas, self.ativas_linha, linha, inicio)
+
+    def eval_expr(self, node: ASTNode):
+        # chamadas em expressões já são medidas na linha do statement
+        if isinstance(node, Call):
+            return AnalisadorSintatico.execute(self, node)
+        return super().eval_expr(node)
+
+    def chamar(self, name: str, args: List[Any]):
+        inicio = relogio()
+        self.ativas_funcao[name] = self.ativas_funcao.get(name, 0) + 1
+        try:
+            return super().chamar(name, args)
+        finally:
+            self.ativas_funcao[name] -= 1
+            self.registrar(self.funcoes, self.ativas_funcao, name, inicio)
+
+    # ---- Relatórios ----
+    def perfil(self, fonte: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        # fonte: linhas do código, para mostrar o texto de cada linha medida
+        linhas = [{'linha': n, 'execucoes': c, 'tempo_s': t,
+                   'texto': fonte[n-1].strip() if fonte and 0 < n <= len(fonte) else ''}
+                  for n, (c, t) in self.linhas.items()]
+        funcoes = [{'funcao': f, 'chamadas': c, 'tempo_s': t} for f, (c, t) in self.funcoes.items()]
+        linhas.sort(key=lambda e: (-e['tempo_s'], e['linha']))
+        funcoes.sort(key=lambda e: (-e['tempo_s'], e['funcao']))
+        return {'total_s': self.total_s, 'linhas': linhas, 'funcoes': funcoes}
+
+    def relatorio(self, fonte: Optional[Sequence[str]] = None, limite: int = 20) -> str:
+        dados = self.perfil(fonte)
+        total = self.total_s
+        out = [f"{'linha':>6} {'execuções':>10} {'tempo (s)':>10} {'%':>6}  código"]
+        for e in dados['linhas'][:limite]:
+            pct = 100 * e['tempo_s'] / total if total else 0.0
+            out.append(f"{e['linha']:>6} {e['execucoes']:>10} {e['tempo_s']:>10.4f} {pct:>6.1f}  {e['texto']}")
+        if dados['funcoes']:
+            out.append("")
+            out.append(f"{'função':<20} {'chamadas':>10} {'tempo (s)':>10}")
+            for e in dados['funcoes'][:limite]:
+                out.append(f"{e['funcao']:<20} {e['chamadas']:>10} {e['tempo_s']:>10.4f}")
+        return "\n".join(out)
+
@@ -0,0 +1,156 @@
+# saida.py
+import sys
+import time
+from typing import Dict, List, Optional, TextIO
+from escopo import LimiteExcedido, formatar_bytes
+
+# --- Saídas (sinks) usadas pelo analisador e pela máquina virtual ---
+class Saida:
+    def escrever(self, texto: str):
+        raise NotImplementedError
+
+    def erro(self, texto: str):
+        self.escrever(texto)
+
+    def flush(self):
+        pass
+
+    def fechar(self):
+        self.flush()
+
+class SaidaBuffer(Saida):
+    # acumula as escritas e despeja em lotes de 'limite' pedaços
+    def __init__(self, limite: int = 512):
+        self.limite = limite
+        self.buffer: List[str] = []
+
+    def escrever(self, texto: str):
+        buf = self.buffer
+        buf.append(texto)
+        if len(buf) >= self.limite:
+            self.flush()
+
+    def flush(self):
+        if self.buffer:
+            texto = ''.join(self.buffer)
+            self.buffer.clear()
+            self.despejar(texto)
+
+    def despejar(self, texto: str):
+        raise NotImplementedError
+
+class SaidaStream(SaidaBuffer):
+    def __init__(self, stream: TextIO, stream_erro: TextIO = None, limite: int = 512):
+        super().__init__(limite)
+        self.stream = stream
+        self.stream_erro = stream_erro or stream
+
+    def despejar(self, texto: str):
+        self.stream.write(texto)
+
+    def erro(self, texto: str):
+        # mantém a ordem relativa entre saída e erros
+        self.flush()
+        self.stream_erro.write(texto)
+
+    def flush(self):
+        super().flush()
+        self.stream.flush()
+
+class SaidaPadrao(SaidaStream):
+    def __init__(self, limite: int = 512):
+        super().__init__(sys.stdout, sys.stderr, limite)
+
+class SaidaArquivo(SaidaStream):
+    def __init__(self, path: str, limite: int = 512):
+        super().__init__(open(path, 'w', encoding='utf-8'), limite=limite)
+
+    def fechar(self):
+        super().fechar()
+        self.stream.close()
+
+# escritas guardadas separadas antes de uma SaidaMemoria com limite juntá-las
+# numa string só (milhões de strings pequenas ocupariam várias vezes o texto)
+JUNTAR = 4096
+
+class SaidaMemoria(Saida):
+    # limite: bytes (UTF-8) de saída + erros guardados. A escrita que passaria
+    # dele não entra e levanta LimiteExcedido uma vez; depois disso o limite
+    # some, para quem captura o erro ainda poder registrá-lo
+    def __init__(self, limite: Optional[int] = None):
+        self.linhas: List[str] = []
+        self.erros: List[str] = []
+        self.limite = limite or None
+        self.tamanho = 0
+        # id da lista -> quantas strings do começo dela já são blocos juntados
+        self.juntas: Dict[int, int] = {}
+
+    def escrever(self, texto: str):
+        if self.limite is not None:
+            self.guardar(self.linhas, texto)
+        else:
+            self.linhas.append(texto)
+
+    def erro(self, texto: str):
+        if self.limite is not None:
+            self.guardar(self.erros, texto)
+        else:
+            self.erros.append(texto)
+
+    def guardar(self, destino: List[str], texto: str):
+        self.tamanho += len(texto) if texto.isascii() else len(texto.encode('utf-8'))
+        if self.tamanho > self.limite:
+            limite, self.limite = self.limite, None
+            raise LimiteExcedido(f"limite de saída de {formatar_bytes(limite)} excedido", 'saida')
+        destino.append(texto)
+        juntas = self.juntas.get(id(destino), 0)
+        if len(destino) - juntas >= JUNTAR:
+            destino[juntas:] = [''.join(destino[juntas:])]
+            self.juntas[id(destino)] = juntas + 1
+
+    def texto(self) -> str:
+        return ''.join(self.linhas)
+
+class SaidaTk(Saida):
+    def __init__(self, widget):
+        self.widget = widget
+
+    def escrever(self, texto: str):
+        self.widget.insert('end', texto)
+
+    def erro(self, texto: str):
+        self.widget.insert('end', texto, "erro")
+
+class SaidaFila(SaidaBuffer):
+    # para execução em outra thread: manda pedaços ('saida'|'erro', texto) para
+    # uma queue.Queue que a interface drena; nunca toca em widgets
+    def __init__(self, fila, limite: int = 512, intervalo: float = 0.05):
+        super().__init__(limite)
+        self.fila = fila
+        self.intervalo = intervalo
+        self.ultimo = time.monotonic()
+
+    def escrever(self, texto: str):
+        buf = self.buffer
+        buf.append(texto)
+        # também despeja por tempo: um laço longo após poucos quadro() não
+        # deixa a saída presa no buffer
+        if len(buf) >= self.limite or time.monotonic() - self.ultimo >= self.intervalo:
+            self.flush()
+
+    def despejar(self, texto: str):
+        self.fila.put(('saida', texto))
+
+    def erro(self, texto: str):
+        self.flush()
+        self.fila.put(('erro', texto))
+
+    def flush(self):
+        super().flush()
+        self.ultimo = time.monotonic()
+
+def como_saida(terminal) -> Saida:
+    # aceita uma Saida pronta ou um widget com .insert (tk.Text)
+    if isinstance(terminal, Saida):
+        return terminal
+    return SaidaTk(terminal)
@@ -0,0 +1,242 @@
+# servidor.py
+# Servidor HTTP local (playground): recebe o fonte MineScript, roda num pool de
+# processos já aquecidos e devolve a saída em JSON. Sem custo de subir o
+# Python nem de importar o interpretador a cada requisição.
+# Uso: python -m servidor [--porta 8765] [-j 4] [-t 5] [--memoria 256] [--saida 16]
+#
+#   POST /executar  corpo: o fonte .mine ou, com Content-Type application/json,
+#                   {"codigo": "...", "modo": "vm"}
+#                   resposta: {"status", "saida", "erros", "tempo_s", "passos"}
+#   GET  /metricas  requisições/s, latências (p50/p90/p99), fila e processos
+#
+# Cada requisição roda com um AnalisadorSintatico novo (symbols e functions
+# próprios) e as cotas do governador, via lote.rodar; o processo só guarda
+# de uma requisição para outra os módulos já importados.
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import CancelledError, ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+from lote import (rodar, encerrar, TEMPO_PADRAO, PASSOS_PADRAO, MEMORIA_PADRAO, SAIDA_PADRAO,
+                  MARGEM_S, APROVADO, EXECUTADO, ERRO, TEMPO)
+from minescript import MODOS
+
+PORTA_PADRAO = 8765
+# maior corpo aceito numa requisição
+TAMANHO_MAXIMO = 1 << 20
+# latências guardadas para os percentis
+JANELA = 10_000
+# segundos considerados em requisições/s
+RECENTE_S = 10.0
+AQUECIMENTO = """
+craftar f(bau n) { fornalha n + 1; }
+trilho (bau i = 0; i < 10; i = f(i)) { quadro(i, [i, 2] * 2); }
+"""
+
+def aquecer():
+    # initializer de cada processo: uma passada por léxico, parser, compilador
+    # e VM antes da primeira requisição
+    rodar(AQUECIMENTO)
+
+def percentil(ordenadas: List[float], q: float) -> float:
+    if not ordenadas:
+        return 0.0
+    return ordenadas[min(len(ordenadas) - 1, int(q * len(ordenadas)))]
+
+class Metricas:
+    # contadores compartilhados pelas threads do servidor HTTP
+    def __init__(self):
+        self.trava = threading.Lock()
+        self.inicio = time.perf_counter()
+        self.total = 0
+        self.erros = 0
+        # requisições aceitas e ainda sem resposta (rodando ou na fila)
+        self.pendentes = 0
+        self.pico_pendentes = 0
+        # (instante do fim, latência) das últimas requisições
+        self.latencias = deque(maxlen=JANELA)
+
+    def entrar(self):
+        with self.trava:
+            self.pendentes += 1
+            self.pico_pendentes = max(self.pico_pendentes, self.pendentes)
+
+    def sair(self, latencia: float, erro: bool):
+        with self.trava:
+            self.pendentes -= 1
+            self.total += 1
+            self.erros += erro
+            self.latencias.append((time.perf_counter(), latencia))
+
+    def resumo(self, processos: int) -> Dict:
+        with self.trava:
+            amostras = list(self.latencias)
+            total, erros, pendentes, pico = self.total, self.erros, self.pendentes, self.pico_pendentes
+        agora = time.perf_counter()
+        ativo = agora - self.inicio
+        recentes = sum(1 for fim, _ in amostras if agora - fim <= RECENTE_S)
+        ordenadas = sorted(l for _, l in amostras)
+        return {
+            'requisicoes': total, 'erros': erros, 'ativo_s': round(ativo, 3),
+            'requisicoes_s': round(recentes / min(RECENTE_S, ativo), 2) if ativo else 0.0,
+            'latencia_ms': {f'p{int(q * 100)}': round(percentil(ordenadas, q) * 1000, 3)
+                            for q in (0.5, 0.9, 0.99)},
+            'processos': processos, 'em_execucao': min(pendentes, processos),
+            'fila': max(0, pendentes - processos), 'fila_maxima': max(0, pico - processos),
+        }
+
+class Servidor:
+    def __init__(self, processos: int = None, tempo: float = TEMPO_PADRAO,
+                 passos: int = PASSOS_PADRAO, memoria: float = MEMORIA_PADRAO,
+                 saida: float = SAIDA_PADRAO):
+        self.processos = processos or os.cpu_count() or 1
+        self.cotas = (tempo, passos, memoria)
+        self.limite_saida = saida
+        self.metricas = Metricas()
+        self.trava = threading.Lock()
+        self.pool = self.novo_pool()
+
+    def novo_pool(self) -> ProcessPoolExecutor:
+        pool = ProcessPoolExecutor(max_workers=self.processos, initializer=aquecer)
+        # sobe (e aquece) todos os processos agora, não na primeira requisição
+        for f in [pool.submit(os.getpid) for _ in range(self.processos)]:
+            f.result()
+        return pool
+
+    def executar(self, codigo: str, modo: str = "vm") -> Dict:
+        self.metricas.entrar()
+        inicio = time.perf_counter()
+        resultado = None
+        tempo = self.cotas[0]
+        # o tempo do governador só é conferido nos pontos de checagem: passado
+        # o prazo, o processo é encerrado à força
+        prazo = tempo + MARGEM_S if tempo else None
+        try:
+            # uma segunda tentativa só quando o pool foi refeito por causa de
+            # outra requisição
+            for _ in range(2):
+                pool = self.pool
+                try:
+                    resultado = pool.submit(rodar, codigo, None, *self.cotas, modo,
+                                            self.limite_saida).result(timeout=prazo)
+                except TimeoutError:
+                    self.refazer(pool)
+                    resultado = self.falha(TEMPO, inicio, f"tempo limite de {tempo:g}s excedido (processo encerrado)\n")
+                except (BrokenProcessPool, CancelledError):
+                    if self.pool is not pool:
+                        continue
+                    # um processo morreu (falta de memória do sistema, sinal): o pool
+                    # inteiro fica inutilizável, então é refeito
+                    self.refazer(pool)
+                    resultado = self.falha(ERRO, inicio, "processo de execução encerrado\n")
+                break
+            else:
+                resultado = self.falha(ERRO, inicio, "processo de execução encerrado\n")
+            return resultado
+        finally:
+            erro = resultado is None or resultado['status'] not in (APROVADO, EXECUTADO)
+            self.metricas.sair(time.perf_counter() - inicio, erro)
+
+    @staticmethod
+    def falha(status: str, inicio: float, erros: str) -> Dict:
+        return {'status': status, 'tempo_s': round(time.perf_counter() - inicio, 6),
+                'passos': 0, 'saida': '', 'erros': erros}
+
+    def refazer(self, quebrado: ProcessPoolExecutor):
+        # o pool novo entra antes de o antigo ser encerrado: as requisições
+        # que estavam no antigo veem self.pool trocado e recomeçam no novo
+        with self.trava:
+            if self.pool is quebrado:
+                self.pool = self.novo_pool()
+        encerrar(quebrado)
+
+    def fechar(self):
+        self.pool.shutdown()
+
+class Requisicao(BaseHTTPRequestHandler):
+    # self.server.servidor: o Servidor (ver criar)
+    def do_POST(self):
+        if self.path != '/executar':
+            return self.responder(404, {'erro': f"caminho desconhecido: {self.path}"})
+        try:
+            tamanho = int(self.headers.get('Content-Length') or 0)
+        except ValueError:
+            tamanho = -1
+        if tamanho < 0:
+            # rfile.read(-1) esperaria o cliente fechar a conexão
+            return self.responder(400, {'erro': "Content-Length inválido"})
+        if tamanho > TAMANHO_MAXIMO:
+            return self.responder(413, {'erro': f"fonte maior que {TAMANHO_MAXIMO} bytes"})
+        corpo = self.rfile.read(tamanho).decode('utf-8', errors='replace')
+        modo = "vm"
+        if self.headers.get('Content-Type', '').startswith('application/json'):
+            try:
+                pedido = json.loads(corpo)
+                codigo, modo = pedido['codigo'], pedido.get('modo', modo)
+            except (ValueError, KeyError, TypeError, AttributeError):
+                return self.responder(400, {'erro': 'esperado {"codigo": "...", "modo": "vm"}'})
+        else:
+            codigo = corpo
+        if not isinstance(codigo, str) or modo not in MODOS:
+            return self.responder(400, {'erro': f"codigo deve ser texto e modo um de {', '.join(MODOS)}"})
+        self.responder(200, self.server.servidor.executar(codigo, modo))
+
+    def do_GET(self):
+        if self.path != '/metricas':
+            return self.responder(404, {'erro': f"caminho desconhecido: {self.path}"})
+        servidor = self.server.servidor
+        self.responder(200, servidor.metricas.resumo(servidor.processos))
+
+    def responder(self, codigo: int, dados: Dict):
+        corpo = json.dumps(dados, ensure_ascii=False).encode('utf-8')
+        self.send_response(codigo)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def log_message(self, formato, *args):
+        # sem uma linha de log por requisição; /metricas resume o tráfego
+        pass
+
+def criar(servidor: Servidor, host: str = '127.0.0.1', porta: int = PORTA_PADRAO) -> ThreadingHTTPServer:
+    # uma thread por conexão; a concorrência real é a do pool de processos
+    http = ThreadingHTTPServer((host, porta), Requisicao)
+    http.servidor = servidor
+    return http
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="servidor", description="Executa MineScript via HTTP")
+    parser.add_argument("--host", default='127.0.0.1')
+    parser.add_argument("--porta", type=int, default=PORTA_PADRAO)
+    parser.add_argument("-j", "--processos", type=int, help="processos (padrão: todos os núcleos)")
+    parser.add_argument("-t", "--tempo", type=float, default=TEMPO_PADRAO, help="segundos por requisição")
+    parser.add_argument("--passos", type=int, default=PASSOS_PADRAO,
+                        help="iterações de redstone + chamadas por requisição (0 desliga)")
+    parser.add_argument("--memoria", type=float, default=MEMORIA_PADRAO,
+                        help="MB de valores vivos por requisição, aproximado (0 desliga)")
+    parser.add_argument("--saida", type=float, default=SAIDA_PADRAO,
+                        help="MB de saída + erros por requisição (0 desliga)")
+    args = parser.parse_args(argv)
+
+    servidor = Servidor(args.processos, args.tempo, args.passos, args.memoria, args.saida)
+    http = criar(servidor, args.host, args.porta)
+    host, porta = http.server_address[:2]
+    print(f"MineScript em http://{host}:{porta} ({servidor.processos} processos)", file=sys.stderr)
+    try:
+        http.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        http.server_close()
+        servidor.fechar()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,323 +1,982 @@
 # sintatico.py
-import tkinter as tk
-from typing import List, Tuple, Any
+import gc
+import operator
+from typing import List, Tuple, Any, Iterable, Iterator
+from lexico import (FluxoTokens, Token, descrever, VARIAVEL, QUADRO, FUNCAO, LOOP_WHILE, LOOP_FOR, RETORNO,
+                    ATRIBUICAO, OP_ARIT, OP_REL, OP_LOGICO, ABRE_PAR, FECHA_PAR, ABRE_CHAVE, FECHA_CHAVE,
+                    ABRE_COLCHETE, FECHA_COLCHETE, PONTO_VIRGULA, VIRGULA, NUM, STRING, CHAR,
+                    ID, EOF)
+from escopo import (Frame, Retorno, Interrompido, LimiteExcedido, ErroExecucao, ERROS_PYTHON,
+                    erro_execucao, novo_frame, AUSENTE)
+from saida import Saida, como_saida
+from listas import Lista, NATIVAS, indexar
+
+# teto de passos quando não há limite nem cancelamento pendente
+SEM_LIMITE = float('inf')
+# token lido depois do fim da lista
+FIM = (EOF,'',0,0)
 
 # --- Nós da AST ---
-class ASTNode: pass
+# Nós com __slots__: sem __dict__ por instância (programas gerados chegam a
+# milhões de nós). A posição no código-fonte é preenchida pelo parser; nós
+# criados fora dele ficam com 0, que cada __init__ atribui direto (um
+# super().__init__() por nó pesa no parser)
+class ASTNode:
+    __slots__ = ('linha', 'coluna')
+    # campos que apontam para filhos (nó, lista de nós ou None), na ordem de print_tree
+    FILHOS: Tuple[str, ...] = ()
+
+    def __init__(self):
+        self.linha = self.coluna = 0
 
 class Program(ASTNode):
+    __slots__ = ('statements',)
+    FILHOS = ('statements',)
+
     def __init__(self, statements: List[ASTNode]):
+        self.linha = self.coluna = 0
         self.statements = statements
 
 class VarDecl(ASTNode):
+    __slots__ = ('name', 'expr')
+    FILHOS = ('expr',)
+
     def __init__(self, name: str, expr: ASTNode):
+        self.linha = self.coluna = 0
         self.name, self.expr = name, expr
 
 class Assign(ASTNode):
+    __slots__ = ('name', 'expr')
+    FILHOS = ('expr',)
+
     def __init__(self, name: str, expr: ASTNode):
+        self.linha = self.coluna = 0
         self.name, self.expr = name, expr
 
 class FuncDecl(ASTNode):
+    __slots__ = ('name', 'params', 'body')
+    FILHOS = ('body',)
+
     def __init__(self, name: str, params: List[str], body: List[ASTNode]):
+        self.linha = self.coluna = 0
         self.name, self.params, self.body = name, params, body
 
 class Return(ASTNode):
+    __slots__ = ('expr',)
+    FILHOS = ('expr',)
+
     def __init__(self, expr: ASTNode):
+        self.linha = self.coluna = 0
         self.expr = expr
 
 class Print(ASTNode):
+    __slots__ = ('args',)
+    FILHOS = ('args',)
+
     def __init__(self, args: List[ASTNode]):
+        self.linha = self.coluna = 0
         self.args = args
 
 class Call(ASTNode):
+    __slots__ = ('name', 'args')
+    FILHOS = ('args',)
+
     def __init__(self, name: str, args: List[ASTNode]):
+        self.linha = self.coluna = 0
         self.name, self.args = name, args
 
 class BinOp(ASTNode):
+    __slots__ = ('left', 'op', 'right')
+    FILHOS = ('left', 'right')
+
     def __init__(self, left: ASTNode, op: str, right: ASTNode):
+        self.linha = self.coluna = 0
         self.left, self.op, self.right = left, op, right
 
+class UnaryOp(ASTNode):
+    __slots__ = ('op', 'expr')
+    FILHOS = ('expr',)
+
+    def __init__(self, op: str, expr: ASTNode):
+        self.linha = self.coluna = 0
+        self.op, self.expr = op, expr
+
+class Logico(ASTNode):
+    # 'e' / 'ou': o lado direito só é avaliado se o esquerdo não decide
+    __slots__ = ('op', 'left', 'right')
+    FILHOS = ('left', 'right')
+
+    def __init__(self, op: str, left: ASTNode, right: ASTNode):
+        self.linha = self.coluna = 0
+        self.op, self.left, self.right = op, left, right
+
 class Literal(ASTNode):
+    __slots__ = ('value',)
+
     def __init__(self, value: Any):
+        self.linha = self.coluna = 0
         self.value = value
 
 class Var(ASTNode):
+    __slots__ = ('name',)
+
     def __init__(self, name: str):
+        self.linha = self.coluna = 0
         self.name = name
 
+class ListaLiteral(ASTNode):
+    __slots__ = ('itens',)
+    FILHOS = ('itens',)
+
+    def __init__(self, itens: List[ASTNode]):
+        self.linha = self.coluna = 0
+        self.itens = itens
+
+class Indice(ASTNode):
+    __slots__ = ('expr', 'indice')
+    FILHOS = ('expr', 'indice')
+
+    def __init__(self, expr: ASTNode, indice: ASTNode):
+        self.linha = self.coluna = 0
+        self.expr, self.indice = expr, indice
+
 class While(ASTNode):
+    __slots__ = ('condition', 'body')
+    FILHOS = ('body', 'condition')
+
     def __init__(self, condition: ASTNode, body: List[ASTNode]):
+        self.linha = self.coluna = 0
         self.condition = condition
         self.body = body
 
+class For(ASTNode):
+    __slots__ = ('inicio', 'condition', 'passo', 'body', 'plano')
+    FILHOS = ('inicio', 'body', 'passo', 'condition')
+
+    def __init__(self, inicio: ASTNode, condition: ASTNode, passo: ASTNode, body: List[ASTNode]):
+        self.linha = self.coluna = 0
+        # inicio, condition e passo podem faltar (None): trilho (; ; ) { ... }
+        self.inicio, self.condition, self.passo, self.body = inicio, condition, passo, body
+        # plano_contagem(self), calculado na primeira execução (depois do
+        # otimizador); False até lá. Um valor simples: a AST vai para o cache
+        # em disco via pickle, e um sentinela object() não volta idêntico
+        self.plano = False
+
+def filhos(node: ASTNode) -> Iterator[ASTNode]:
+    for fld in node.FILHOS:
+        val = getattr(node, fld)
+        if type(val) is list:
+            yield from val
+        elif val is not None:
+            yield val
+
+def coletar_locais(params: List[str], body: List[ASTNode]) -> List[str]:
+    # parâmetros + nomes declarados com 'bau' no corpo (inclusive dentro de loops)
+    locais = dict.fromkeys(params)
+    pendentes = list(reversed(body))
+    while pendentes:
+        s = pendentes.pop()
+        if isinstance(s, VarDecl):
+            locais[s.name] = None
+        elif isinstance(s, While):
+            pendentes.extend(reversed(s.body))
+        elif isinstance(s, For):
+            pendentes.extend(reversed(s.body))
+            if s.inicio is not None: pendentes.append(s.inicio)
+    return list(locais)
+
+# --- Operadores ---
+# símbolo -> função, compartilhado por eval_expr, compilador e otimizador:
+# cada BinOp chama só a função do seu operador
+OPERADORES = {
+    '+': operator.add, '-': operator.sub, '*': operator.mul, '/': operator.truediv,
+    '==': operator.eq, '!=': operator.ne, '>': operator.gt, '<': operator.lt,
+    '>=': operator.ge, '<=': operator.le,
+}
+# '-' calcula 0 - x (o mesmo resultado de antes, inclusive para -0.0)
+UNARIOS = {'-': lambda v: 0 - v, 'nao': operator.not_}
+# precedência de 'e' e 'ou' (maior liga mais forte)
+LOGICOS = {'ou': 1, 'e': 2}
+
+# --- Laço de contagem ---
+RELACIONAIS = {op: OPERADORES[op] for op in ('<', '<=', '>', '>=', '!=')}
+
+def plano_contagem(node: For):
+    # trilho (bau i = a; i < n; i = i + k) com n literal ou variável e sem
+    # escrita em i ou n no corpo: o laço vira uma contagem, sem avaliar a
+    # condição e o passo a cada volta. Devolve (i, op, n, k, chamadas) ou None;
+    # 'chamadas' são as funções chamadas no corpo (podem escrever globais)
+    ini, cond, passo = node.inicio, node.condition, node.passo
+    if not (isinstance(ini, (VarDecl, Assign)) and isinstance(cond, BinOp) and isinstance(passo, Assign)):
+        return None
+    nome, limite, soma = ini.name, cond.right, passo.expr
+    if not (isinstance(cond.left, Var) and cond.left.name == nome and cond.op in RELACIONAIS):
+        return None
+    if not (isinstance(limite, Literal) or isinstance(limite, Var) and limite.name != nome):
+        return None
+    if not (passo.name == nome and isinstance(soma, BinOp) and soma.op in ('+', '-')
+            and isinstance(soma.left, Var) and soma.left.name == nome and isinstance(soma.right, Literal)
+            and type(soma.right.value) in (int, float) and soma.right.value):
+        return None
+    protegidos = {nome, limite.name} if isinstance(limite, Var) else {nome}
+    chamadas = set()
+    pendentes = list(node.body)
+    while pendentes:
+        n = pendentes.pop()
+        if isinstance(n, (VarDecl, Assign)) and n.name in protegidos:
+            return None
+        if isinstance(n, Call):
+            chamadas.add(n.name)
+        pendentes.extend(filhos(n))
+    k = soma.right.value if soma.op == '+' else -soma.right.value
+    return (nome, cond.op, limite, k, frozenset(chamadas))
+
+def _faixa(inicio: int, op: str, limite: int, passo: int):
+    # o range com os mesmos valores do laço; None se o laço não termina
+    # (passo no sentido contrário, != que nunca é atingido)
+    if passo > 0:
+        if op == '<':  return range(inicio, limite, passo)
+        if op == '<=': return range(inicio, limite + 1, passo)
+        if op == '!=' and inicio <= limite and (limite - inicio) % passo == 0:
+            return range(inicio, limite, passo)
+    else:
+        if op == '>':  return range(inicio, limite, passo)
+        if op == '>=': return range(inicio, limite - 1, passo)
+        if op == '!=' and inicio >= limite and (inicio - limite) % passo == 0:
+            return range(inicio, limite, passo)
+    return None
+
+class Contagem:
+    # os valores de i num laço de contagem e, no fim, o valor que i teria
+    # depois do último passo (o primeiro que falha a condição)
+    __slots__ = ('valores', 'final')
+
+    def __init__(self, inicio, op: str, limite, passo):
+        faixa = None
+        if type(inicio) is int and type(limite) is int and type(passo) is int:
+            faixa = _faixa(inicio, op, limite, passo)
+        if faixa is not None:
+            self.valores = iter(faixa)
+            self.final = inicio + len(faixa) * passo
+        else:
+            # reais (ou laço sem fim): mesmas somas e comparações do laço comum
+            self.valores = self.gerar(inicio, RELACIONAIS[op], limite, passo)
+
+    def gerar(self, i, teste, limite, passo):
+        while teste(i, limite):
+            yield i
+            i = i + passo
+        self.final = i
+
+    def __iter__(self):
+        return self.valores
+
 # --- Parser / Interpretador ---
 class AnalisadorSintatico:
-    def __init__(self, tokens: List[Tuple[str,str,int,int]], terminal: tk.Text):
-        self.tokens = tokens
+    def __init__(self, tokens: Iterable[Token], terminal: Saida):
+        # aceita a lista de tokens ou um gerador (lexico.tokenizar / tokenizar_arquivo)
+        self.tokens = tokens if isinstance(tokens, list) else FluxoTokens(tokens)
         self.pos = 0
+        # parênteses, listas, chamadas e índices abertos pela recursão de
+        # parse_expr (ver parse_aninhada)
+        self.aninhamento = 0
+        # token atual, lido uma vez a cada avanço
+        try: self.tok = self.tokens[0]
+        except IndexError: self.tok = FIM
         self.terminal = terminal
+        self.saida = como_saida(terminal)
         self.has_error = False
-        self.declared = set()
         self.symbols = {}
         self.functions = {}
+        # estatísticas do otimizador (otimizador.py), quando usado
+        self.otimizador = None
+        # caches das funções puras (memoizacao.Memoizador), quando usado
+        self.memo = None
+        # passos: iterações de redstone + chamadas. Ao passar do teto o
+        # interpretador chama verificar(); cancelar() (de outra thread) zera o teto
+        self.interrompido = False
+        self.passos = 0
+        self.limite_passos = None
+        self.teto = SEM_LIMITE
+        # cotas de tempo e memória (governador.Governador), quando usado; com
+        # cota de memória, '+', '*' e faixa trocam pelas versões que conferem
+        # o tamanho do resultado
+        self.governador = None
+        self.operadores = OPERADORES
+        self.nativas = NATIVAS
+        # a última AST produzida por parse() (ou carregada do cache em disco)
+        self.programa = None
+        # frame global: locals e globals são o próprio dicionário de símbolos
+        self.frame = Frame('<global>', self.symbols, self.symbols)
 
     def token_atual(self):
-        return self.tokens[self.pos] if self.pos < len(self.tokens) else ('EOF','',0,0)
+        return self.tok
 
     def peek(self):
-        return self.tokens[self.pos+1] if self.pos+1 < len(self.tokens) else ('EOF','',0,0)
+        try: return self.tokens[self.pos+1]
+        except IndexError: return FIM
+
+    def avancar(self):
+        self.pos += 1
+        try: self.tok = self.tokens[self.pos]
+        except IndexError: self.tok = FIM
 
     def erro(self, msg: str, token=None):
         if token is None:
-            token = self.token_atual()
+            token = self.tok
         _, val, line, col = token
-        self.terminal.insert(tk.END, f"[Linha {line}, Coluna {col}] {msg}: '{val}'\n", "erro")
+        self.saida.erro(f"[Linha {line}, Coluna {col}] {msg}: '{val}'\n")
         self.has_error = True
 
-    def consumir(self, tipo: str, val: str=None):
-        tok, valor, _, _ = self.token_atual()
-        if tok == tipo and (val is None or valor == val):
-            self.pos += 1
-        else:
-            esperado = tipo + (f" '{val}'" if val else "")
-            self.erro(f"Erro sintático: esperado {esperado}", self.token_atual())
-            self.pos += 1
+    def consumir(self, tipo: int):
+        # avança mesmo no erro, como sempre fez
+        if self.tok[0] != tipo:
+            self.erro(f"Erro sintático: esperado {descrever(tipo)}", self.tok)
+        self.avancar()
+
+    def opcional(self, tipo: int) -> bool:
+        if self.tok[0] == tipo:
+            self.avancar()
+            return True
+        return False
 
     # ---- Parsing ----
     def parse(self) -> Program:
-        stmts = []
-        while self.token_atual()[0] != 'EOF':
-            node = self.parse_stmt()
-            if node:
-                stmts.append(node)
-        return Program(stmts)
+        # a AST não tem ciclos: o coletor de ciclos só atrasaria a alocação
+        # de milhões de nós, então fica pausado durante o parse
+        coletor = gc.isenabled()
+        gc.disable()
+        try:
+            stmts = []
+            while self.tok[0] != EOF:
+                node = self.parse_stmt()
+                if node:
+                    stmts.append(node)
+        finally:
+            if coletor: gc.enable()
+        self.programa = Program(stmts)
+        return self.programa
 
     def parse_stmt(self):
-        tok = self.token_atual()[0]
-        if tok == 'VARIAVEL':           return self.parse_var_decl()
-        if tok == 'ID' and self.peek()[0]=='ATRIBUICAO':   return self.parse_assign()
-        if tok == 'ID' and self.peek()[0]=='DELIM' and self.peek()[1]=='(':  return self.parse_call_stmt()
-        if tok == 'QUADRO':             return self.parse_print()
-        if tok == 'FUNCAO':             return self.parse_func_decl()
-        if tok == 'RETORNO':            return self.parse_return()
-        if tok == 'LOOP_WHILE':         return self.parse_while()
-
-        # inesperado
-        self.erro("Erro sintático: statement inesperado", self.token_atual())
-        self.pos += 1
+        inicio = self.tok
+        regra = DECLARACOES.get(inicio[0])
+        node = regra(self) if regra else None
+        if node is None:
+            # inesperado
+            self.erro("Erro sintático: statement inesperado", inicio)
+            self.avancar()
+            return None
+        return self.posicionar(node, inicio)
+
+    def posicionar(self, node: ASTNode, token) -> ASTNode:
+        node.linha, node.coluna = token[2], token[3]
+        return node
+
+    def parse_id_stmt(self):
+        # ID só abre statement seguido de '=' ou '('; senão None (inesperado)
+        seguinte = self.peek()[0]
+        if seguinte == ATRIBUICAO: return self.parse_assign()
+        if seguinte == ABRE_PAR:   return self.parse_call_stmt()
         return None
 
     def parse_var_decl(self):
-        self.consumir('VARIAVEL')
-        if self.token_atual()[0]=='ID':
-            name = self.token_atual()[1]; self.consumir('ID')
+        self.consumir(VARIAVEL)
+        if self.tok[0] == ID:
+            name = self.tok[1]; self.avancar()
         else:
-            self.erro("Erro sintático: esperado identificador", self.token_atual()); name="<erro>"
-        self.consumir('ATRIBUICAO')
+            self.erro("Erro sintático: esperado identificador", self.tok); name="<erro>"
+        self.consumir(ATRIBUICAO)
         expr = self.parse_expr()
-        if self.token_atual()[0]=='DELIM' and self.token_atual()[1]==';':
-            self.consumir('DELIM',';')
-        else:
-            self.erro("Erro sintático: esperado ';' ao final da declaração", self.token_atual())
+        if not self.opcional(PONTO_VIRGULA):
+            self.erro("Erro sintático: esperado ';' ao final da declaração", self.tok)
         return VarDecl(name, expr)
 
     def parse_assign(self):
-        name = self.token_atual()[1]; self.consumir('ID')
-        self.consumir('ATRIBUICAO')
+        name = self.tok[1]; self.avancar()
+        self.consumir(ATRIBUICAO)
         expr = self.parse_expr()
-        if self.token_atual()[0]=='DELIM' and self.token_atual()[1]==';':
-            self.consumir('DELIM',';')
-        else:
-            self.erro("Erro sintático: esperado ';' ao final da atribuição", self.token_atual())
+        if not self.opcional(PONTO_VIRGULA):
+            self.erro("Erro sintático: esperado ';' ao final da atribuição", self.tok)
         return Assign(name, expr)
 
     def parse_call_stmt(self):
         call = self.parse_call_expr()
-        if self.token_atual()[0]=='DELIM' and self.token_atual()[1]==';':
-            self.consumir('DELIM',';')
-        else:
-            self.erro("Erro sintático: esperado ';' após chamada", self.token_atual())
+        if not self.opcional(PONTO_VIRGULA):
+            self.erro("Erro sintático: esperado ';' após chamada", self.tok)
         return call
 
     def parse_print(self):
-        self.consumir('QUADRO'); self.consumir('DELIM','(')
+        self.consumir(QUADRO); self.consumir(ABRE_PAR)
         args = [ self.parse_expr() ]
-        while self.token_atual()[0]=='DELIM' and self.token_atual()[1]==',':
-            self.consumir('DELIM',','); args.append(self.parse_expr())
-        self.consumir('DELIM',')'); self.consumir('DELIM',';')
+        while self.opcional(VIRGULA):
+            args.append(self.parse_expr())
+        self.consumir(FECHA_PAR); self.consumir(PONTO_VIRGULA)
         return Print(args)
 
     def parse_func_decl(self):
-        self.consumir('FUNCAO')
-        if self.token_atual()[0]=='ID':
-            name=self.token_atual()[1]; self.consumir('ID')
+        self.consumir(FUNCAO)
+        if self.tok[0] == ID:
+            name=self.tok[1]; self.avancar()
         else:
-            self.erro("Erro sintático: esperado nome de função", self.token_atual()); name="<erro>"
-        self.consumir('DELIM','(')
+            self.erro("Erro sintático: esperado nome de função", self.tok); name="<erro>"
+        self.consumir(ABRE_PAR)
         # parâmetros
         params=[]
-        while self.token_atual()[0]=='VARIAVEL':
-            self.consumir('VARIAVEL')
-            if self.token_atual()[0]=='ID':
-                params.append(self.token_atual()[1]); self.consumir('ID')
-            if self.token_atual()[0]=='DELIM' and self.token_atual()[1]==',':
-                self.consumir('DELIM',',')
-        self.consumir('DELIM',')')
+        while self.opcional(VARIAVEL):
+            if self.tok[0] == ID:
+                params.append(self.tok[1]); self.avancar()
+            self.opcional(VIRGULA)
+        self.consumir(FECHA_PAR)
         # corpo
-        if not (self.token_atual()[0]=='DELIM' and self.token_atual()[1]=='{'):
-            self.erro("Erro sintático: esperado '{' de abertura", self.token_atual())
-        else:
-            self.consumir('DELIM','{')
+        if not self.opcional(ABRE_CHAVE):
+            self.erro("Erro sintático: esperado '{' de abertura", self.tok)
+        body=self.parse_corpo()
+        if not self.opcional(FECHA_CHAVE):
+            self.erro("Erro sintático: esperado '}' de fechamento", self.tok)
+        return FuncDecl(name, params, body)
+
+    def parse_corpo(self):
+        # statements até achar '}' ou EOF (quem chama consome o '}')
         body=[]
-        # loop até achar '}' ou EOF
-        while self.token_atual()[0] != 'EOF' and not (self.token_atual()[0]=='DELIM' and self.token_atual()[1]=='}'):
+        while self.tok[0] != EOF and self.tok[0] != FECHA_CHAVE:
             stmt = self.parse_stmt()
             if stmt: body.append(stmt)
-        if self.token_atual()[0]=='DELIM' and self.token_atual()[1]=='}':
-            self.consumir('DELIM','}')
-        else:
-            self.erro("Erro sintático: esperado '}' de fechamento", self.token_atual())
-        return FuncDecl(name, params, body)
+        return body
 
     def parse_return(self):
-        self.consumir('RETORNO')
+        self.consumir(RETORNO)
         expr=self.parse_expr()
-        if self.token_atual()[0]=='DELIM' and self.token_atual()[1]==';':
-            self.consumir('DELIM',';')
-        else:
-            self.erro("Erro sintático: esperado ';' após 'fornalha'", self.token_atual())
+        if not self.opcional(PONTO_VIRGULA):
+            self.erro("Erro sintático: esperado ';' após 'fornalha'", self.tok)
         return Return(expr)
 
     def parse_while(self):
-        self.consumir('LOOP_WHILE')      # 'redstone'
-        self.consumir('DELIM','(')
+        self.consumir(LOOP_WHILE)      # 'redstone'
+        self.consumir(ABRE_PAR)
         cond = self.parse_expr()
-        self.consumir('DELIM',')')
-        self.consumir('DELIM','{')
-        body=[]
-        # loop até achar '}' ou EOF
-        while self.token_atual()[0] != 'EOF' and not (self.token_atual()[0]=='DELIM' and self.token_atual()[1]=='}'):
-            stmt = self.parse_stmt()
-            if stmt: body.append(stmt)
-        if self.token_atual()[0]=='DELIM' and self.token_atual()[1]=='}':
-            self.consumir('DELIM','}')
-        else:
-            self.erro("Erro sintático: esperado '}' de fechamento do loop", self.token_atual())
+        self.consumir(FECHA_PAR)
+        self.consumir(ABRE_CHAVE)
+        body=self.parse_corpo()
+        if not self.opcional(FECHA_CHAVE):
+            self.erro("Erro sintático: esperado '}' de fechamento do loop", self.tok)
         return While(cond, body)
 
-    def parse_expr(self):
-        node = self.parse_term()
-        # aritmética
-        while self.token_atual()[0]=='OP_ARIT':
-            op=self.token_atual()[1]; self.consumir('OP_ARIT')
-            right=self.parse_term()
-            node=BinOp(node,op,right)
-        # relacional
-        if self.token_atual()[0]=='OP_REL':
-            op=self.token_atual()[1]; self.consumir('OP_REL')
-            right=self.parse_term()
-            node=BinOp(node,op,right)
+    def parse_for(self):
+        self.consumir(LOOP_FOR)      # 'trilho'
+        self.consumir(ABRE_PAR)
+        inicio = None
+        tok = self.tok
+        if tok[0] == VARIAVEL:
+            inicio = self.posicionar(self.parse_var_decl(), tok)
+        elif tok[0] == ID and self.peek()[0] == ATRIBUICAO:
+            inicio = self.posicionar(self.parse_assign(), tok)
+        else:
+            self.consumir(PONTO_VIRGULA)
+        cond = None if self.tok[0] == PONTO_VIRGULA else self.parse_expr()
+        self.consumir(PONTO_VIRGULA)
+        passo = None
+        tok = self.tok
+        if tok[0] == ID and self.peek()[0] == ATRIBUICAO:
+            self.avancar(); self.avancar()
+            passo = self.posicionar(Assign(tok[1], self.parse_expr()), tok)
+        elif tok[0] != FECHA_PAR:
+            self.erro("Erro sintático: esperado atribuição no passo do trilho", tok)
+        self.consumir(FECHA_PAR)
+        self.consumir(ABRE_CHAVE)
+        body=self.parse_corpo()
+        if not self.opcional(FECHA_CHAVE):
+            self.erro("Erro sintático: esperado '}' de fechamento do trilho", self.tok)
+        return For(inicio, cond, passo, body)
+
+    def parse_expr(self, minimo: int = 1):
+        # e/ou por precedência (ou < e), à esquerda; o lado direito de cada
+        # operador só aceita os que ligam mais forte
+        tok = self.tok
+        node = self.parse_nao() if tok[0] == OP_LOGICO and tok[1] == 'nao' else self.parse_comparacao()
+        while self.tok[0] == OP_LOGICO:
+            prec = LOGICOS.get(self.tok[1])
+            if prec is None or prec < minimo:
+                return node
+            op_tok = self.tok; self.avancar()
+            right = self.parse_expr(prec + 1)
+            node = self.posicionar(Logico(op_tok[1], node, right), op_tok)
+        return node
+
+    def parse_aninhada(self):
+        # expressão dentro de parênteses, colchetes ou argumentos. A descida
+        # recursiva é o caminho rápido, mas gasta uns oito frames do Python
+        # por nível: passados PROFUNDIDADE_RECURSIVA níveis, o resto vai para
+        # o laço de parse_expr_pilha, limitado só pela memória
+        if self.aninhamento >= PROFUNDIDADE_RECURSIVA:
+            return self.parse_expr_pilha()
+        self.aninhamento += 1
+        node = self.parse_expr()
+        self.aninhamento -= 1
+        return node
+
+    def parse_nao(self):
+        # nao nao ... x num laço
+        tok = self.tok
+        naos = []
+        while tok[0] == OP_LOGICO and tok[1] == 'nao':
+            naos.append(tok); self.avancar()
+            tok = self.tok
+        node = self.parse_comparacao()
+        for t in reversed(naos):
+            node = self.posicionar(UnaryOp('nao', node), t)
         return node
 
+    def parse_comparacao(self):
+        node = self.parse_term()
+        nivel = 2
+        while True:
+            regra = BINARIOS.get(self.tok[0])
+            if regra is None or regra[0] > nivel:
+                return node
+            op_tok = self.tok; self.avancar()
+            right = self.parse_term()
+            node = self.posicionar(BinOp(node, op_tok[1], right), op_tok)
+            nivel = regra[1]
+
     def parse_term(self):
-        tok,val,_,_ = self.token_atual()
-        # unary minus
-        if tok=='OP_ARIT' and val=='-':
-            self.consumir('OP_ARIT')
-            nt,nv,_,_ = self.token_atual()
-            if nt=='NUM':
-                self.consumir('NUM')
-                num = float(nv) if '.' in nv else int(nv)
-                return Literal(-num)
-            right=self.parse_term()
-            return BinOp(Literal(0),'-',right)
-        if tok=='NUM':
-            self.consumir('NUM'); return Literal(float(val) if '.' in val else int(val))
-        if tok=='STRING':
-            self.consumir('STRING'); return Literal(val.strip('"'))
-        if tok=='CHAR':
-            self.consumir('CHAR'); return Literal(val.strip("'"))
-        if tok=='ID' and self.peek()[0]=='DELIM' and self.peek()[1]=='(':
-            return self.parse_call_expr()
-        if tok=='ID':
-            self.consumir('ID'); return Var(val)
-        if tok=='DELIM' and val=='(':
-            self.consumir('DELIM','(')
-            node=self.parse_expr()
-            self.consumir('DELIM',')')
-            return node
+        regra = TERMOS.get(self.tok[0])
+        if regra is not None:
+            node = regra(self)
+            if node is not None:
+                if self.tok[0] == ABRE_COLCHETE:
+                    return self.parse_indices(node)
+                return node
         # termo inválido
-        self.erro("Erro sintático: termo inválido", self.token_atual())
-        self.pos+=1
+        self.erro("Erro sintático: termo inválido", self.tok)
+        self.avancar()
         return Literal(None)
 
+    def parse_indices(self, node: ASTNode) -> ASTNode:
+        # v[i], f(x)[0], [1, 2][1] ...
+        while self.tok[0] == ABRE_COLCHETE:
+            inicio = self.tok; self.avancar()
+            node = self.posicionar(Indice(node, self.parse_aninhada()), inicio)
+            self.consumir(FECHA_COLCHETE)
+        return node
+
+    def parse_negativo(self):
+        inicio = self.tok
+        if inicio[1] != '-':
+            return None
+        # - - ... x num laço: cada '-' seguido de outro daria um parse_term
+        # recursivo. O '-' colado a um número vira o literal negativo
+        negativos = []
+        while True:
+            tok = self.tok; self.avancar()
+            if self.tok[0] == NUM:
+                val = self.tok[1]; self.avancar()
+                node = self.posicionar(Literal(-(float(val) if '.' in val else int(val))), tok)
+                if negativos:
+                    node = self.parse_indices(node)
+                break
+            negativos.append(tok)
+            if self.tok[0] != OP_ARIT or self.tok[1] != '-':
+                node = self.parse_term()
+                break
+        # de dentro para fora; os índices do mais externo ficam com parse_term
+        for i in range(len(negativos) - 1, -1, -1):
+            t = negativos[i]
+            node = self.posicionar(BinOp(self.posicionar(Literal(0), t), '-', node), t)
+            if i:
+                node = self.parse_indices(node)
+        return node
+
+    def parse_id(self):
+        if self.peek()[0] == ABRE_PAR:
+            return self.parse_call_expr()
+        return self.parse_var()
+
+    def parse_parenteses(self):
+        self.avancar()
+        node=self.parse_aninhada()
+        self.consumir(FECHA_PAR)
+        return node
+
+    def parse_lista(self):
+        inicio = self.tok; self.avancar()
+        itens=[]
+        if self.tok[0] != FECHA_COLCHETE:
+            itens.append(self.parse_aninhada())
+            while self.opcional(VIRGULA):
+                itens.append(self.parse_aninhada())
+        self.consumir(FECHA_COLCHETE)
+        return self.posicionar(ListaLiteral(itens), inicio)
+
+    def parse_expr_pilha(self):
+        # A expressão inteira num laço, sem recursão: parênteses, listas,
+        # chamadas, índices, '-' e 'nao' aninhados guardam em 'pilha' o que
+        # falta completar. Mesma gramática e mesma AST de parse_expr.
+        # Do mais fraco ao mais forte: e/ou (por precedência, à esquerda),
+        # 'nao' (prefixo), comparação (BINARIOS) e termo, com '-' prefixo e
+        # índices v[i] como sufixo.
+        pilha = []
+        nao_ok = True
+        while True:
+            # operando: prefixos e aberturas até chegar a um termo
+            while True:
+                tok = self.tok
+                tipo = tok[0]
+                regra = FOLHAS.get(tipo)
+                if regra is not None and (tipo != ID or self.peek()[0] != ABRE_PAR):
+                    node = regra(self)
+                    indexavel = True
+                    break
+                if tipo == ID:
+                    # f(...)
+                    self.avancar(); self.avancar()
+                    if self.tok[0] != FECHA_PAR:
+                        pilha.append((_CHAMADA, tok, []))
+                        nao_ok = True
+                        continue
+                    self.avancar()
+                    node = self.posicionar(Call(tok[1], []), tok)
+                elif tipo == ABRE_PAR:
+                    self.avancar()
+                    pilha.append((_PARENTESES,))
+                    nao_ok = True
+                    continue
+                elif tipo == ABRE_COLCHETE:
+                    self.avancar()
+                    if self.tok[0] != FECHA_COLCHETE:
+                        pilha.append((_LISTA, tok, []))
+                        nao_ok = True
+                        continue
+                    self.avancar()
+                    node = self.posicionar(ListaLiteral([]), tok)
+                elif tipo == OP_ARIT and tok[1] == '-':
+                    self.avancar()
+                    if self.tok[0] != NUM:
+                        pilha.append((_NEGATIVO, tok))
+                        nao_ok = False
+                        continue
+                    val = self.tok[1]; self.avancar()
+                    node = self.posicionar(Literal(-(float(val) if '.' in val else int(val))), tok)
+                elif tipo == OP_LOGICO and tok[1] == 'nao' and nao_ok:
+                    self.avancar()
+                    pilha.append((_NAO, tok))
+                    continue
+                else:
+                    self.erro("Erro sintático: termo inválido", tok)
+                    self.avancar()
+                    node = Literal(None)
+                    indexavel = False
+                    break
+                indexavel = True
+                break
+            # sufixos e reduções, até faltar outro operando (break) ou a
+            # expressão acabar (return)
+            while True:
+                if indexavel and self.tok[0] == ABRE_COLCHETE:
+                    pilha.append((_INDICE, self.tok, node)); self.avancar()
+                    nao_ok = True
+                    break
+                indexavel = True
+                topo = pilha[-1] if pilha else _VAZIO
+                if topo[0] == _NEGATIVO:
+                    pilha.pop()
+                    t = topo[1]
+                    node = self.posicionar(BinOp(self.posicionar(Literal(0), t), '-', node), t)
+                    continue
+                # termo completo: entra na comparação em curso ou abre uma
+                if topo[0] == _COMPARACAO:
+                    pilha.pop()
+                    _, esquerdo, t, nivel = topo
+                    node = self.posicionar(BinOp(esquerdo, t[1], node), t)
+                else:
+                    nivel = 2
+                regra = BINARIOS.get(self.tok[0])
+                if regra is not None and regra[0] <= nivel:
+                    pilha.append((_COMPARACAO, node, self.tok, regra[1])); self.avancar()
+                    nao_ok = False
+                    break
+                while pilha and pilha[-1][0] == _NAO:
+                    node = self.posicionar(UnaryOp('nao', node), pilha.pop()[1])
+                # e/ou: fecha os pendentes que ligam no mínimo tão forte
+                tok = self.tok
+                prec = LOGICOS.get(tok[1]) if tok[0] == OP_LOGICO else None
+                while pilha and pilha[-1][0] == _LOGICO and (prec is None or pilha[-1][3] >= prec):
+                    _, esquerdo, t, _ = pilha.pop()
+                    node = self.posicionar(Logico(t[1], esquerdo, node), t)
+                if prec is not None:
+                    pilha.append((_LOGICO, node, tok, prec)); self.avancar()
+                    nao_ok = True
+                    break
+                # expressão completa: fecha o que a abriu
+                if not pilha:
+                    return node
+                topo = pilha.pop()
+                if topo[0] == _PARENTESES:
+                    self.consumir(FECHA_PAR)
+                elif topo[0] == _INDICE:
+                    self.consumir(FECHA_COLCHETE)
+                    node = self.posicionar(Indice(topo[2], node), topo[1])
+                else:
+                    itens = topo[2]
+                    itens.append(node)
+                    if self.opcional(VIRGULA):
+                        pilha.append(topo)
+                        nao_ok = True
+                        break
+                    if topo[0] == _LISTA:
+                        self.consumir(FECHA_COLCHETE)
+                        node = self.posicionar(ListaLiteral(itens), topo[1])
+                    else:
+                        self.consumir(FECHA_PAR)
+                        node = self.posicionar(Call(topo[1][1], itens), topo[1])
+
+    def parse_num(self):
+        inicio = self.tok; val = inicio[1]; self.avancar()
+        return self.posicionar(Literal(float(val) if '.' in val else int(val)), inicio)
+
+    def parse_string(self):
+        inicio = self.tok; self.avancar()
+        return self.posicionar(Literal(inicio[1].strip('"')), inicio)
+
+    def parse_char(self):
+        inicio = self.tok; self.avancar()
+        return self.posicionar(Literal(inicio[1].strip("'")), inicio)
+
+    def parse_var(self):
+        inicio = self.tok; self.avancar()
+        return self.posicionar(Var(inicio[1]), inicio)
+
     def parse_call_expr(self):
-        name=self.token_atual()[1]; self.consumir('ID')
-        self.consumir('DELIM','(')
+        inicio=self.tok
+        name=inicio[1]; self.consumir(ID)
+        self.consumir(ABRE_PAR)
         args=[]
-        if not (self.token_atual()[0]=='DELIM' and self.token_atual()[1]==')'):
-            args.append(self.parse_expr())
-            while self.token_atual()[0]=='DELIM' and self.token_atual()[1]==',':
-                self.consumir('DELIM',','); args.append(self.parse_expr())
-        self.consumir('DELIM',')')
-        return Call(name,args)
+        if self.tok[0] != FECHA_PAR:
+            args.append(self.parse_aninhada())
+            while self.opcional(VIRGULA):
+                args.append(self.parse_aninhada())
+        self.consumir(FECHA_PAR)
+        return self.posicionar(Call(name,args), inicio)
 
     # ---- Execução ----
     def execute(self, node: ASTNode):
-        if isinstance(node, Program):
-            for s in node.statements: self.execute(s)
-        elif isinstance(node, VarDecl):
-            self.declared.add(node.name)
-            self.symbols[node.name] = self.eval_expr(node.expr)
-        elif isinstance(node, Assign):
-            self.symbols[node.name] = self.eval_expr(node.expr)
-        elif isinstance(node, Print):
-            out=''.join(str(self.eval_expr(a)) for a in node.args)
-            self.terminal.insert(tk.END, out+"\n")
-        elif isinstance(node, FuncDecl):
-            self.functions[node.name] = (node.params, node.body)
-        elif isinstance(node, Return):
-            self.symbols['__return__'] = self.eval_expr(node.expr)
-        elif isinstance(node, Call):
-            args=[self.eval_expr(a) for a in node.args]
-            if node.name not in self.functions:
-                self.erro(f"Erro semântico: função '{node.name}' não declarada", self.token_atual())
-                return
-            params,body=self.functions[node.name]
-            old_sym,old_dec=dict(self.symbols),set(self.declared)
-            for p,v in zip(params,args): self.declared.add(p); self.symbols[p]=v
+        try:
+            if isinstance(node, Program):
+                try:
+                    for s in node.statements: self.execute(s)
+                except Retorno:
+                    pass
+            elif isinstance(node, VarDecl):
+                self.frame.declarar(node.name, self.eval_expr(node.expr))
+            elif isinstance(node, Assign):
+                self.frame.atribuir(node.name, self.eval_expr(node.expr))
+            elif isinstance(node, Print):
+                out=''.join(str(self.eval_expr(a)) for a in node.args)
+                self.saida.escrever(out+"\n")
+            elif isinstance(node, FuncDecl):
+                self.functions[node.name] = (node.params, node.body, coletar_locais(node.params, node.body))
+            elif isinstance(node, Return):
+                raise Retorno(self.eval_expr(node.expr))
+            elif isinstance(node, Call):
+                args=[self.eval_expr(a) for a in node.args]
+                if node.name not in self.functions:
+                    if node.name in self.nativas:
+                        return self.nativas[node.name](*args)
+                    self.erro(f"Erro semântico: função '{node.name}' não declarada", (ID, node.name, node.linha, node.coluna))
+                    return
+                cache=self.memo.caches.get(node.name) if self.memo else None
+                if cache is not None:
+                    chave=cache.chave(args)
+                    if chave is not None:
+                        valor=cache.obter(chave)
+                        if valor is AUSENTE:
+                            valor=self.chamar(node.name, args)
+                            cache.guardar(chave, valor)
+                        return valor
+                return self.chamar(node.name, args)
+            elif isinstance(node, While):
+                while self.eval_expr(node.condition):
+                    self.passos += 1
+                    if self.passos > self.teto: self.verificar()
+                    for stmt in node.body: self.execute(stmt)
+            elif isinstance(node, For):
+                if node.inicio is not None: self.execute(node.inicio)
+                if node.plano is False: node.plano = plano_contagem(node)
+                if node.plano is not None and self.contagem_segura(node.plano):
+                    self.contar(node.plano, node.body)
+                    return
+                while node.condition is None or self.eval_expr(node.condition):
+                    self.passos += 1
+                    if self.passos > self.teto: self.verificar()
+                    for stmt in node.body: self.execute(stmt)
+                    if node.passo is not None: self.execute(node.passo)
+        except ErroExecucao as e:
+            # o statement mais interno em execução dá a posição do erro
+            e.posicionar(node.linha, node.coluna)
+            raise
+        except ERROS_PYTHON as e:
+            raise erro_execucao(e, node.linha, node.coluna) from e
+        except MemoryError:
+            e = LimiteExcedido("memória esgotada", 'memoria')
+            e.posicionar(node.linha, node.coluna)
+            raise e from None
+
+    def contagem_segura(self, plano) -> bool:
+        # uma função chamada no corpo pode escrever globais: com chamadas a
+        # craftar, i e n precisam ser locais da função em execução
+        nome, _, limite, _, chamadas = plano
+        if not any(c in self.functions for c in chamadas):
+            return True
+        loc = self.frame.locals
+        return loc is not self.frame.globals and nome in loc \
+            and (isinstance(limite, Literal) or limite.name in loc)
+
+    def contar(self, plano, body: List[ASTNode]):
+        nome, op, limite, passo, _ = plano
+        frame = self.frame
+        escopo = frame.locals if nome in frame.locals else frame.globals
+        contagem = Contagem(escopo.get(nome), op, self.eval_expr(limite), passo)
+        for i in contagem:
+            escopo[nome] = i
+            self.passos += 1
+            if self.passos > self.teto: self.verificar()
+            for stmt in body: self.execute(stmt)
+        escopo[nome] = contagem.final
+
+    def limitar_passos(self, limite: int = None):
+        self.limite_passos = limite
+        self.ajustar_teto()
+
+    def governar(self, governador=None):
+        # liga as cotas de um governador.Governador (o prazo conta a partir
+        # daqui); None desliga
+        self.governador = governador
+        self.operadores, self.nativas = OPERADORES, NATIVAS
+        self.limite_passos = None
+        if governador is not None:
+            governador.iniciar()
+            self.limite_passos = governador.passos
+            self.operadores = governador.operadores(OPERADORES)
+            self.nativas = governador.nativas(NATIVAS)
+        self.ajustar_teto()
+
+    def ajustar_teto(self):
+        # próximo ponto de checagem: o limite de passos ou, com cotas de tempo
+        # e memória, daqui a governador.intervalo passos
+        teto = self.limite_passos or SEM_LIMITE
+        if self.governador is not None and self.governador.periodico:
+            teto = min(teto, self.passos + self.governador.intervalo)
+        self.teto = teto
+        # um cancelar() de outra thread no meio do cálculo não se perde
+        if self.interrompido: self.teto = -1
+
+    def cancelar(self):
+        self.interrompido = True
+        self.teto = -1
+
+    def verificar(self):
+        if self.interrompido:
+            raise Interrompido()
+        if self.limite_passos and self.passos > self.limite_passos:
+            raise LimiteExcedido(f"limite de {self.limite_passos} passos excedido")
+        if self.governador is not None:
+            self.governador.verificar(self)
+        self.ajustar_teto()
+
+    def chamar(self, name: str, args: List[Any]):
+        self.passos += 1
+        if self.passos > self.teto: self.verificar()
+        params,body,locais=self.functions[name]
+        frame=self.frame=novo_frame(name, params, args, locais, self.frame)
+        try:
             for s in body: self.execute(s)
-            ret=self.symbols.get('__return__',None)
-            self.symbols, self.declared = old_sym, old_dec
-            return ret
-        elif isinstance(node, While):
-            while self.eval_expr(node.condition):
-                for stmt in node.body: self.execute(stmt)
+        except Retorno as r:
+            return r.valor
+        finally:
+            self.frame=frame.anterior
+        return None
 
     def eval_expr(self, node: ASTNode):
         if isinstance(node, Literal): return node.value
-        if isinstance(node, Var):     return self.symbols.get(node.name,None)
-        if isinstance(node, BinOp):
-            l=self.eval_expr(node.left); r=self.eval_expr(node.right)
-            if node.op in ('+','-','*','/'):
-                return {'+':l+r,'-':l-r,'*':l*r,'/':l/r}[node.op]
-            return {'==':l==r,'!=':l!=r,'>':l>r,'<':l<r,'>=':l>=r,'<=':l<=r}[node.op]
-        if isinstance(node, Call):
-            return self.execute(node)
+        if isinstance(node, Var):     return self.frame.buscar(node.name)
+        try:
+            if isinstance(node, BinOp):
+                return self.operadores[node.op](self.eval_expr(node.left), self.eval_expr(node.right))
+            if isinstance(node, Call):
+                return self.execute(node)
+            if isinstance(node, Logico):
+                # devolve o operando que decidiu, como o 'and'/'or' do Python
+                l=self.eval_expr(node.left)
+                if node.op == 'e':
+                    return self.eval_expr(node.right) if l else l
+                return l if l else self.eval_expr(node.right)
+            if isinstance(node, UnaryOp):
+                return UNARIOS[node.op](self.eval_expr(node.expr))
+            if isinstance(node, ListaLiteral):
+                return Lista([self.eval_expr(i) for i in node.itens])
+            if isinstance(node, Indice):
+                return indexar(self.eval_expr(node.expr), self.eval_expr(node.indice))
+        except ErroExecucao as e:
+            # a expressão mais interna que falhou dá a posição, como a
+            # instrução da VM
+            e.posicionar(node.linha, node.coluna)
+            raise
+        except ERROS_PYTHON as e:
+            raise erro_execucao(e, node.linha, node.coluna) from e
         return None
 
     # ---- Impressão da AST ----
     def print_tree(self, node=None, indent=0):
         if node is None:
-            self.pos=0
-            node=self.parse()
-        pad='  '*indent
-        t=type(node).__name__
-        info=getattr(node,'name',getattr(node,'value',''))
-        self.terminal.insert(tk.END, f"{pad}{t}" + (f": {info}" if info else "") + "\n")
-        for fld in ('statements','body','args','expr','left','right'):
-            val=getattr(node,fld,None)
-            if isinstance(val,list):
-                for c in val: self.print_tree(c,indent+1)
-            elif isinstance(val,ASTNode):
-                self.print_tree(val,indent+1)
+            node=self.programa if self.programa is not None else self.parse()
+        # pilha explícita: árvores profundas não esbarram no limite de recursão
+        pendentes=[(node,indent)]
+        while pendentes:
+            node,indent=pendentes.pop()
+            pad='  '*indent
+            t=type(node).__name__
+            info=getattr(node,'name',getattr(node,'value',''))
+            self.saida.escrever(f"{pad}{t}" + (f": {info}" if info else "") + "\n")
+            nos=[]
+            for fld in node.FILHOS:
+                val=getattr(node,fld)
+                if fld=='condition' or val is None:
+                    continue
+                if isinstance(val,list):
+                    nos.extend(val)
+                else:
+                    nos.append(val)
+            pendentes.extend((c,indent+1) for c in reversed(nos))
+
+# --- Tabelas do parser ---
+# tipo do token -> regra. Statements e termos são escolhidos por um acesso ao
+# dicionário; uma regra que devolve None cai no erro de sempre.
+DECLARACOES = {
+    VARIAVEL: AnalisadorSintatico.parse_var_decl, ID: AnalisadorSintatico.parse_id_stmt,
+    QUADRO: AnalisadorSintatico.parse_print, FUNCAO: AnalisadorSintatico.parse_func_decl,
+    RETORNO: AnalisadorSintatico.parse_return, LOOP_WHILE: AnalisadorSintatico.parse_while,
+    LOOP_FOR: AnalisadorSintatico.parse_for,
+}
+TERMOS = {
+    NUM: AnalisadorSintatico.parse_num, STRING: AnalisadorSintatico.parse_string,
+    CHAR: AnalisadorSintatico.parse_char, ID: AnalisadorSintatico.parse_id,
+    ABRE_PAR: AnalisadorSintatico.parse_parenteses, ABRE_COLCHETE: AnalisadorSintatico.parse_lista,
+    OP_ARIT: AnalisadorSintatico.parse_negativo,
+}
+# os termos sem nada aninhado, os únicos que parse_expr_pilha não desmonta
+# na própria pilha
+FOLHAS = {
+    NUM: AnalisadorSintatico.parse_num, STRING: AnalisadorSintatico.parse_string,
+    CHAR: AnalisadorSintatico.parse_char, ID: AnalisadorSintatico.parse_var,
+}
+# expressões aninhadas que parse_expr trata com recursão comum; mais fundo,
+# parse_expr_pilha
+PROFUNDIDADE_RECURSIVA = 32
+# operador binário -> (nível, nível aceito depois). Aritméticos se repetem
+# (à esquerda, sem precedência entre si); um relacional fecha a expressão.
+BINARIOS = {OP_ARIT: (2, 2), OP_REL: (1, 0)}
+# o que parse_expr_pilha deixa pendente na pilha, esperando o próximo operando
+# ou a expressão interna: (_NAO, tok), (_NEGATIVO, tok), (_COMPARACAO,
+# esquerdo, tok, nível depois), (_LOGICO, esquerdo, tok, precedência),
+# (_PARENTESES,), (_INDICE, tok, nó indexado), (_LISTA/_CHAMADA, tok, itens)
+_NAO, _NEGATIVO, _COMPARACAO, _LOGICO, _PARENTESES, _INDICE, _LISTA, _CHAMADA = range(8)
+_VAZIO = (None,)